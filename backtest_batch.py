@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+Batch-Backtest der SMA-Crossover-Strategie über viele Symbole
+Statt einer DataFrame-Pipeline pro Ticker liegen die Kurse als Matrix
+(Datum x Symbol) vor; Signale, Positionen, Kosten und Renditen werden für
+alle Symbole gleichzeitig mit NumPy-Broadcasting berechnet. Bei SL/TP läuft
+nur noch die Zeitachse als Schleife, jeder Schritt ist eine Vektoroperation
+über alle Symbole.
+
+Symbole mit unterschiedlichen Handelstagen (z.B. BTC-USD und EURUSD=X) haben
+in der Matrix Lücken (NaN). Solche Zeilen zählen für das jeweilige Symbol
+nicht: "Vortag" ist immer der letzte eigene Handelstag, die Rendite-Reihe
+eines Symbols entspricht also der Einzelberechnung auf seinem DataFrame.
+
+Aufruf: python backtest_batch.py SYMBOL [SYMBOL ...] [--bericht]
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from backtest_engine import lade_first_backtest
+from bericht import Berichte
+from kennzahlen_kern import KENNZAHLEN, kennzahlen_matrix
+
+FELDER = ['open', 'high', 'low', 'close']
+
+
+# --- 1. DATEN ---
+
+def lade_preismatrix(symbole, years=5, offline=None):
+    """Lädt alle Symbole über preprocessing_yf und gibt {Feld: DataFrame(Datum x Symbol)} zurück."""
+    modul = lade_first_backtest()
+    einzeln = {symbol: modul.preprocessing_yf(symbol, years, offline=offline) for symbol in symbole}
+    return {feld: pd.concat({symbol: df[feld] for symbol, df in einzeln.items()}, axis=1, sort=True)
+            for feld in FELDER}
+
+
+def _als_preise(preise):
+    # Liste von Tickern oder bereits fertige Matrix
+    if isinstance(preise, dict):
+        return preise
+    return lade_preismatrix(list(preise))
+
+
+def _vortag(werte, gueltig):
+    """Wert am jeweils letzten eigenen Handelstag davor (pro Spalte), NaN wenn es keinen gibt."""
+    return pd.DataFrame(np.where(gueltig, werte, np.nan)).ffill().shift(1).to_numpy()
+
+
+# --- 2. SIGNALE ---
+
+def sma_matrix(close, fenster):
+    """rolling(fenster).mean() pro Symbol, jeweils nur über die eigenen Handelstage."""
+    close = pd.DataFrame(close)
+    if not close.isna().to_numpy().any():
+        # Keine Lücken: ein rolling() über alle Spalten zugleich
+        return close.rolling(fenster).mean().to_numpy()
+    return close.apply(lambda spalte: spalte.dropna().rolling(fenster).mean()).reindex(close.index).to_numpy()
+
+
+def signal_matrix(close, fast_sma, slow_sma):
+    """Crossover-Signale für alle Symbole: 1 = Kauf, -1 = Verkauf, NaN = kein Signal."""
+    gueltig = ~pd.DataFrame(close).isna().to_numpy()
+    fast = sma_matrix(close, fast_sma)
+    slow = sma_matrix(close, slow_sma)
+    fast_vortag = _vortag(fast, gueltig)
+    slow_vortag = _vortag(slow, gueltig)
+
+    signal = np.full(fast.shape, np.nan)
+    signal[(fast > slow) & (fast_vortag < slow_vortag)] = 1
+    signal[(fast < slow) & (fast_vortag > slow_vortag)] = -1
+    return signal
+
+
+# --- 3. STRATEGIEN ---
+
+def SMA_strategy_batch(preise, fast_sma=30, slow_sma=60, cost_ind=0.0001):
+    """
+    Wie SMA_strategy aus 'backtesting in collab.py' (ohne SL/TP), für alle
+    Symbole zugleich. Gibt die Renditen (in %) als DataFrame Datum x Symbol zurück.
+    """
+    preise = _als_preise(preise)
+    close_df = preise["close"]
+    close = close_df.to_numpy(dtype=np.float64)
+    gueltig = ~np.isnan(close)
+    signal = signal_matrix(close_df, fast_sma, slow_sma)
+
+    # Position = letztes Signal (pro Symbol über die eigenen Handelstage vorgetragen)
+    position = pd.DataFrame(np.where(gueltig, signal, np.nan)).ffill().to_numpy()
+    position_vortag = _vortag(position, gueltig)
+    cost = np.nan_to_num(np.abs(signal) * cost_ind, nan=0.0)
+    pct = close / _vortag(close, gueltig) - 1
+
+    returns = (pct * position_vortag - cost) * 100
+    return pd.DataFrame(np.where(gueltig, returns, np.nan), index=close_df.index, columns=close_df.columns)
+
+
+def simuliere_sl_tp_matrix(high, low, close, signal, cost_ind, stop_loss_pct, take_profit_pct):
+    """
+    SL/TP-Simulation wie backtest_engine.simuliere_sl_tp, aber für alle Spalten
+    gleichzeitig: Schleife über die Zeit, jeder Schritt vektorisiert über die Symbole.
+    Renditen in %, NaN an Tagen ohne Kurs des Symbols.
+    """
+    sl_level = stop_loss_pct / 100
+    tp_level = take_profit_pct / 100
+    high, low, close, signal = (np.asarray(a, dtype=np.float64) for a in (high, low, close, signal))
+    anzahl_tage, anzahl_symbole = close.shape
+
+    returns = np.full(close.shape, np.nan)
+    position = np.zeros(anzahl_symbole)
+    entry_price = np.full(anzahl_symbole, np.nan)
+    vortag_close = np.full(anzahl_symbole, np.nan)
+    hat_vortag = np.zeros(anzahl_symbole, dtype=bool)
+
+    # Vergleiche mit NaN (kein Einstieg, Lücken) sind False, Warnungen dazu unterdrücken
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for i in range(anzahl_tage):
+            gueltig = ~np.isnan(close[i])
+            aktiv = gueltig & hat_vortag # Der erste eigene Tag wird wie im Original übersprungen
+            tages_return = np.zeros(anzahl_symbole)
+
+            # A. Check für Stop-Loss ODER Take-Profit (Exit-Logik)
+            long = aktiv & (position == 1)
+            profit_long = (high[i] / entry_price) - 1
+            exit_long = long & ((profit_long >= tp_level) | ((low[i] / entry_price) - 1 < -sl_level))
+
+            short = aktiv & (position == -1)
+            profit_short = 1 - (low[i] / entry_price)
+            exit_short = short & ((profit_short >= tp_level) | ((high[i] / entry_price) - 1 > sl_level))
+
+            exit_return = np.where(np.where(long, profit_long, profit_short) >= tp_level, tp_level, -sl_level)
+            ausgestiegen = exit_long | exit_short
+            tages_return[ausgestiegen] = (exit_return[ausgestiegen] * 100) - (cost_ind * 100)
+            position[ausgestiegen] = 0.0
+            entry_price[ausgestiegen] = np.nan
+            weiter = aktiv & ~ausgestiegen
+
+            # B. Berechne Tagesrendite (Intakter Trade)
+            im_trade = weiter & (position != 0)
+            pct_change = close[i] / vortag_close - 1
+            tages_return[im_trade] = (pct_change[im_trade] * position[im_trade]) * 100
+
+            # C. Check für Kreuzungssignal (Entry/Exit durch Crossover)
+            signal_heute = signal[i]
+            kreuzung = weiter & (signal_heute != 0) & ~np.isnan(signal_heute)
+
+            # 1. Exit durch Umkehrsignal
+            umkehr = kreuzung & (((signal_heute == 1) & (position == -1)) | ((signal_heute == -1) & (position == 1)))
+            tages_return[umkehr] -= cost_ind * 100
+            position[umkehr] = 0.0
+            entry_price[umkehr] = np.nan
+
+            # 2. Entry für neuen Trade
+            einstieg = kreuzung & (position == 0)
+            position[einstieg] = signal_heute[einstieg]
+            entry_price[einstieg] = close[i][einstieg]
+            tages_return[einstieg] -= cost_ind * 100
+
+            returns[i, gueltig] = tages_return[gueltig]
+            vortag_close[gueltig] = close[i][gueltig]
+            hat_vortag |= gueltig
+
+    return returns
+
+
+def SMA_strategy_full_risk_control_batch(preise, fast_sma, slow_sma, cost_ind, stop_loss_pct, take_profit_pct):
+    """
+    Wie SMA_strategy_full_risk_control, aber für eine Preismatrix (siehe
+    lade_preismatrix) oder eine Liste von Tickern. Gibt die Renditen (in %)
+    als DataFrame Datum x Symbol zurück.
+    """
+    preise = _als_preise(preise)
+    close_df = preise["close"]
+    signal = signal_matrix(close_df, fast_sma, slow_sma)
+    returns = simuliere_sl_tp_matrix(preise["high"], preise["low"], close_df, signal,
+                                     cost_ind, stop_loss_pct, take_profit_pct)
+    return pd.DataFrame(returns, index=close_df.index, columns=close_df.columns)
+
+
+# --- 4. AUSWERTUNG ---
+
+def kennzahlen_tabelle(returns):
+    """Kennzahlen pro Symbol (eine Zeile je Spalte von returns)."""
+    # Alle Symbole in einem Aufruf des Kennzahlen-Kerns (eine Zeile je Symbol)
+    tabelle = pd.DataFrame(kennzahlen_matrix(returns.to_numpy().T), index=returns.columns, columns=list(KENNZAHLEN))
+    tabelle.index.name = "symbol"
+    return tabelle
+
+
+def portfolio_equity(returns):
+    """Gleichgewichtetes Portfolio: Tagesrendite = Mittel über die an dem Tag gehandelten Symbole, kumuliert in %."""
+    return returns.mean(axis=1, skipna=True).fillna(0.0).cumsum().rename("portfolio")
+
+
+def backtest_batch(preise, fast_sma, slow_sma, cost_ind, stop_loss_pct, take_profit_pct):
+    """Gibt (Kennzahlen pro Symbol, Portfolio-Equity-Kurve, Renditen-Matrix) zurück."""
+    returns = SMA_strategy_full_risk_control_batch(preise, fast_sma, slow_sma, cost_ind,
+                                                   stop_loss_pct, take_profit_pct)
+    return kennzahlen_tabelle(returns), portfolio_equity(returns), returns
+
+
+# --- 5. AUSFÜHRUNG ---
+
+if __name__ == "__main__":
+    modul = lade_first_backtest()
+    symbole = [a for a in sys.argv[1:] if not a.startswith("--")] or [modul.TICKER]
+    tabelle, equity, _ = backtest_batch(symbole, modul.BEST_FAST_SMA, modul.BEST_SLOW_SMA, modul.COST,
+                                        modul.STOP_LOSS_PCT, modul.TAKE_PROFIT_PCT)
+
+    print("\n--- Kennzahlen pro Symbol ---")
+    print(tabelle.sort_values("sharpe", ascending=False).to_string())
+    print(f"\nPortfolio-Gesamtrendite: {equity.iloc[-1]:.2f}%")
+
+    titel = f"Portfolio ({len(symbole)} Symbole, SMA {modul.BEST_FAST_SMA}/{modul.BEST_SLOW_SMA} & SL/TP)"
+    if "--bericht" in sys.argv:
+        with Berichte() as berichte:
+            print(f"Bericht: {berichte.equity('portfolio', equity, titel, kumuliert=True).result()}")
+    else:
+        modul.plt.figure(figsize=(15, 8))
+        equity.plot(title=titel, ylabel="P&L in %")
+        modul.plt.show()
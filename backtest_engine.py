@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Schnelle Simulations-Engine für die SMA-Crossover-Strategie mit SL/TP
+Gleiche Logik wie SMA_strategy_full_risk_control in 'first backtest.py',
+aber auf zusammenhängenden NumPy-Arrays statt mit iterrows/df.loc pro Tag.
+Mit numba wird die Schleife kompiliert, ohne numba läuft dieselbe Schleife
+auf Python-Listen. Die Rendite-Reihe ist in beiden Fällen bitgenau identisch
+zur Originalfunktion.
+"""
+import importlib.util
+import math
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from indikator_cache import datenversion
+
+# numba ist optional: pip install numba
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# --- 1. ZUGRIFF AUF DAS ORIGINAL-SKRIPT ---
+
+@lru_cache(maxsize=None)
+def lade_first_backtest():
+    """Lädt 'first backtest.py' als Modul (der Dateiname ist kein gültiger Modulname)."""
+    pfad = os.path.join(os.path.dirname(os.path.abspath(__file__)), "first backtest.py")
+    spec = importlib.util.spec_from_file_location("first_backtest", pfad)
+    modul = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modul)
+    return modul
+
+
+# --- 2. SIGNALE ---
+
+def sma_signale(close, fast_sma, slow_sma):
+    """Crossover-Signale wie im Original: 1 = Kauf, -1 = Verkauf, NaN = kein Signal."""
+    close = pd.Series(close)
+    # Gleitende Mittel bewusst über pandas, damit die Werte bitgenau dem Original entsprechen
+    fast = close.rolling(fast_sma).mean().to_numpy()
+    slow = close.rolling(slow_sma).mean().to_numpy()
+    return signale_aus_sma(fast, slow)
+
+
+def signale_aus_sma(fast, slow):
+    """Crossover-Signale aus zwei fertigen SMA-Reihen (z.B. aus dem IndikatorCache)."""
+    signal = np.full(len(fast), np.nan)
+    crossover_buy = np.zeros(len(fast), dtype=bool)
+    crossover_sell = np.zeros(len(fast), dtype=bool)
+    # shift(1) liefert am Anfang NaN, jeder Vergleich damit ist False
+    crossover_buy[1:] = (fast[1:] > slow[1:]) & (fast[:-1] < slow[:-1])
+    crossover_sell[1:] = (fast[1:] < slow[1:]) & (fast[:-1] > slow[:-1])
+    signal[crossover_buy] = 1
+    signal[crossover_sell] = -1
+    return signal
+
+
+# --- 3. SIMULATIONS-SCHLEIFE ---
+
+def _sl_tp_schleife(high, low, close, signal, cost_ind, sl_level, tp_level, returns, reihenfolge, zustand):
+    """
+    Tag-für-Tag-Simulation, Schritt für Schritt wie im Original (A: SL/TP, B: Tagesrendite, C: Signal).
+
+    `reihenfolge[i]` entscheidet, wenn an Tag i SL und TP beide berührt werden:
+    0 = wie im Original TP, 1 = TP zuerst, -1 = SL zuerst, NaN = unbekannt.
+
+    `zustand` ist (Starttag, Position, Einstiegspreis), für einen neuen Lauf
+    (1, 0, NaN). Bei NaN in `reihenfolge` bricht die Schleife ab und schreibt
+    (i, Position, Einstiegspreis) dorthin zurück; mit demselben `returns`
+    geht es nach dem Setzen von reihenfolge[i] an Tag i weiter. Ist die
+    Reihe fertig, steht zustand[0] auf -1.
+    """
+    start = int(zustand[0])
+    current_position = zustand[1]
+    entry_price = zustand[2]
+    zustand[0] = -1.0
+
+    for i in range(start, len(close)):
+
+        # A. Check für Stop-Loss ODER Take-Profit (Exit-Logik)
+        if current_position != 0:
+
+            # --- Long Position ---
+            if current_position == 1:
+                profit = (high[i] / entry_price) - 1
+                drawdown = (low[i] / entry_price) - 1
+
+                if profit >= tp_level or drawdown < -sl_level:
+                    if profit >= tp_level and drawdown < -sl_level and reihenfolge[i] != reihenfolge[i]:
+                        zustand[0], zustand[1], zustand[2] = i, current_position, entry_price
+                        return returns
+                    exit_return = tp_level if profit >= tp_level and reihenfolge[i] != -1 else -sl_level
+                    returns[i] = (exit_return * 100) - (cost_ind * 100)
+                    current_position = 0.0
+                    entry_price = np.nan
+                    continue
+
+            # --- Short Position ---
+            elif current_position == -1:
+                profit = 1 - (low[i] / entry_price)
+                run_up = (high[i] / entry_price) - 1
+
+                if profit >= tp_level or run_up > sl_level:
+                    if profit >= tp_level and run_up > sl_level and reihenfolge[i] != reihenfolge[i]:
+                        zustand[0], zustand[1], zustand[2] = i, current_position, entry_price
+                        return returns
+                    exit_return = tp_level if profit >= tp_level and reihenfolge[i] != -1 else -sl_level
+                    returns[i] = (exit_return * 100) - (cost_ind * 100)
+                    current_position = 0.0
+                    entry_price = np.nan
+                    continue
+
+        # B. Berechne Tagesrendite (Intakter Trade)
+        if current_position != 0:
+            pct_change = close[i] / close[i - 1] - 1
+            returns[i] = (pct_change * current_position) * 100
+
+        # C. Check für Kreuzungssignal (Entry/Exit durch Crossover)
+        signal_heute = signal[i]
+        if signal_heute != 0 and not math.isnan(signal_heute):
+
+            # 1. Exit durch Umkehrsignal
+            if (signal_heute == 1 and current_position == -1) or (signal_heute == -1 and current_position == 1):
+                returns[i] -= cost_ind * 100
+                current_position = 0.0
+                entry_price = np.nan
+
+            # 2. Entry für neuen Trade
+            if current_position == 0:
+                current_position = signal_heute
+                entry_price = close[i]
+                returns[i] -= cost_ind * 100
+
+    return returns
+
+
+_sl_tp_kern = njit(nogil=True, cache=True)(_sl_tp_schleife) if njit is not None else None
+
+
+def simuliere_sl_tp(high, low, close, signal, cost_ind, stop_loss_pct, take_profit_pct, intrabar=None):
+    """
+    Simuliert Positionen, Einstiegspreis und SL/TP auf Arrays und gibt die
+    Tagesrenditen in Prozent zurück (erster Tag immer 0.0).
+
+    Ohne `intrabar` gilt wie im Original: werden an einem Tag SL und TP
+    berührt, zählt TP. Mit `intrabar(i, position, entry_price, sl_level, tp_level)`
+    (z.B. intrabar.IntrabarAufloesung) wird für genau diese Tage gefragt, was
+    zuerst ausgelöst hat (1 = TP, -1 = SL); die Simulation setzt danach an
+    diesem Tag mit der Antwort fort, bis zum nächsten solchen Tag.
+    """
+    sl_level = stop_loss_pct / 100
+    tp_level = take_profit_pct / 100
+    arrays = [np.ascontiguousarray(a, dtype=np.float64) for a in (high, low, close, signal)]
+    anzahl = len(arrays[2])
+    reihenfolge = np.full(anzahl, np.nan) if intrabar is not None else np.zeros(anzahl)
+    returns = np.zeros(anzahl)
+    zustand = np.array([1.0, 0.0, np.nan])
+    if _sl_tp_kern is None:
+        # Ohne numba: Python-Listen sind beim Einzelzugriff deutlich schneller als NumPy-Skalare
+        arrays = [a.tolist() for a in arrays]
+        reihenfolge = reihenfolge.tolist()
+        returns = [0.0] * anzahl
+        zustand = zustand.tolist()
+    schleife = _sl_tp_kern if _sl_tp_kern is not None else _sl_tp_schleife
+
+    while True:
+        schleife(*arrays, cost_ind, sl_level, tp_level, returns, reihenfolge, zustand)
+        if zustand[0] < 0:
+            return np.asarray(returns, dtype=np.float64)
+        i = int(zustand[0])
+        reihenfolge[i] = intrabar(i, zustand[1], zustand[2], sl_level, tp_level)
+
+
+# --- 4. STRATEGIE ---
+
+def SMA_strategy_full_risk_control_fast(df, fast_sma, slow_sma, cost_ind, stop_loss_pct, take_profit_pct,
+                                        cache=None, symbol="", intrabar=None):
+    """
+    Wie SMA_strategy_full_risk_control, aber auf einem bereits geladenen
+    DataFrame (z.B. aus preprocessing_yf) und mit der Array-Engine.
+    Gibt die Rendite-Reihe (in %) mit dem Index von df zurück.
+
+    Mit `cache` (IndikatorCache) kommen die SMAs aus dem Cache statt aus
+    rolling().mean(); die Werte sind dieselben (gleiches Rechenverfahren).
+    `intrabar` löst Tage, an denen SL und TP berührt werden, genauer auf
+    (siehe simuliere_sl_tp und intrabar.py).
+    """
+    if cache is None:
+        signal = sma_signale(df["close"], fast_sma, slow_sma)
+    else:
+        close = df["close"].to_numpy(dtype=np.float64)
+        smas = cache.smas(symbol, datenversion(close, df.index), close, [fast_sma, slow_sma])
+        signal = signale_aus_sma(smas[fast_sma], smas[slow_sma])
+    returns = simuliere_sl_tp(df["high"], df["low"], df["close"], signal,
+                              cost_ind, stop_loss_pct, take_profit_pct, intrabar)
+    return pd.Series(returns, index=df.index, name="return")
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Parameter-Optimierung für die SMA-Crossover-Strategie mit SL/TP
+Gitter- oder Zufallssuche über fast_sma, slow_sma, stop_loss_pct und
+take_profit_pct, verteilt auf einen ProcessPoolExecutor. Die Kursdaten
+liegen einmal im Shared Memory, die Worker lesen sie von dort statt den
+DataFrame pro Aufgabe gepickelt zu bekommen; dasselbe gilt für alle
+benötigten SMAs, die vorab einmal über den IndikatorCache berechnet
+werden (jedes Fenster nur einmal, egal in wie vielen Paaren es vorkommt).
+Bewertet wird mit den Kennzahlen aus 'first backtest.py' (sharpe_ratio,
+sortino_ratio, max_drawdown), berechnet im Kennzahlen-Kern.
+
+Aufruf: python backtest_optimizer.py [TICKER] [--zufall ANZAHL] [--berichte ANZAHL]
+"""
+import random
+import sys
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from backtest_engine import (SMA_strategy_full_risk_control_fast, lade_first_backtest, signale_aus_sma, sma_signale,
+                             simuliere_sl_tp)
+from bericht import Berichte
+from indikator_cache import IndikatorCache, datenversion
+from kennzahlen_kern import kennzahlen
+
+# Standard-Suchraum (enthält die im Original verwendeten 25/70 und 1.5%/7%)
+FAST_WERTE = range(5, 55, 5)
+SLOW_WERTE = range(20, 210, 10)
+SL_WERTE = (1.0, 1.5, 2.0, 3.0, 5.0)
+TP_WERTE = (3.0, 5.0, 7.0, 10.0, 15.0)
+
+
+# --- 1. SUCHRAUM ---
+
+def gitter_kombinationen(fast_werte=FAST_WERTE, slow_werte=SLOW_WERTE, sl_werte=SL_WERTE, tp_werte=TP_WERTE):
+    """Alle Kombinationen des Gitters (nur fast < slow)."""
+    return [(fast, slow, sl, tp) for fast, slow, sl, tp in product(fast_werte, slow_werte, sl_werte, tp_werte)
+            if fast < slow]
+
+
+def zufalls_kombinationen(anzahl, fast_bereich=(5, 50), slow_bereich=(20, 200), sl_bereich=(0.5, 5.0),
+                          tp_bereich=(2.0, 15.0), seed=42):
+    """Zufallssuche: `anzahl` verschiedene Kombinationen (SL/TP auf 0.1% gerundet)."""
+    rnd = random.Random(seed)
+    kombinationen = set()
+    for _ in range(anzahl * 20):
+        if len(kombinationen) >= anzahl:
+            break
+        fast = rnd.randint(*fast_bereich)
+        slow = rnd.randint(max(fast + 1, slow_bereich[0]), slow_bereich[1])
+        kombinationen.add((fast, slow, round(rnd.uniform(*sl_bereich), 1), round(rnd.uniform(*tp_bereich), 1)))
+    return sorted(kombinationen)
+
+
+# --- 2. WORKER ---
+
+_worker_daten = {} # Pro Worker-Prozess: Shared-Memory-Block, Kurs-/SMA-Arrays
+
+def _worker_start(shm_name, form, sma_zeilen):
+    # Nur anhängen: Anlegen und unlink() übernimmt der Hauptprozess
+    shm = SharedMemory(name=shm_name)
+    daten = np.ndarray(form, dtype=np.float64, buffer=shm.buf)
+    _worker_daten['shm'] = shm
+    _worker_daten['ohlc'] = daten[:3]
+    _worker_daten['smas'] = {fenster: daten[zeile] for fenster, zeile in sma_zeilen.items()}
+
+
+def _signal(fast, slow, von, bis):
+    smas = _worker_daten['smas']
+    return signale_aus_sma(smas[fast][von:bis], smas[slow][von:bis])
+
+
+def renditen(fast, slow, sl, tp, cost_ind, von=0, bis=None):
+    """Im Worker: Rendite-Array einer Kombination auf den Bars [von, bis)."""
+    high, low, close = _worker_daten['ohlc'][:, von:bis]
+    return simuliere_sl_tp(high, low, close, _signal(fast, slow, von, bis), cost_ind, sl, tp)
+
+
+def bewerte_paar(fast, slow, sl_tp_liste, cost_ind, von=0, bis=None):
+    """Eine Aufgabe: ein SMA-Paar (Signale nur einmal berechnen) mit allen SL/TP-Werten."""
+    high, low, close = _worker_daten['ohlc'][:, von:bis]
+    signal = _signal(fast, slow, von, bis)
+
+    ergebnisse = []
+    for sl, tp in sl_tp_liste:
+        returns = simuliere_sl_tp(high, low, close, signal, cost_ind, sl, tp)
+        ergebnisse.append({'fast_sma': fast, 'slow_sma': slow, 'stop_loss_pct': sl, 'take_profit_pct': tp,
+                           **kennzahlen(returns)})
+    return ergebnisse
+
+
+# --- 3. OPTIMIERUNG ---
+
+def rangliste(ergebnisse, nach="sharpe"):
+    """Sortiert die Ergebnisse absteigend nach einer Kennzahl (NaN zuletzt), Rang beginnt bei 1."""
+    tabelle = pd.DataFrame(ergebnisse)
+    if tabelle.empty:
+        return tabelle
+    tabelle = tabelle.sort_values(nach, ascending=False, na_position="last", kind="stable").reset_index(drop=True)
+    tabelle.index += 1
+    tabelle.index.name = "rang"
+    return tabelle
+
+
+def nach_paar(kombinationen):
+    """Bündelt (fast, slow, sl, tp)-Kombinationen zu {(fast, slow): [(sl, tp), ...]}."""
+    aufgaben = {}
+    for fast, slow, sl, tp in kombinationen:
+        aufgaben.setdefault((fast, slow), []).append((sl, tp))
+    return aufgaben
+
+
+@contextmanager
+def worker_pool(df, fenster, max_workers=None, cache=None, symbol=""):
+    """
+    ProcessPoolExecutor, dessen Worker high/low/close und die SMAs aller
+    `fenster` aus einem gemeinsamen Shared-Memory-Block lesen.
+    """
+    # Alle benötigten SMAs einmal im Hauptprozess (bzw. aus dem Cache früherer Läufe)
+    cache = cache if cache is not None else IndikatorCache()
+    close = df["close"].to_numpy(dtype=np.float64)
+    fenster = sorted(set(fenster))
+    smas = cache.smas(symbol, datenversion(close, df.index), close, fenster)
+    sma_zeilen = {w: 3 + i for i, w in enumerate(fenster)}
+
+    # Ein Block: Zeilen 0-2 high/low/close, danach eine Zeile pro SMA-Fenster
+    form = (3 + len(fenster), len(df))
+    shm = SharedMemory(create=True, size=max(1, 8 * form[0] * form[1]))
+    try:
+        ziel = np.ndarray(form, dtype=np.float64, buffer=shm.buf)
+        ziel[:3] = df[["high", "low", "close"]].to_numpy(dtype=np.float64).T
+        for w, zeile in sma_zeilen.items():
+            ziel[zeile] = smas[w]
+        del ziel # Keine Sicht auf den Puffer behalten, sonst schlägt shm.close() fehl
+
+        with ProcessPoolExecutor(max_workers, initializer=_worker_start, initargs=(shm.name, form, sma_zeilen)) as pool:
+            yield pool
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def optimiere(df, kombinationen, cost_ind=0.001, max_workers=None, bei_ergebnis=None, nach="sharpe",
+              cache=None, symbol=""):
+    """
+    Bewertet alle (fast, slow, sl, tp)-Kombinationen parallel und gibt die
+    Rangliste zurück. `bei_ergebnis(ergebnis, bisherige_ergebnisse)` wird für
+    jedes fertige Ergebnis sofort aufgerufen (z.B. für einen Live-Zwischenstand).
+    """
+    aufgaben = nach_paar(kombinationen)
+    fenster = {w for paar in aufgaben for w in paar}
+
+    ergebnisse = []
+    with worker_pool(df, fenster, max_workers, cache, symbol) as pool:
+        futures = [pool.submit(bewerte_paar, fast, slow, sl_tp_liste, cost_ind)
+                   for (fast, slow), sl_tp_liste in aufgaben.items()]
+        for future in as_completed(futures):
+            for ergebnis in future.result():
+                ergebnisse.append(ergebnis)
+                if bei_ergebnis is not None:
+                    bei_ergebnis(ergebnis, ergebnisse)
+
+    return rangliste(ergebnisse, nach)
+
+
+def zwischenstand_ausgeben(alle_n=250, top=5, nach="sharpe"):
+    """Callback für optimiere(): druckt alle `alle_n` Ergebnisse die aktuelle Spitze."""
+    def bei_ergebnis(ergebnis, ergebnisse):
+        if len(ergebnisse) % alle_n == 0:
+            print(f"\n--- Zwischenstand nach {len(ergebnisse)} Kombinationen ---")
+            print(rangliste(ergebnisse, nach).head(top).to_string())
+    return bei_ergebnis
+
+
+# --- 4. AUSFÜHRUNG ---
+
+if __name__ == "__main__":
+    modul = lade_first_backtest()
+    ticker = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].startswith("--") else modul.TICKER
+    if "--zufall" in sys.argv:
+        kombinationen = zufalls_kombinationen(int(sys.argv[sys.argv.index("--zufall") + 1]))
+    else:
+        kombinationen = gitter_kombinationen()
+
+    df = modul.preprocessing_yf(ticker)
+    print(f"Optimiere {ticker}: {len(kombinationen)} Kombinationen auf {len(df)} Bars")
+    ergebnis = optimiere(df, kombinationen, modul.COST, bei_ergebnis=zwischenstand_ausgeben(), symbol=ticker)
+
+    print("\n--- Beste Parameter (nach Sharpe Ratio) ---")
+    print(ergebnis.head(20).to_string())
+
+    if "--berichte" in sys.argv:
+        # Equity-Kurve und Signale der besten Kombinationen als PNG, gezeichnet im Berichtsprozess
+        with Berichte(f"berichte_{ticker}") as berichte:
+            for rang, zeile in ergebnis.head(int(sys.argv[sys.argv.index("--berichte") + 1])).iterrows():
+                fast, slow = int(zeile['fast_sma']), int(zeile['slow_sma'])
+                sl, tp = zeile['stop_loss_pct'], zeile['take_profit_pct']
+                name = f"{rang:03d}_sma_{fast}_{slow}_sl_{sl}_tp_{tp}"
+                returns = SMA_strategy_full_risk_control_fast(df, fast, slow, modul.COST, sl, tp)
+                berichte.equity(name, returns, f"Rang {rang}: SMA {fast}/{slow}, SL {sl}% / TP {tp}%")
+                berichte.signale(name + "_signale", df["close"], sma_signale(df["close"], fast, slow))
+        print(f"Berichte in berichte_{ticker}/")
@@ -16,6 +16,10 @@ import matplotlib as mpl
 
 from matplotlib import cycler
 
+from indikator_cache import datenversion
+
+from marktdaten_cache import lade_ohlcv
+
 colors = cycler('color',
 
                 ['#669FEE', '#66EE91', '#9988DD',
@@ -42,7 +46,7 @@ plt.rc("text", color="#C9C9C9") import datetime
 
 
 
-def preprocessing_yf(symbol):
+def preprocessing_yf(symbol, offline=None):
 
   # Get current date
 
@@ -54,15 +58,15 @@ def preprocessing_yf(symbol):
 
 
 
-  #Import the data for a longer period
+  #Import the data for a longer period - from the local store (marktdaten_cache.py),
 
-  df = yf.download(symbol, start=start_date, end=end_date).dropna()
+  # only bars newer than the last cached date are downloaded; offline=True never downloads
 
+  df = lade_ohlcv(symbol, start_date, end_date, offline=offline)
 
 
-  #Rename - Adjusted for 5 columns as 'Adj Close' is often not present for currency pairs
 
-  df.columns = ["open", "high", "low", "close", "volume"]
+  #Rename - columns are already "open", "high", "low", "close", "volume"
 
   df.index.name = "time"
 
@@ -200,7 +204,7 @@ df["return"] = (df["pct"] * df["position"].shift(1) - df["cost"])*100
 
 df["return"].cumsum().plot(figsize=(30,12), title="Return for the Trend trading stratgey on the EURUSD")
 
-plt.show() def SMA_strategy(input, fast_sma=30, slow_sma=60, cost_ind=0.0001):
+plt.show() def SMA_strategy(input, fast_sma=30, slow_sma=60, cost_ind=0.0001, cache=None):
 
 
 
@@ -210,15 +214,31 @@ plt.show() def SMA_strategy(input, fast_sma=30, slow_sma=60, cost_ind=0.0001):
 
 
 
-  # Create Resistance using a rolling max
+  if cache is None:
+
+    # Create Resistance using a rolling max
+
+    df["SMA fast"] = df["close"].rolling(fast_sma).mean()
+
+
+
+    # Create Support using a rolling min
+
+    df["SMA slow"] = df["close"].rolling(slow_sma).mean()
+
+  else:
+
+    # SMAs aus dem gemeinsamen IndikatorCache (z.B. indikator_cache.STANDARD_CACHE),
 
-  df["SMA fast"] = df["close"].rolling(fast_sma).mean()
+    # damit ein Parameter-Sweep jedes Fenster nur einmal berechnet
 
+    close = df["close"].to_numpy(dtype=np.float64)
 
+    smas = cache.smas(input, datenversion(close, df.index), close, [fast_sma, slow_sma])
 
-  # Create Support using a rolling min
+    df["SMA fast"] = smas[fast_sma]
 
-  df["SMA slow"] = df["close"].rolling(slow_sma).mean()
+    df["SMA slow"] = smas[slow_sma]
 
 
 
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: SMA_strategy_full_risk_control (iterrows) gegen die Array-Engine
+Beide laufen auf denselben synthetischen OHLC-Daten (Random Walk, keine
+Netzwerkabfrage). Das Original wird nur bis zu einer begrenzten Länge
+gemessen, dort wird auch die Bitgleichheit der Rendite-Reihen geprüft;
+die Engine läuft zusätzlich auf 1M Bars.
+
+Aufruf: python benchmark_backtest_engine.py [anzahl ...]   (Standard: 10000 50000 1000000)
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest_engine import SMA_strategy_full_risk_control_fast, lade_first_backtest, njit
+
+REFERENZ_BIS = 50_000 # Länger dauert das Original zu lange
+PARAMETER = dict(fast_sma=25, slow_sma=70, cost_ind=0.001, stop_loss_pct=1.5, take_profit_pct=7.0)
+
+
+def erzeuge_ohlc(anzahl, seed=42):
+    """Synthetische Minuten-Bars als Random Walk, im Format von preprocessing_yf."""
+    rnd = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rnd.normal(0, 0.004, anzahl)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    spanne = np.abs(rnd.normal(0, 0.003, anzahl)) * close
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + spanne,
+        'low': np.minimum(open_, close) - spanne,
+        'close': close,
+        'volume': rnd.integers(1_000, 100_000, anzahl),
+    }, index=pd.date_range("2020-01-01", periods=anzahl, freq="min"))
+
+
+def referenz(df):
+    """Originalfunktion aus 'first backtest.py', mit df statt Yahoo-Download."""
+    modul = lade_first_backtest()
+    original_laden = modul.preprocessing_yf
+    modul.preprocessing_yf = lambda symbol, years=5: df.copy()
+    try:
+        return modul.SMA_strategy_full_risk_control("SYNTH", **PARAMETER)
+    finally:
+        modul.preprocessing_yf = original_laden
+
+
+def messe(funktion):
+    start = time.perf_counter()
+    ergebnis = funktion()
+    return time.perf_counter() - start, ergebnis
+
+
+def main(groessen):
+    # Erster Aufruf kompiliert die numba-Schleife, das soll nicht in die Messung eingehen
+    SMA_strategy_full_risk_control_fast(erzeuge_ohlc(1_000), **PARAMETER)
+    lade_first_backtest() # Import von yfinance/matplotlib ebenfalls nicht mitmessen
+    print(f"numba: {'ja' if njit is not None else 'nein (Python-Schleife)'}")
+    print(f"{'Bars':>10} {'Original':>10} {'Engine':>10} {'Faktor':>8} {'µs/Bar':>8}  Bitgleich")
+
+    for anzahl in groessen:
+        df = erzeuge_ohlc(anzahl)
+        t_engine, schnell = messe(lambda: SMA_strategy_full_risk_control_fast(df, **PARAMETER))
+
+        if anzahl <= REFERENZ_BIS:
+            t_original, erwartet = messe(lambda: referenz(df))
+            gleich = (erwartet.index.equals(schnell.index)
+                      and np.array_equal(erwartet.to_numpy().view(np.int64), schnell.to_numpy().view(np.int64)))
+            if not gleich:
+                raise AssertionError(f"Rendite-Reihen weichen bei {anzahl} Bars ab")
+            print(f"{anzahl:>10,} {t_original:>9.2f}s {t_engine:>9.4f}s {t_original / t_engine:>7.0f}x "
+                  f"{t_engine / anzahl * 1e6:>8.3f}  ja")
+        else:
+            print(f"{anzahl:>10,} {'-':>10} {t_engine:>9.4f}s {'-':>8} {t_engine / anzahl * 1e6:>8.3f}  (Original zu langsam)")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 50_000, 1_000_000])
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Kennzahlen aus 'first backtest.py' (pandas) gegen den Kennzahlen-Kern
+Gemessen werden viele Rendite-Reihen wie bei einem Parameter-Sweep (pandas
+pro Reihe gegen eine Matrix im Kern), rollende Kennzahlen und ein Bootstrap.
+Die Abweichungen zum Original werden mit ausgegeben.
+
+Aufruf: python benchmark_kennzahlen.py [anzahl_reihen] [bars]   (Standard: 2000 1800)
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest_engine import lade_first_backtest
+from kennzahlen_kern import KENNZAHLEN, bootstrap_kennzahlen, kennzahlen_matrix, njit, rollende_kennzahlen
+
+
+def messe(funktion):
+    start = time.perf_counter()
+    ergebnis = funktion()
+    return time.perf_counter() - start, ergebnis
+
+
+def original(modul, returns):
+    returns_clean = returns.dropna()
+    return [returns_clean.cumsum().iloc[-1], modul.sharpe_ratio(returns_clean), modul.sortino_ratio(returns_clean),
+            modul.max_drawdown(returns_clean), modul.downside_deviation(returns_clean)]
+
+
+def main(anzahl_reihen, bars):
+    modul = lade_first_backtest()
+    rnd = np.random.default_rng(42)
+    # Renditen in % mit vielen Nullen (keine Position), wie bei der SMA-Strategie
+    matrix = rnd.normal(0.02, 1.5, (anzahl_reihen, bars)) * (rnd.random((anzahl_reihen, bars)) < 0.6)
+    kennzahlen_matrix(matrix[:2]) # numba kompilieren
+    print(f"numba: {'ja' if njit is not None else 'nein (NumPy)'}")
+
+    t_pandas, erwartet = messe(lambda: np.array([original(modul, pd.Series(zeile)) for zeile in matrix]))
+    t_kern, ergebnis = messe(lambda: kennzahlen_matrix(matrix))
+    abweichung = np.nanmax(np.abs(ergebnis - erwartet) / np.maximum(np.abs(erwartet), 1e-12), axis=0)
+    print(f"\n{anzahl_reihen} Reihen x {bars} Bars: pandas {t_pandas:.2f}s, Kern {t_kern:.4f}s "
+          f"({t_pandas / t_kern:.0f}x)")
+    for name, wert in zip(KENNZAHLEN, abweichung):
+        print(f"  max. relative Abweichung {name}: {wert:.1e}")
+
+    reihe = pd.Series(matrix[0])
+    t_rollend_pandas, _ = messe(lambda: reihe.rolling(252).apply(lambda fenster: modul.sharpe_ratio(fenster)))
+    t_rollend, rollend = messe(lambda: rollende_kennzahlen(reihe, 252))
+    print(f"\nRollend (252): pandas nur Sharpe {t_rollend_pandas:.2f}s, Kern alle Kennzahlen {t_rollend:.4f}s")
+
+    t_bootstrap, tabelle = messe(lambda: bootstrap_kennzahlen(reihe, anzahl_pfade=10_000, block_laenge=20))
+    print(f"\nBootstrap 10000 Pfade (Blocklänge 20): {t_bootstrap:.2f}s")
+    print(tabelle.to_string())
+
+
+if __name__ == "__main__":
+    argumente = [int(a) for a in sys.argv[1:]]
+    main(*(argumente + [2000, 1800][len(argumente):]))
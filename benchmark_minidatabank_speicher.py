@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Speicherbedarf von MiniDatenbank
+Vergleicht List[Person] (ein Pydantic-Objekt pro Zeile) mit der
+spaltenorientierten SpaltenTabelle. Gemessen wird per tracemalloc, einmal nur
+die Tabelle und einmal die ganze Datenbank nach einer Suche und einer
+Sortierung (also inklusive der dafür aufgebauten Indizes). Zusätzlich werden
+Suche und Sortierung in beiden Varianten gegeneinander geprüft und gestoppt.
+
+Aufruf: python benchmark_minidatabank_speicher.py [anzahl ...]   (Standard: 100000 1000000)
+"""
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmark_minidatabank_suche import ANFRAGEN, erzeuge_db, erzeuge_personen, messe
+from minidatabank import SpaltenTabelle
+
+
+def messe_speicher(funktion):
+    """Gibt (Ergebnis, belegte Bytes) zurück; gezählt wird, was nach dem Aufruf noch belegt ist."""
+    gc.collect()
+    tracemalloc.start()
+    ergebnis = funktion()
+    gc.collect()
+    belegt = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return ergebnis, belegt
+
+
+def mit_indizes(verzeichnis, anzahl, spaltenspeicher):
+    db = erzeuge_db(anzahl, verzeichnis, spaltenspeicher)
+    db.filter_by_criteria(ANFRAGEN[0])
+    db.sortiert('name', start=0, anzahl=50)
+    return db
+
+
+def pro_100k(belegt, anzahl):
+    return belegt / anzahl * 100_000 / 2**20
+
+
+def main(groessen):
+    for anzahl in groessen:
+        print(f"\n--- {anzahl:,} Personen ---")
+        print(f"{'Messung':<36} {'List[Person]':>14} {'SpaltenTabelle':>15} {'Faktor':>8}")
+
+        _, liste = messe_speicher(lambda: list(erzeuge_personen(anzahl)))
+        _, spalten = messe_speicher(lambda: SpaltenTabelle(erzeuge_personen(anzahl)))
+        print(f"{'Tabelle (MB pro 100k)':<36} {pro_100k(liste, anzahl):>14.1f} {pro_100k(spalten, anzahl):>15.1f} "
+              f"{liste / spalten:>7.1f}x")
+
+        with tempfile.TemporaryDirectory() as verzeichnis:
+            db_liste, liste = messe_speicher(lambda: mit_indizes(verzeichnis, anzahl, False))
+            db_spalten, spalten = messe_speicher(lambda: mit_indizes(verzeichnis, anzahl, True))
+        print(f"{'Mit Indizes (MB pro 100k)':<36} {pro_100k(liste, anzahl):>14.1f} {pro_100k(spalten, anzahl):>15.1f} "
+              f"{liste / spalten:>7.1f}x")
+
+        for kriterien in ANFRAGEN:
+            t_liste, erwartet = messe(lambda: db_liste.filter_by_criteria(kriterien))
+            t_spalten, ergebnis = messe(lambda: db_spalten.filter_by_criteria(kriterien))
+            if ergebnis != erwartet:
+                raise AssertionError(f"Abweichende Ergebnisse für {kriterien}")
+            print(f"{str(kriterien):<36} {t_liste * 1000:>12.1f}ms {t_spalten * 1000:>13.1f}ms")
+
+        for feld in ('name', 'stadt', 'erstellungsdatum'):
+            db_liste._sortier_indizes.clear()
+            db_spalten._sortier_indizes.clear()
+            start = time.perf_counter()
+            erwartet = [p.model_dump() for p in db_liste.sortiert(feld, start=anzahl // 2, anzahl=50)]
+            t_liste = time.perf_counter() - start
+            start = time.perf_counter()
+            ergebnis = [p.model_dump() for p in db_spalten.sortiert(feld, start=anzahl // 2, anzahl=50)]
+            t_spalten = time.perf_counter() - start
+            if ergebnis != erwartet:
+                raise AssertionError(f"Abweichende Sortierung nach {feld}")
+            print(f"{'sortiert(' + feld + ')':<36} {t_liste * 1000:>12.1f}ms {t_spalten * 1000:>13.1f}ms")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [100_000, 1_000_000])
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Kaltstart von MiniDatenbank
+Vergleicht das Laden des JSON-Snapshots (volle Pydantic-Validierung) mit dem
+binären Snapshot (model_construct, keine erneute Validierung).
+
+Aufruf: python benchmark_minidatabank_start.py [anzahl ...]   (Standard: 10000 100000 1000000)
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmark_minidatabank_suche import erzeuge_db
+from minidatabank import MiniDatenbank, JsonSnapshot, BinaerSnapshot
+
+
+def messe_start(verzeichnis, snapshot_format):
+    start = time.perf_counter()
+    db = MiniDatenbank(os.path.join(verzeichnis, 'personen.json'), os.path.join(verzeichnis, 'staedte.json'),
+                       snapshot_format=snapshot_format)
+    return time.perf_counter() - start, db
+
+
+def main(groessen):
+    print(f"{'Personen':>10} {'JSON (MB)':>10} {'Binär (MB)':>11} {'Start JSON':>11} {'Start Binär':>12} {'Faktor':>8}")
+    for anzahl in groessen:
+        with tempfile.TemporaryDirectory() as verzeichnis:
+            db = erzeuge_db(anzahl, verzeichnis)
+            db._speichern_alle()
+            BinaerSnapshot().schreibe_personen(db, db.daten)
+            del db
+
+            groesse_json = os.path.getsize(os.path.join(verzeichnis, 'personen.json')) / 1e6
+            groesse_binaer = os.path.getsize(os.path.join(verzeichnis, 'personen.mdb')) / 1e6
+
+            t_json, db_json = messe_start(verzeichnis, JsonSnapshot())
+            t_binaer, db_binaer = messe_start(verzeichnis, BinaerSnapshot())
+            if [p.model_dump() for p in db_json.daten] != [p.model_dump() for p in db_binaer.daten]:
+                raise AssertionError("JSON- und Binär-Snapshot liefern unterschiedliche Daten")
+
+            print(f"{anzahl:>10,} {groesse_json:>10.1f} {groesse_binaer:>11.1f} {t_json:>10.2f}s {t_binaer:>11.2f}s "
+                  f"{t_json / t_binaer:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Teilstring-Suche in MiniDatenbank.filter_by_criteria
+Vergleicht den Trigramm-Index mit dem bisherigen Vollscan.
+
+Aufruf: python benchmark_minidatabank_suche.py [anzahl ...]   (Standard: 10000 100000 1000000)
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from minidatabank import MiniDatenbank, Person, SpaltenTabelle, Stadt
+
+VORNAMEN = ["Anna", "Ben", "Clara", "David", "Emma", "Felix", "Greta", "Hannes", "Ida", "Jonas",
+            "Klara", "Lukas", "Mia", "Noah", "Olivia", "Paul", "Rosa", "Simon", "Tina", "Yusuf"]
+NACHNAMEN = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker",
+             "Schulz", "Hoffmann", "Koch", "Richter", "Klein", "Wolf", "Neumann", "Schwarz"]
+STAEDTE = ["Berlin", "Hamburg", "München", "Köln", "Frankfurt", "Stuttgart", "Düsseldorf",
+           "Leipzig", "Dortmund", "Essen", "Bremen", "Dresden", "Hannover", "Nürnberg"]
+
+ANFRAGEN = [
+    {'name': 'schmidt'},
+    {'email': '4242'},
+    {'stadt': 'dorf'},
+    {'name': 'anna', 'stadt': 'berl'},
+    {'name': 'mi'},
+]
+
+
+def filter_vollscan(db, kriterien):
+    """Die bisherige Implementierung von filter_by_criteria (linearer Scan) als Referenz."""
+    ergebnisse = db.daten
+    for key, value in kriterien.items():
+        if not value: continue
+        if key in ['name', 'email']:
+            suchwert = str(value).lower()
+            ergebnisse = [p for p in ergebnisse if suchwert in str(getattr(p, key, '')).lower()]
+    if 'stadt' in kriterien and kriterien['stadt']:
+        suchwert_stadt = kriterien['stadt'].lower()
+        gefilterte_stadt_ids = {id for name, id in db._stadt_namen_map.items() if suchwert_stadt in name}
+        ergebnisse = [p for p in ergebnisse if p.stadt_id in gefilterte_stadt_ids]
+
+    output = []
+    for person in ergebnisse:
+        d = person.model_dump(mode='json')
+        d['stadt'] = db.get_stadtname(person.stadt_id)
+        output.append(d)
+    return output
+
+
+def erzeuge_personen(anzahl):
+    rnd = random.Random(42)
+    jetzt = datetime(2024, 1, 1, 12, 0, 0)
+    # model_construct: Die Testdaten sind per Konstruktion gültig, Validierung würde nur den Aufbau bremsen
+    for i in range(anzahl):
+        yield Person.model_construct(
+            id=i + 1,
+            name=f"{rnd.choice(VORNAMEN)} {rnd.choice(NACHNAMEN)}",
+            email=f"user{i}@beispiel{rnd.randint(1, 50)}.de",
+            stadt_id=rnd.randint(1, len(STAEDTE)),
+            erstellungsdatum=jetzt,
+        )
+
+
+def erzeuge_db(anzahl, verzeichnis, spaltenspeicher=False):
+    db = MiniDatenbank(os.path.join(verzeichnis, 'personen.json'), os.path.join(verzeichnis, 'staedte.json'),
+                       spaltenspeicher=spaltenspeicher)
+    db.staedte = [Stadt(id=i + 1, name=name) for i, name in enumerate(STAEDTE)]
+    db.daten = SpaltenTabelle(erzeuge_personen(anzahl)) if spaltenspeicher else list(erzeuge_personen(anzahl))
+    db._baue_indizes_neu()
+    return db
+
+
+def messe(funktion, wiederholungen=3):
+    beste = float('inf')
+    ergebnis = None
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        ergebnis = funktion()
+        beste = min(beste, time.perf_counter() - start)
+    return beste, ergebnis
+
+
+def main(groessen):
+    for anzahl in groessen:
+        with tempfile.TemporaryDirectory() as verzeichnis:
+            db = erzeuge_db(anzahl, verzeichnis)
+
+            start = time.perf_counter()
+            db._such_indizes()
+            aufbau = time.perf_counter() - start
+
+            print(f"\n--- {anzahl:,} Personen (Indexaufbau: {aufbau:.2f}s) ---")
+            print(f"{'Kriterien':<36} {'Treffer':>9} {'Vollscan':>10} {'Index':>10} {'Faktor':>8}")
+            for kriterien in ANFRAGEN:
+                t_scan, erwartet = messe(lambda: filter_vollscan(db, kriterien))
+                t_index, ergebnis = messe(lambda: db.filter_by_criteria(kriterien))
+                if ergebnis != erwartet:
+                    raise AssertionError(f"Abweichende Ergebnisse für {kriterien}")
+                print(f"{str(kriterien):<36} {len(ergebnis):>9} {t_scan * 1000:>8.1f}ms {t_index * 1000:>8.1f}ms "
+                      f"{t_scan / t_index:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000])
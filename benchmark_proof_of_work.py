@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Nonce-Hashing ohne und mit SHA-256-Midstate
+Für Blöcke mit 1 KB, 64 KB und 1 MB `data` wird gemessen, wie viele Nonces
+pro Sekunde geprüft werden: einmal wie calculateHash (ganzer Präfix pro
+Versuch), einmal mit dem Midstate des Präfixes (.copy() + Nonce). Beide
+Varianten werden vorher auf gleiche Hashes geprüft, und calculateHash gegen
+Hashes, die mit dem JavaScript-Original (node, crypto.createHash) berechnet
+wurden, auch für verschachtelte Daten mit ganzzahligen Floats.
+
+Aufruf: python benchmark_proof_of_work.py [sekunden]   (Standard: 1.0 pro Messung)
+"""
+import hashlib
+import sys
+import time
+
+from proof_of_work import block
+
+GROESSEN = {'1 KB': 1024, '64 KB': 64 * 1024, '1 MB': 1024 * 1024}
+
+# (index, timestamp, data, previousHash, nonce) -> Hash aus node
+JAVASCRIPT_HASHES = [
+    ((1, "02/01/2024", {'amount': 4}, "0", 0),
+     "510613f44b34d86f867dc63b045605081487a76b8d8115b58c6f1cee48241dd5"),
+    ((2, "03/01/2024", {'x': [1.0, 2.5, {'y': 3.0}]}, "abc", 7),
+     "c562ca8ee8971e09bfaad457ca2af383e897147aa21b6fcdfa90d337d74c17a3"),
+    ((3, "04/01/2024", {'a': {'b': 3.0, 'c': [-0.0, 1e21, 1e20]}, 'ü': "ä"}, "def", 12345),
+     "2a01822b30342b25301ad89224304a6825ac17efb2177998b244d7701891c20b"),
+    ((4, "05/01/2024", [1.0, [2.0, "3"]], "0", 42),
+     "e701d8fd948246d91ca825b1ab3c63b8e02c2d852cb908c927d245dd8df26740"),
+]
+
+
+def javascript_pruefen():
+    for (index, timestamp, data, previousHash, nonce), erwartet in JAVASCRIPT_HASHES:
+        b = block(index, timestamp, data, previousHash)
+        b.nonce = nonce
+        if b.calculateHash() != erwartet:
+            raise AssertionError(f"Hash von Block {index} weicht vom JavaScript-Original ab")
+
+
+def ohne_midstate(b, sekunden):
+    praefix = b.hash_praefix()
+    nonce = 0
+    ende = time.perf_counter() + sekunden
+    while time.perf_counter() < ende:
+        for _ in range(16):
+            hashlib.sha256(praefix + str(nonce).encode('ascii')).digest()
+            nonce += 1
+    return nonce
+
+
+def mit_midstate(b, sekunden):
+    kopie = b.hash_midstate().copy
+    nonce = 0
+    ende = time.perf_counter() + sekunden
+    while time.perf_counter() < ende:
+        for _ in range(1024):
+            h = kopie()
+            h.update(str(nonce).encode('ascii'))
+            h.digest()
+            nonce += 1
+    return nonce
+
+
+def main(sekunden):
+    javascript_pruefen()
+    print(f"{'data':>8} {'ohne Midstate':>16} {'mit Midstate':>16} {'Faktor':>8}")
+    for name, groesse in GROESSEN.items():
+        b = block(1, "02/01/2024", {'payload': "x" * groesse}, "0" * 64)
+        for nonce in (0, 7, 123456):
+            b.nonce = nonce
+            h = b.hash_midstate()
+            h.update(str(nonce).encode('ascii'))
+            if h.hexdigest() != b.calculateHash():
+                raise AssertionError(f"Midstate-Hash weicht bei {name}, Nonce {nonce} ab")
+
+        ohne = ohne_midstate(b, sekunden) / sekunden
+        mit = mit_midstate(b, sekunden) / sekunden
+        print(f"{name:>8} {ohne:>13,.0f}/s {mit:>13,.0f}/s {mit / ohne:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0)
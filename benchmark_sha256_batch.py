@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: gebündelter NumPy-SHA-256 gegen die skalare Nonce-Schleife
+Zuerst wird sha256_batch gegen hashlib.sha256 geprüft (zufällige Nachrichten
+aller Längen um die Blockgrenzen, Nonce-Bereiche über Stellenwechsel hinweg).
+Danach Nonces pro Sekunde für einen Block wie in proof_of_work: skalar mit
+hashlib-Midstate, skalar in reinem Python und gebündelt mit verschiedenen
+Lane-Zahlen.
+
+Aufruf: python benchmark_sha256_batch.py [sekunden]   (Standard: 1.0 pro Messung)
+"""
+import hashlib
+import os
+import sys
+import time
+
+import numpy as np
+
+from proof_of_work import block
+from sha256_batch import NonceBatch, nach_stellen, als_hex, sha256, sha256_viele
+
+LANES = (1024, 4096, 16384, 65536)
+
+
+def pruefen():
+    nachrichten = [os.urandom(laenge) for laenge in range(200)]
+    if sha256_viele(nachrichten) != [hashlib.sha256(n).hexdigest() for n in nachrichten]:
+        raise AssertionError("sha256_viele weicht von hashlib ab")
+    if any(sha256(n) != hashlib.sha256(n).hexdigest() for n in nachrichten):
+        raise AssertionError("sha256 weicht von hashlib ab")
+
+    for laenge in (0, 50, 54, 55, 56, 63, 64, 1000):
+        praefix = os.urandom(laenge)
+        kernel = NonceBatch(praefix)
+        for teil in nach_stellen(np.arange(990, 10010)):
+            erwartet = [hashlib.sha256(praefix + str(int(n)).encode('ascii')).hexdigest() for n in teil]
+            if als_hex(kernel.hashes(teil)) != erwartet:
+                raise AssertionError(f"NonceBatch weicht bei Präfixlänge {laenge} ab")
+
+
+def skalar_hashlib(praefix, sekunden):
+    kopie = hashlib.sha256(praefix).copy
+    nonce = 0
+    ende = time.perf_counter() + sekunden
+    while time.perf_counter() < ende:
+        for _ in range(1024):
+            h = kopie()
+            h.update(str(nonce).encode('ascii'))
+            h.digest()
+            nonce += 1
+    return nonce
+
+
+def skalar_python(praefix, sekunden):
+    nonce = 0
+    ende = time.perf_counter() + sekunden
+    while time.perf_counter() < ende:
+        sha256(praefix + str(nonce).encode('ascii'))
+        nonce += 1
+    return nonce
+
+
+def gebuendelt(praefix, lanes, sekunden):
+    kernel = NonceBatch(praefix)
+    nonce = 10 ** 6 # Gleiche Stellenzahl für alle Lanes
+    ende = time.perf_counter() + sekunden
+    while time.perf_counter() < ende:
+        kernel.hashes(np.arange(nonce, nonce + lanes, dtype=np.uint64))
+        nonce += lanes
+    return nonce - 10 ** 6
+
+
+def main(sekunden):
+    pruefen()
+    print("sha256_batch stimmt mit hashlib überein")
+
+    praefix = block(1, "02/01/2024", {'amount': 4}, "0" * 64).hash_praefix()
+    print(f"{'Variante':>24} {'Nonces/s':>14}")
+    print(f"{'skalar, hashlib-Midstate':>24} {skalar_hashlib(praefix, sekunden) / sekunden:>14,.0f}")
+    print(f"{'skalar, reines Python':>24} {skalar_python(praefix, sekunden) / sekunden:>14,.0f}")
+    for lanes in LANES:
+        print(f"{f'NumPy, {lanes} Lanes':>24} {gebuendelt(praefix, lanes, sekunden) / sekunden:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0)
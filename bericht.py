@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Berichte für Backtests: Equity-Kurven und Signal-Plots als Bilddateien
+Gezeichnet wird in einem eigenen Prozess mit dem nicht-interaktiven
+Agg-Backend, ohne plt.show(): einreichen kehrt sofort zurück, die
+Rechen-Worker eines Sweeps werden also nicht aufgehalten. Lange Reihen
+werden vorher im aufrufenden Prozess mit LTTB (Largest-Triangle-Three-
+Buckets) auf wenige tausend Punkte reduziert, sodass nur kleine Arrays an
+den Zeichenprozess gehen und die Form der Kurve (Spitzen, Einbrüche)
+erhalten bleibt.
+
+Verwendung:
+    with Berichte("berichte") as berichte:
+        berichte.equity("sma_25_70", renditen, "SMA 25/70")
+        berichte.signale("sma_25_70_signale", df["close"], signal)
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+MAX_PUNKTE = 2000 # Pro Linie, mehr ist bei 15 Zoll Breite ohnehin nicht zu sehen
+FARBE_KAUF = "#57CE95"
+FARBE_VERKAUF = "red"
+
+
+# --- 1. DOWNSAMPLING ---
+
+def lttb_indizes(x, y, ziel=MAX_PUNKTE):
+    """
+    Indizes der Punkte, die LTTB für `ziel` Punkte auswählt (erster und letzter
+    Punkt immer dabei). Pro Bucket wird der Punkt genommen, der mit dem zuletzt
+    gewählten Punkt und dem Mittel des nächsten Buckets das größte Dreieck bildet.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    anzahl = len(x)
+    if ziel >= anzahl or ziel < 3:
+        return np.arange(anzahl)
+
+    grenzen = np.linspace(1, anzahl - 1, ziel - 1).astype(np.int64)
+    indizes = np.empty(ziel, dtype=np.int64)
+    indizes[0], indizes[-1] = 0, anzahl - 1
+    a = 0
+    for bucket in range(ziel - 2):
+        start, ende = grenzen[bucket], grenzen[bucket + 1]
+        if bucket + 2 < len(grenzen):
+            naechster = slice(ende, grenzen[bucket + 2])
+            mittel_x, mittel_y = x[naechster].mean(), y[naechster].mean()
+        else:
+            mittel_x, mittel_y = x[-1], y[-1]
+        flaeche = np.abs((x[a] - mittel_x) * (y[start:ende] - y[a]) - (x[a] - x[start:ende]) * (mittel_y - y[a]))
+        a = start + int(np.argmax(flaeche))
+        indizes[bucket + 1] = a
+    return indizes
+
+
+def _x_werte(index):
+    # Zeitachsen als Zahlen für die Dreiecksflächen, sonst Positionen
+    if isinstance(index, pd.DatetimeIndex):
+        return index.asi8.astype(np.float64)
+    return np.arange(len(index), dtype=np.float64)
+
+
+def reduziere(reihe, ziel=MAX_PUNKTE):
+    """LTTB auf eine pandas-Series: gibt die reduzierte Series (gleicher Index-Typ) zurück."""
+    indizes = lttb_indizes(_x_werte(reihe.index), reihe.to_numpy(dtype=np.float64), ziel)
+    return reihe.iloc[indizes]
+
+
+# --- 2. ZEICHNEN (IM BERICHTSPROZESS) ---
+
+def _zeichenprozess_start():
+    import matplotlib
+    matplotlib.use("Agg") # Kein Fenster, kein GUI-Eventloop
+
+
+def _speichere(fig, pfad):
+    import matplotlib.pyplot as plt
+    os.makedirs(os.path.dirname(os.path.abspath(pfad)), exist_ok=True)
+    fig.savefig(pfad, dpi=100, bbox_inches="tight")
+    plt.close(fig) # Sonst sammeln sich bei vielen Berichten die Figuren im Speicher
+    return pfad
+
+
+def _zeichne_equity(pfad, x, equity, titel):
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(15, 8))
+    ax.plot(x, equity)
+    ax.set_title(titel)
+    ax.set_ylabel("P&L in %")
+    ax.grid(alpha=0.3)
+    return _speichere(fig, pfad)
+
+
+def _zeichne_signale(pfad, x, close, kauf_x, kauf_y, verkauf_x, verkauf_y, titel):
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(15, 8))
+    ax.scatter(kauf_x, kauf_y, color=FARBE_KAUF, marker="^", zorder=3)
+    ax.scatter(verkauf_x, verkauf_y, color=FARBE_VERKAUF, marker="v", zorder=3)
+    ax.plot(x, close, alpha=0.35)
+    ax.legend(["Buy", "Sell", "close"])
+    ax.set_title(titel)
+    ax.grid(alpha=0.3)
+    return _speichere(fig, pfad)
+
+
+# --- 3. BERICHTE ---
+
+class Berichte:
+    """Reicht Plots an einen eigenen Zeichenprozess ein; Dateien landen als PNG in `verzeichnis`."""
+
+    def __init__(self, verzeichnis="berichte", max_workers=1, max_punkte=MAX_PUNKTE):
+        self.verzeichnis = verzeichnis
+        self.max_punkte = max_punkte
+        self._pool = ProcessPoolExecutor(max_workers, initializer=_zeichenprozess_start)
+        self._futures = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.schliessen()
+
+    def _pfad(self, name):
+        return os.path.join(self.verzeichnis, f"{name}.png")
+
+    def _einreichen(self, funktion, *argumente):
+        future = self._pool.submit(funktion, *argumente)
+        self._futures.append(future)
+        return future
+
+    def equity(self, name, renditen, titel=None, kumuliert=False):
+        """
+        Kumulierte Rendite (in %) als Equity-Kurve; gibt ein Future mit dem Dateipfad zurück.
+        Mit kumuliert=True ist `renditen` bereits die Equity-Kurve.
+        """
+        equity = pd.Series(renditen).fillna(0.0)
+        equity = reduziere(equity if kumuliert else equity.cumsum(), self.max_punkte)
+        return self._einreichen(_zeichne_equity, self._pfad(name), equity.index.to_numpy(), equity.to_numpy(),
+                                titel or name)
+
+    def signale(self, name, close, signal, titel=None):
+        """Kurs mit Kauf-/Verkaufssignalen (1 / -1) als Scatter; die Signale selbst werden nicht reduziert."""
+        close = pd.Series(close)
+        signal = np.asarray(signal)
+        kauf, verkauf = signal == 1, signal == -1
+        kurs = reduziere(close, self.max_punkte)
+        return self._einreichen(_zeichne_signale, self._pfad(name), kurs.index.to_numpy(), kurs.to_numpy(),
+                                close.index[kauf].to_numpy(), close.to_numpy()[kauf],
+                                close.index[verkauf].to_numpy(), close.to_numpy()[verkauf], titel or name)
+
+    def warten(self):
+        """Wartet auf alle eingereichten Berichte und gibt ihre Pfade zurück (Fehler werden hier ausgelöst)."""
+        pfade = [future.result() for future in self._futures]
+        self._futures.clear()
+        return pfade
+
+    def schliessen(self):
+        try:
+            self.warten()
+        finally:
+            self._pool.shutdown()
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Persistenter Blockspeicher für proof_of_work.Blockchain
+Statt die ganze Kette als JSON zu schreiben, werden Blöcke an eine Datei
+angehängt und per mmap gelesen. Jeder Eintrag besteht aus einem Kopf fester
+Größe (index, nonce, hash, previousHash, Länge der Daten) und einem Segment
+variabler Länge mit timestamp und data als JSON:
+
+    bloecke.dat   MAGIC | Kopf | Daten | Kopf | Daten | ...
+    bloecke.idx   pro Höhe (Offset, erste 8 Bytes des Hashs), feste Satzgröße
+
+Höhe -> Offset ist damit O(1), hash -> Höhe eine Binärsuche auf den beim
+Öffnen sortierten Hash-Schlüsseln (O(log n)); neue Blöcke kommen bis zum
+nächsten Öffnen in ein Dict. Gelesen wird nur, was gebraucht wird:
+getlatestBlock, Suche per Hash und Bereiche deserialisieren nie die ganze Kette.
+
+Der Speicher verhält sich wie eine Liste (len, [], Iteration, append) und kann
+direkt als Blockchain(speicher=BlockSpeicher("bloecke")).chain dienen. Nach
+einem Absturz werden unvollständige Einträge am Dateiende beim Öffnen verworfen.
+
+Aufruf: python blockspeicher.py [VERZEICHNIS] [--hash HASH] [--von N] [--bis N]
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+from proof_of_work import block
+
+BLOCK_VERZEICHNIS = os.environ.get(
+    "BLOCK_VERZEICHNIS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "bloecke"))
+
+MAGIC = b"BLOCKS01"
+KOPF = struct.Struct('<qq64s64sI') # index, nonce, hash, previousHash, Länge des Datensegments
+INDEX_DTYPE = np.dtype([('offset', '<u8'), ('schluessel', '<u8')])
+
+
+def _schluessel(hash_hex):
+    """Erste 8 Bytes des Hashs als Zahl; Kollisionen werden über den vollen Hash im Kopf aufgelöst."""
+    return int(hash_hex[:16], 16)
+
+
+def _text(feld):
+    return feld.rstrip(b'\x00').decode('ascii')
+
+
+class BlockSpeicher:
+    """Append-only Blockdatei mit Index; Zugriff per Höhe, per Hash oder als Bereich."""
+
+    def __init__(self, verzeichnis=None):
+        self.verzeichnis = verzeichnis or BLOCK_VERZEICHNIS
+        os.makedirs(self.verzeichnis, exist_ok=True)
+        daten_pfad = os.path.join(self.verzeichnis, "bloecke.dat")
+        index_pfad = os.path.join(self.verzeichnis, "bloecke.idx")
+        for pfad in (daten_pfad, index_pfad):
+            if not os.path.exists(pfad):
+                with open(pfad, 'wb') as f:
+                    f.write(MAGIC if pfad == daten_pfad else b'')
+
+        self._daten = open(daten_pfad, 'r+b')
+        if self._daten.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{daten_pfad}' ist keine Blockdatei.")
+        self._index_datei = open(index_pfad, 'r+b')
+        self._karte = None
+        self._reparieren()
+
+        self._index = np.fromfile(self._index_datei, dtype=INDEX_DTYPE) if self._anzahl_alt else \
+            np.empty(0, dtype=INDEX_DTYPE)
+        self._index_datei.seek(0, os.SEEK_END)
+        self._neue_offsets = []
+        self._neue_hashes = {}
+        self._sortierung = np.argsort(self._index['schluessel'], kind='stable')
+        self._sortierte_schluessel = self._index['schluessel'][self._sortierung]
+        self._daten.seek(0, os.SEEK_END)
+
+    def _reparieren(self):
+        """Schneidet halbe Index-Sätze und Einträge ohne vollständige Daten am Ende ab."""
+        index_groesse = os.fstat(self._index_datei.fileno()).st_size
+        anzahl = index_groesse // INDEX_DTYPE.itemsize
+        daten_groesse = os.fstat(self._daten.fileno()).st_size
+        ende = len(MAGIC)
+        while anzahl:
+            self._index_datei.seek((anzahl - 1) * INDEX_DTYPE.itemsize)
+            offset = int(np.frombuffer(self._index_datei.read(INDEX_DTYPE.itemsize), dtype=INDEX_DTYPE)['offset'][0])
+            if offset + KOPF.size <= daten_groesse:
+                self._daten.seek(offset)
+                laenge = KOPF.unpack(self._daten.read(KOPF.size))[4]
+                if offset + KOPF.size + laenge <= daten_groesse:
+                    ende = offset + KOPF.size + laenge
+                    break
+            anzahl -= 1
+        self._index_datei.truncate(anzahl * INDEX_DTYPE.itemsize)
+        self._daten.truncate(ende)
+        self._index_datei.seek(0)
+        self._anzahl_alt = anzahl
+
+    # --- Schreiben ---
+
+    def append(self, neuer_block):
+        """Hängt einen Block an und gibt seine Höhe zurück."""
+        daten = json.dumps({'timestamp': neuer_block.timestamp, 'data': neuer_block.data},
+                           separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        offset = self._daten.tell()
+        self._daten.write(KOPF.pack(neuer_block.index, neuer_block.nonce, neuer_block.hash.encode('ascii'),
+                                    str(neuer_block.previousHash).encode('ascii'), len(daten)))
+        self._daten.write(daten)
+        # Index nach den Daten: ein Satz zeigt nie auf fehlende Bytes (siehe _reparieren)
+        eintrag = np.array([(offset, _schluessel(neuer_block.hash))], dtype=INDEX_DTYPE)
+        self._index_datei.write(eintrag.tobytes())
+
+        hoehe = len(self)
+        self._neue_offsets.append(offset)
+        self._neue_hashes[neuer_block.hash] = hoehe
+        return hoehe
+
+    def flush(self):
+        self._daten.flush()
+        self._index_datei.flush()
+
+    def schliessen(self):
+        self.flush()
+        if self._karte is not None:
+            self._karte.close()
+            self._karte = None
+        self._daten.close()
+        self._index_datei.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.schliessen()
+
+    # --- Lesen ---
+
+    def __len__(self):
+        return len(self._index) + len(self._neue_offsets)
+
+    def _offset(self, hoehe):
+        if hoehe < 0:
+            hoehe += len(self)
+        if not 0 <= hoehe < len(self):
+            raise IndexError(f"Keine Block-Höhe {hoehe} (Länge {len(self)}).")
+        if hoehe < len(self._index):
+            return int(self._index['offset'][hoehe])
+        return self._neue_offsets[hoehe - len(self._index)]
+
+    def _bytes(self, offset, laenge):
+        # Die Karte wächst erst, wenn ein Zugriff hinter ihr Ende geht
+        if self._karte is None or offset + laenge > len(self._karte):
+            self._daten.flush()
+            if self._karte is not None:
+                self._karte.close()
+            self._karte = mmap.mmap(self._daten.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._karte[offset:offset + laenge]
+
+    def kopf(self, hoehe):
+        """Die Felder fester Größe eines Blocks, ohne das Datensegment zu lesen."""
+        offset = self._offset(hoehe)
+        index, nonce, hash_, previousHash, laenge = KOPF.unpack(self._bytes(offset, KOPF.size))
+        return {'index': index, 'nonce': nonce, 'hash': _text(hash_), 'previousHash': _text(previousHash),
+                'offset': offset, 'laenge': laenge}
+
+    def __getitem__(self, hoehe):
+        if isinstance(hoehe, slice):
+            return [self[i] for i in range(*hoehe.indices(len(self)))]
+        felder = self.kopf(hoehe)
+        felder.update(json.loads(self._bytes(felder['offset'] + KOPF.size, felder['laenge'])))
+        return block.aus_dict(felder)
+
+    def bereich(self, von=0, bis=None):
+        """Blöcke der Höhen [von, bis) nacheinander; Grenzen außerhalb der Kette werden auf sie beschränkt."""
+        von = max(von, 0)
+        bis = len(self) if bis is None else min(bis, len(self))
+        for hoehe in range(von, bis):
+            yield self[hoehe]
+
+    def __iter__(self):
+        return self.bereich()
+
+    def getlatestBlock(self):
+        return self[-1]
+
+    def hoehe_von(self, hash_hex):
+        """Höhe des Blocks mit diesem Hash oder None."""
+        if hash_hex in self._neue_hashes:
+            return self._neue_hashes[hash_hex]
+        try:
+            schluessel = np.uint64(_schluessel(hash_hex))
+        except ValueError: # leer oder kein Hex: kann kein gespeicherter Hash sein
+            return None
+        von = int(np.searchsorted(self._sortierte_schluessel, schluessel, side='left'))
+        bis = int(np.searchsorted(self._sortierte_schluessel, schluessel, side='right'))
+        for hoehe in self._sortierung[von:bis]:
+            if self.kopf(int(hoehe))['hash'] == hash_hex:
+                return int(hoehe)
+        return None
+
+    def block_nach_hash(self, hash_hex):
+        hoehe = self.hoehe_von(hash_hex)
+        return None if hoehe is None else self[hoehe]
+
+
+# --- AUSGABE ---
+
+if __name__ == "__main__":
+    argumente = sys.argv[1:]
+    optionen = {"--hash": None, "--von": None, "--bis": None}
+    for name in optionen:
+        if name in argumente:
+            position = argumente.index(name)
+            optionen[name] = argumente[position + 1]
+            del argumente[position:position + 2]
+
+    with BlockSpeicher(argumente[0] if argumente else None) as speicher:
+        print(f"{len(speicher)} Blöcke in {speicher.verzeichnis}")
+        if len(speicher):
+            print(f"Letzter Block: {json.dumps(speicher.getlatestBlock().to_dict(), ensure_ascii=False)}")
+        if optionen["--hash"]:
+            gefunden = speicher.block_nach_hash(optionen["--hash"])
+            print(json.dumps(gefunden.to_dict() if gefunden else None, indent=4, ensure_ascii=False))
+        if optionen["--von"] or optionen["--bis"]:
+            von = int(optionen["--von"] or 0)
+            bis = int(optionen["--bis"]) if optionen["--bis"] else None
+            for b in speicher.bereich(von, bis):
+                print(json.dumps(b.to_dict(), ensure_ascii=False))
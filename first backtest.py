@@ -5,13 +5,15 @@ Asset: BTC-USD
 Validierungsstatus: Walk-Forward & Out-of-Sample erfolgreich.
 """
 import numpy as np
-import pandas as pd
-import yfinance as yf
 import matplotlib.pyplot as plt
 import datetime
+import sys
 import warnings
 warnings.filterwarnings("ignore")
 
+from indikator_cache import datenversion
+from marktdaten_cache import lade_ohlcv
+
 # --- 1. GLOBALE KONFIGURATION & FINALE PARAMETER ---
 # Die durch Walk-Forward und Optimierung gefundenen besten Parameter
 TICKER = "BTC-USD" 
@@ -58,40 +60,40 @@ def sortino_ratio(returns):
 
 # --- 3. DATENABRUF UND VORVERARBEITUNG ---
 
-def preprocessing_yf(symbol, years=5):
-    """Ruft Daten von Yahoo Finance ab und bereitet den DataFrame vor."""
+def preprocessing_yf(symbol, years=5, offline=None):
+    """
+    Ruft Daten von Yahoo Finance ab und bereitet den DataFrame vor.
+    Die Bars kommen aus dem lokalen Speicher (marktdaten_cache.py); heruntergeladen
+    wird nur, was dort noch fehlt, mit offline=True (oder MARKTDATEN_OFFLINE=1) nie.
+    """
     end_date = datetime.date.today()
     start_date = end_date - datetime.timedelta(days=years * 365)
-    
-    # Daten abrufen
-    data = yf.download(symbol, start=start_date, end=end_date, progress=False).dropna()
-    
-    # DataFrame vorbereiten und Spaltennamen vereinheitlichen
-    df = pd.DataFrame(data)
-    
-    # Korrigierte Spaltenbereinigung für yfinance
-    df.columns = [
-        '_'.join(map(str, col)).strip() if isinstance(col, tuple) else str(col) 
-        for col in df.columns
-    ]
-    df.columns = [col.lower().replace(' ', '_') for col in df.columns]
 
-    # Nur die relevanten Spalten zurückgeben
-    return df[['open', 'high', 'low', 'close', 'volume']]
+    # Daten abrufen (Spaltennamen werden dabei vereinheitlicht)
+    return lade_ohlcv(symbol, start_date, end_date, offline=offline)
 
 
 # --- 4. HAUPT-STRATEGIEFUNKTION (Mit SL/TP Simulation) ---
 
-def SMA_strategy_full_risk_control(input_ticker, fast_sma, slow_sma, cost_ind, stop_loss_pct, take_profit_pct):
+def SMA_strategy_full_risk_control(input_ticker, fast_sma, slow_sma, cost_ind, stop_loss_pct, take_profit_pct,
+                                   cache=None):
     """
     Simuliert die SMA Crossover Strategie mit täglicher Überprüfung von 
     Stop-Loss (SL) und Take-Profit (TP).
+    Mit `cache` (z.B. indikator_cache.STANDARD_CACHE) wird jedes SMA-Fenster
+    über einen Parameter-Sweep hinweg nur einmal berechnet.
     """
     df = preprocessing_yf(input_ticker)
     
     # SMA Berechnung
-    df["SMA fast"] = df["close"].rolling(fast_sma).mean()
-    df["SMA slow"] = df["close"].rolling(slow_sma).mean()
+    if cache is None:
+        df["SMA fast"] = df["close"].rolling(fast_sma).mean()
+        df["SMA slow"] = df["close"].rolling(slow_sma).mean()
+    else:
+        close = df["close"].to_numpy(dtype=np.float64)
+        smas = cache.smas(input_ticker, datenversion(close, df.index), close, [fast_sma, slow_sma])
+        df["SMA fast"] = smas[fast_sma]
+        df["SMA slow"] = smas[slow_sma]
     
     # Signale generieren
     df["signal"] = np.nan
@@ -175,38 +177,43 @@ def SMA_strategy_full_risk_control(input_ticker, fast_sma, slow_sma, cost_ind, s
 
 # --- 5. FINALE AUSFÜHRUNG UND ERGEBNISSE ---
 
-# Gesamte Strategie mit den finalen Parametern ausführen
-final_returns = SMA_strategy_full_risk_control(
-    TICKER, 
-    BEST_FAST_SMA, 
-    BEST_SLOW_SMA, 
-    COST, 
-    STOP_LOSS_PCT, 
-    TAKE_PROFIT_PCT
-)
-final_returns_clean = final_returns.dropna()
-
-# Performance-Kennzahlen berechnen
-total_return = final_returns_clean.cumsum().iloc[-1]
-sharpe = sharpe_ratio(final_returns_clean)
-sortino = sortino_ratio(final_returns_clean)
-drawdown = max_drawdown(final_returns_clean)
-
-# Ausgabe der finalen Metriken
-print("\n--- Final Validierte Strategie (Gesamtzeitraum) ---")
-print(f"Asset: {TICKER} | Parameter: {BEST_FAST_SMA}/{BEST_SLOW_SMA} | SL {STOP_LOSS_PCT}% / TP {TAKE_PROFIT_PCT}%")
-print(f"Gesamtrendite: {total_return:.2f}%")
-print(f"Sharpe Ratio: {sharpe:.4f}")
-print(f"Sortino Ratio: {sortino:.4f}")
-print(f"Max Drawdown: {drawdown:.2f}%")
-
-# Equity Curve plotten
-plt.figure(figsize=(15, 8))
-final_returns.cumsum().plot(
-    title=f"Kumulierte Rendite: {TICKER} (SMA {BEST_FAST_SMA}/{BEST_SLOW_SMA} & SL/TP)",
-    ylabel="P&L in %"
-)
-plt.show()
+if __name__ == "__main__":
+    # Gesamte Strategie mit den finalen Parametern ausführen
+    final_returns = SMA_strategy_full_risk_control(
+        TICKER, 
+        BEST_FAST_SMA, 
+        BEST_SLOW_SMA, 
+        COST, 
+        STOP_LOSS_PCT, 
+        TAKE_PROFIT_PCT
+    )
+    final_returns_clean = final_returns.dropna()
+
+    # Performance-Kennzahlen berechnen
+    total_return = final_returns_clean.cumsum().iloc[-1]
+    sharpe = sharpe_ratio(final_returns_clean)
+    sortino = sortino_ratio(final_returns_clean)
+    drawdown = max_drawdown(final_returns_clean)
+
+    # Ausgabe der finalen Metriken
+    print("\n--- Final Validierte Strategie (Gesamtzeitraum) ---")
+    print(f"Asset: {TICKER} | Parameter: {BEST_FAST_SMA}/{BEST_SLOW_SMA} | SL {STOP_LOSS_PCT}% / TP {TAKE_PROFIT_PCT}%")
+    print(f"Gesamtrendite: {total_return:.2f}%")
+    print(f"Sharpe Ratio: {sharpe:.4f}")
+    print(f"Sortino Ratio: {sortino:.4f}")
+    print(f"Max Drawdown: {drawdown:.2f}%")
+
+    # Equity Curve plotten (mit --bericht als PNG-Datei statt Fenster, siehe bericht.py)
+    titel = f"Kumulierte Rendite: {TICKER} (SMA {BEST_FAST_SMA}/{BEST_SLOW_SMA} & SL/TP)"
+    if "--bericht" in sys.argv:
+        from bericht import Berichte
+        with Berichte() as berichte:
+            pfad = berichte.equity(f"{TICKER}_sma_{BEST_FAST_SMA}_{BEST_SLOW_SMA}", final_returns, titel).result()
+        print(f"Bericht: {pfad}")
+    else:
+        plt.figure(figsize=(15, 8))
+        final_returns.cumsum().plot(title=titel, ylabel="P&L in %")
+        plt.show()
 
 
 
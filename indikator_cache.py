@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Gemeinsamer Indikator-Cache für Parameter-Sweeps
+Gleitende Mittel werden pro (Symbol, Datenversion, Indikator, Fenster)
+genau einmal berechnet, alle fehlenden Fenster in einem Aufruf, statt mit
+einem eigenen rolling(n).mean() pro Strategie-Aufruf.
+
+Gerechnet wird mit demselben Verfahren wie pandas' rolling().mean()
+(Kahan-kompensierte laufende Summe, siehe auch streaming_engine.py), die
+Werte sind also bitgenau gleich. Sonst könnten bei fast gleichen schnellen
+und langsamen SMAs im Sweep andere Kreuzungen entstehen als in den
+pandas-basierten Auswertungen von 'first backtest.py'.
+"""
+import hashlib
+import math
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# numba ist optional: pip install numba
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# --- 1. BERECHNUNG ---
+
+def datenversion(close, index=None):
+    """Kurzer Fingerabdruck der Kursdaten: ändern sie sich, ändert sich auch der Cache-Schlüssel."""
+    pruefsumme = hashlib.blake2b(np.ascontiguousarray(close, dtype=np.float64).tobytes(), digest_size=12)
+    if index is not None:
+        pruefsumme.update(np.asarray(index).astype("datetime64[ns]").view(np.int64).tobytes())
+    return pruefsumme.hexdigest()
+
+
+def _rollende_mittel_schleife(close, fenster, ergebnis):
+    """
+    roll_mean aus pandas für jedes Fenster: Wert dazu (Kompensation fürs
+    Hinzufügen), ältesten Wert weg (eigene Kompensation), NaN zählt nicht mit,
+    gleiche Werte in Folge ergeben exakt den Wert.
+    """
+    n = len(close)
+    for k in range(len(fenster)):
+        w = fenster[k]
+        if w < 1 or w > n:
+            continue
+        anzahl = 0
+        negative = 0
+        summe = 0.0
+        kompensation_dazu = 0.0
+        kompensation_weg = 0.0
+        gleiche_in_folge = 0
+        letzter_wert = close[0]
+        for i in range(n):
+            if i >= w:
+                x = close[i - w]
+                if x == x:
+                    anzahl -= 1
+                    y = -x - kompensation_weg
+                    t = summe + y
+                    kompensation_weg = t - summe - y
+                    summe = t
+                    if math.copysign(1.0, x) < 0:
+                        negative -= 1
+            x = close[i]
+            if x == x:
+                anzahl += 1
+                y = x - kompensation_dazu
+                t = summe + y
+                kompensation_dazu = t - summe - y
+                summe = t
+                if math.copysign(1.0, x) < 0:
+                    negative += 1
+                if x == letzter_wert:
+                    gleiche_in_folge += 1
+                else:
+                    gleiche_in_folge = 1
+                letzter_wert = x
+
+            if anzahl < w:
+                continue
+            mittel = summe / anzahl
+            if gleiche_in_folge >= anzahl:
+                mittel = letzter_wert
+            elif negative == 0 and mittel < 0:
+                mittel = 0.0
+            elif negative == anzahl and mittel > 0:
+                mittel = 0.0
+            ergebnis[k, i] = mittel
+    return ergebnis
+
+
+_rollende_mittel_kern = njit(cache=True)(_rollende_mittel_schleife) if njit is not None else None
+
+
+def rollende_mittel(close, fenster_liste):
+    """
+    rolling(w).mean() für alle Fenster als Matrix (Fenster x Bars), bitgenau
+    wie pandas: NaN, solange das Fenster nicht voll ist oder ein NaN enthält.
+    Mit numba ein kompilierter Durchlauf pro Fenster, sonst pandas selbst.
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    fenster = np.asarray(fenster_liste, dtype=np.int64)
+    ergebnis = np.full((len(fenster), len(close)), np.nan)
+    if _rollende_mittel_kern is not None:
+        return _rollende_mittel_kern(close, fenster, ergebnis)
+
+    reihe = pd.Series(close)
+    for zeile, w in zip(ergebnis, fenster):
+        if 1 <= w <= len(close):
+            zeile[:] = reihe.rolling(int(w)).mean().to_numpy()
+    return ergebnis
+
+
+# --- 2. CACHE ---
+
+class IndikatorCache:
+    """
+    LRU-Cache für Indikator-Reihen, Schlüssel (Symbol, Datenversion, Indikator, Fenster).
+    Die zurückgegebenen Arrays sind schreibgeschützt, da sie geteilt werden.
+    """
+
+    def __init__(self, max_eintraege=2048):
+        self.max_eintraege = max_eintraege
+        self._eintraege = OrderedDict()
+        self.treffer = 0
+        self.berechnet = 0
+
+    def __len__(self):
+        return len(self._eintraege)
+
+    def smas(self, symbol, version, close, fenster_liste):
+        """Gibt {Fenster: SMA-Array} zurück; alle fehlenden Fenster werden in einem Durchgang berechnet."""
+        ergebnis = {}
+        fehlend = []
+        for w in dict.fromkeys(int(w) for w in fenster_liste):
+            schluessel = (symbol, version, "sma", w)
+            if schluessel in self._eintraege:
+                self._eintraege.move_to_end(schluessel)
+                ergebnis[w] = self._eintraege[schluessel]
+                self.treffer += 1
+            else:
+                fehlend.append(w)
+
+        if fehlend:
+            matrix = rollende_mittel(close, fehlend)
+            matrix.flags.writeable = False
+            for w, reihe in zip(fehlend, matrix):
+                self._eintraege[(symbol, version, "sma", w)] = reihe
+                ergebnis[w] = reihe
+            self.berechnet += len(fehlend)
+            while len(self._eintraege) > self.max_eintraege:
+                self._eintraege.popitem(last=False)
+        return ergebnis
+
+    def sma(self, symbol, version, close, fenster):
+        return self.smas(symbol, version, close, [fenster])[int(fenster)]
+
+    def leeren(self):
+        self._eintraege.clear()
+
+
+# Gemeinsamer Cache für alle Strategien in einem Prozess
+STANDARD_CACHE = IndikatorCache()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Intrabar-Auflösung von Stop-Loss/Take-Profit mit Minuten-Bars
+Die Tagessimulation sieht nur High und Low eines Tages; werden beide Levels
+berührt, zählt im Original immer TP, was die Ergebnisse schönt. Für genau
+diese Tage schaut IntrabarAufloesung in die Minuten-Bars aus dem lokalen
+Marktdaten-Speicher und liefert, welches Level zuerst ausgelöst hat.
+
+Die Minuten-Historie wird dabei nie ganz geladen: die Datei ist eine
+Memory-Map, pro fraglichem Tag wird nur dessen Ausschnitt (per Binärsuche
+auf der Zeitspalte) gelesen. Minuten-Bars kommen z.B. über
+    python marktdaten_cache.py BTC-USD --intervall 1m --jahre 0.08
+in den Speicher.
+
+Verwendung:
+    aufloesung = IntrabarAufloesung("BTC-USD", df.index)
+    SMA_strategy_full_risk_control_fast(df, 25, 70, COST, 1.5, 7.0, intrabar=aufloesung)
+"""
+import numpy as np
+import pandas as pd
+
+from marktdaten_cache import STANDARD_SPEICHER
+
+TP_ZUERST = 1
+SL_ZUERST = -1
+
+
+def _als_utc_ns(zeitpunkte):
+    # Der Speicher legt Zeiten als UTC ohne Zeitzone ab
+    index = pd.DatetimeIndex(zeitpunkte)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+class IntrabarAufloesung:
+    """
+    Entscheidet für Tage, an denen SL und TP beide berührt werden, anhand der
+    Minuten-Bars, was zuerst ausgelöst hat (Aufruf durch simuliere_sl_tp).
+
+    bei_gleichstand: Ergebnis, wenn beide Levels im selben Minuten-Bar liegen
+                     (Standard SL, also vorsichtig).
+    ohne_daten:      Ergebnis, wenn für den Tag keine Minuten-Bars vorliegen
+                     oder sie keines der Levels erreichen (Standard TP wie im Original).
+    """
+
+    def __init__(self, symbol, index, speicher=None, intervall="1m", bei_gleichstand=SL_ZUERST,
+                 ohne_daten=TP_ZUERST):
+        self.symbol = symbol
+        self.intervall = intervall
+        self.bei_gleichstand = bei_gleichstand
+        self.ohne_daten = ohne_daten
+        self._speicher = speicher or STANDARD_SPEICHER
+        self._bar_start = _als_utc_ns(index)
+        self._index = index
+        self._minuten = None
+        self._geladen = False
+
+        self.entscheidungen = {} # Zeitstempel des Tages -> TP_ZUERST / SL_ZUERST
+        self.ohne_minutendaten = 0
+        self.gleichstand = 0
+
+    def _minuten_bars(self):
+        # Erst beim ersten fraglichen Tag öffnen; ohne solche Tage wird die Datei nie angefasst
+        if not self._geladen:
+            self._minuten = self._speicher.memmap(self.symbol, self.intervall)
+            self._geladen = True
+        return self._minuten
+
+    def _zeitraum(self, i):
+        """[von, bis) des Bars i in UTC-Nanosekunden: bis zum nächsten Bar bzw. gleich lang wie der vorige."""
+        von = self._bar_start[i]
+        if i + 1 < len(self._bar_start):
+            return von, self._bar_start[i + 1]
+        return von, von + (von - self._bar_start[i - 1])
+
+    def __call__(self, i, position, entry_price, sl_level, tp_level):
+        entscheidung = self._entscheide(i, position, entry_price, sl_level, tp_level)
+        self.entscheidungen[self._index[i]] = entscheidung
+        return entscheidung
+
+    def _entscheide(self, i, position, entry_price, sl_level, tp_level):
+        minuten = self._minuten_bars()
+        if minuten is None:
+            self.ohne_minutendaten += 1
+            return self.ohne_daten
+
+        von, bis = np.searchsorted(minuten['zeit'], self._zeitraum(i))
+        tag = minuten[von:bis]
+        high, low = np.asarray(tag['high']), np.asarray(tag['low'])
+
+        # Gleiche Bedingungen wie in der Tagessimulation, nur pro Minute
+        if position == 1:
+            tp_treffer = (high / entry_price) - 1 >= tp_level
+            sl_treffer = (low / entry_price) - 1 < -sl_level
+        else:
+            tp_treffer = 1 - (low / entry_price) >= tp_level
+            sl_treffer = (high / entry_price) - 1 > sl_level
+
+        erster_tp = np.argmax(tp_treffer) if tp_treffer.any() else len(tag)
+        erster_sl = np.argmax(sl_treffer) if sl_treffer.any() else len(tag)
+        if erster_tp == erster_sl:
+            if erster_tp == len(tag):
+                self.ohne_minutendaten += 1
+                return self.ohne_daten
+            self.gleichstand += 1
+            return self.bei_gleichstand
+        return TP_ZUERST if erster_tp < erster_sl else SL_ZUERST
+
+    def zusammenfassung(self):
+        """Anzahl der aufgelösten Tage nach Ergebnis, für einen Vergleich mit dem Original."""
+        werte = list(self.entscheidungen.values())
+        return {'tage': len(werte), 'tp_zuerst': werte.count(TP_ZUERST), 'sl_zuerst': werte.count(SL_ZUERST),
+                'gleichstand': self.gleichstand, 'ohne_minutendaten': self.ohne_minutendaten}
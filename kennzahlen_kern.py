@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Kennzahlen-Kern: Gesamtrendite, Sharpe, Sortino, Max Drawdown, Downside Deviation
+Dieselben Definitionen wie max_drawdown, downside_deviation, sharpe_ratio und
+sortino_ratio in 'first backtest.py', aber in einem einzigen Durchlauf über
+ein NumPy-Array (Mittel und Streuung nach Welford, Drawdown über das laufende
+Maximum) statt mehrerer pandas-Durchläufe mit Masken-Kopien. NaN-Werte werden
+wie bei returns.dropna() übersprungen.
+
+Darauf aufbauend: Kennzahlen für viele Reihen auf einmal (Zeilen einer
+2D-Matrix), rollende Kennzahlen und Bootstrap-Konfidenzintervalle, bei denen
+tausende gezogene Rendite-Pfade als eine Matrix ausgewertet werden.
+Mit numba wird der Kern kompiliert, ohne numba rechnet NumPy spaltenweise.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# numba ist optional: pip install numba
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+KENNZAHLEN = ('gesamtrendite', 'sharpe', 'sortino', 'max_drawdown', 'downside_deviation')
+PERIODEN = 252 # Annualisierung wie im Original (Handelstage pro Jahr)
+
+
+# --- 1. KERN ---
+
+def _kennzahlen_schleife(r, perioden, ergebnis):
+    """Ein Durchlauf über r, schreibt die Werte in der Reihenfolge von KENNZAHLEN nach `ergebnis`."""
+    anzahl = 0
+    summe = 0.0
+    mittel = 0.0
+    m2 = 0.0
+    anzahl_neg = 0
+    mittel_neg = 0.0
+    m2_neg = 0.0
+    kumuliert = 1.0
+    hoch = -math.inf
+    drawdown = math.inf
+
+    for x in r:
+        if x != x:
+            continue
+        anzahl += 1
+        summe += x
+        delta = x - mittel
+        mittel += delta / anzahl
+        m2 += delta * (x - mittel)
+        if x < 0:
+            anzahl_neg += 1
+            delta = x - mittel_neg
+            mittel_neg += delta / anzahl_neg
+            m2_neg += delta * (x - mittel_neg)
+        kumuliert = kumuliert * (1 + x / 100)
+        hoch = max(hoch, kumuliert)
+        drawdown = min(drawdown, kumuliert / hoch - 1)
+
+    wurzel = math.sqrt(perioden)
+    if anzahl == 0:
+        ergebnis[:] = math.nan
+        return
+    volatilitaet = math.sqrt(m2 / (anzahl - 1)) * wurzel if anzahl > 1 else math.nan
+    downside = math.sqrt(m2_neg / (anzahl_neg - 1)) * wurzel if anzahl_neg > 1 else math.nan
+    jahresrendite = mittel * perioden
+
+    ergebnis[0] = summe
+    ergebnis[1] = jahresrendite / volatilitaet if volatilitaet != 0 else math.nan
+    ergebnis[2] = jahresrendite / downside if downside != 0 and downside == downside else math.nan
+    ergebnis[3] = drawdown * 100
+    ergebnis[4] = downside
+
+
+def _kennzahlen_zeilen_schleife(matrix, perioden, ergebnis):
+    for i in range(matrix.shape[0]):
+        _kennzahlen_kern(matrix[i], perioden, ergebnis[i])
+    return ergebnis
+
+
+def _kennzahlen_zeilen_numpy(matrix, perioden):
+    """Ohne numba: dieselben Kennzahlen spaltenweise vektorisiert, eine Zeile je Reihe."""
+    gueltig = ~np.isnan(matrix)
+    x = np.where(gueltig, matrix, 0.0)
+    anzahl = gueltig.sum(axis=1)
+    negativ = gueltig & (matrix < 0)
+    anzahl_neg = negativ.sum(axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        summe = x.sum(axis=1)
+        mittel = summe / anzahl
+        varianz = np.where(gueltig, matrix - mittel[:, None], 0.0) ** 2
+        volatilitaet = np.sqrt(varianz.sum(axis=1) / (anzahl - 1)) * np.sqrt(perioden)
+        mittel_neg = np.where(negativ, matrix, 0.0).sum(axis=1) / anzahl_neg
+        varianz_neg = np.where(negativ, matrix - mittel_neg[:, None], 0.0) ** 2
+        downside = np.sqrt(varianz_neg.sum(axis=1) / (anzahl_neg - 1)) * np.sqrt(perioden)
+        downside[anzahl_neg < 2] = np.nan
+        volatilitaet[anzahl < 2] = np.nan
+
+        kumuliert = np.cumprod(1 + x / 100, axis=1)
+        drawdown = (kumuliert / np.maximum.accumulate(kumuliert, axis=1) - 1).min(axis=1, initial=0.0) * 100
+        jahresrendite = mittel * perioden
+        sharpe = np.where(volatilitaet != 0, jahresrendite / volatilitaet, np.nan)
+        sortino = np.where(downside != 0, jahresrendite / downside, np.nan)
+
+    ergebnis = np.column_stack([summe, sharpe, sortino, drawdown, downside])
+    ergebnis[anzahl == 0] = np.nan
+    return ergebnis
+
+
+_kennzahlen_kern = njit(cache=True)(_kennzahlen_schleife) if njit is not None else None
+_kennzahlen_zeilen = njit(cache=True)(_kennzahlen_zeilen_schleife) if njit is not None else None
+
+
+def kennzahlen_matrix(matrix, perioden=PERIODEN):
+    """Kennzahlen für jede Zeile einer 2D-Matrix; Ergebnis (Zeilen x 5) in der Reihenfolge von KENNZAHLEN."""
+    matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+    if matrix.ndim != 2:
+        raise ValueError(f"Erwartet eine 2D-Matrix, nicht {matrix.ndim}D.")
+    if _kennzahlen_zeilen is not None:
+        return _kennzahlen_zeilen(matrix, perioden, np.empty((matrix.shape[0], len(KENNZAHLEN))))
+    return _kennzahlen_zeilen_numpy(matrix, perioden)
+
+
+def kennzahlen(returns, perioden=PERIODEN):
+    """Alle Kennzahlen einer Rendite-Reihe (in %) als dict, wie Abschnitt 5 von 'first backtest.py'."""
+    werte = kennzahlen_matrix(np.asarray(returns, dtype=np.float64)[None, :], perioden)[0]
+    return dict(zip(KENNZAHLEN, werte.tolist()))
+
+
+# --- 2. ROLLENDE KENNZAHLEN ---
+
+def rollende_kennzahlen(returns, fenster, perioden=PERIODEN):
+    """
+    Kennzahlen über jedes Fenster der letzten `fenster` Bars (wie rolling(fenster)),
+    als DataFrame mit einer Spalte pro Kennzahl; die ersten fenster-1 Zeilen sind NaN.
+
+    Jedes Fenster wird vollständig neu ausgewertet (Aufwand O(n * fenster)),
+    es gibt kein Nachführen beim Weiterschieben: der Max Drawdown eines
+    Fensters hängt vom laufenden Maximum ab dessen erstem Bar ab und lässt sich
+    nicht durch Entfernen des ältesten Werts aktualisieren. Dafür sind die
+    Werte identisch mit kennzahlen() auf dem jeweiligen Ausschnitt.
+    """
+    index = returns.index if isinstance(returns, pd.Series) else None
+    r = np.ascontiguousarray(returns, dtype=np.float64)
+    ergebnis = np.full((len(r), len(KENNZAHLEN)), np.nan)
+    if 0 < fenster <= len(r):
+        fenster_ansicht = sliding_window_view(r, fenster)
+        # In Blöcken, damit die NumPy-Variante keine riesigen Zwischen-Matrizen anlegt
+        block = max(1, 2 ** 22 // fenster)
+        for start in range(0, len(fenster_ansicht), block):
+            teil = fenster_ansicht[start:start + block]
+            ergebnis[fenster - 1 + start:fenster - 1 + start + len(teil)] = kennzahlen_matrix(teil, perioden)
+    return pd.DataFrame(ergebnis, index=index, columns=list(KENNZAHLEN))
+
+
+# --- 3. BOOTSTRAP ---
+
+def bootstrap_indizes(anzahl_bars, anzahl_pfade, block_laenge=1, rnd=None):
+    """
+    Zufällige Bar-Indizes (anzahl_pfade x anzahl_bars). Mit block_laenge > 1
+    werden zusammenhängende Blöcke gezogen (Moving-Block-Bootstrap), damit
+    Abhängigkeiten zwischen aufeinanderfolgenden Renditen erhalten bleiben.
+    """
+    rnd = rnd if rnd is not None else np.random.default_rng()
+    block_laenge = max(1, min(block_laenge, anzahl_bars))
+    anzahl_bloecke = -(-anzahl_bars // block_laenge)
+    starts = rnd.integers(0, anzahl_bars - block_laenge + 1, size=(anzahl_pfade, anzahl_bloecke))
+    indizes = (starts[:, :, None] + np.arange(block_laenge)).reshape(anzahl_pfade, -1)
+    return indizes[:, :anzahl_bars]
+
+
+def bootstrap_stichproben(returns, anzahl_pfade=1000, block_laenge=1, seed=42, perioden=PERIODEN):
+    """Kennzahlen von `anzahl_pfade` gezogenen Rendite-Pfaden als Matrix (Pfade x KENNZAHLEN)."""
+    r = np.asarray(returns, dtype=np.float64)
+    r = r[~np.isnan(r)]
+    rnd = np.random.default_rng(seed)
+    ergebnis = np.full((anzahl_pfade, len(KENNZAHLEN)), np.nan)
+    if len(r) == 0:
+        return ergebnis
+    # Pfade blockweise ziehen, damit die Matrix bei langen Reihen nicht zu groß wird
+    block = max(1, 2 ** 22 // max(1, len(r)))
+    for start in range(0, anzahl_pfade, block):
+        anzahl = min(block, anzahl_pfade - start)
+        pfade = r[bootstrap_indizes(len(r), anzahl, block_laenge, rnd)]
+        ergebnis[start:start + anzahl] = kennzahlen_matrix(pfade, perioden)
+    return ergebnis
+
+
+def bootstrap_kennzahlen(returns, anzahl_pfade=1000, block_laenge=1, konfidenz=0.95, seed=42, perioden=PERIODEN):
+    """Punktschätzer und Konfidenzintervall (Perzentile der Bootstrap-Verteilung) je Kennzahl."""
+    stichproben = bootstrap_stichproben(returns, anzahl_pfade, block_laenge, seed, perioden)
+    alpha = (1 - konfidenz) / 2
+    with np.errstate(invalid='ignore'):
+        unten, oben = np.nanquantile(stichproben, [alpha, 1 - alpha], axis=0)
+    tabelle = pd.DataFrame({'wert': list(kennzahlen(returns, perioden).values()),
+                            'unten': unten, 'oben': oben}, index=list(KENNZAHLEN))
+    tabelle.index.name = "kennzahl"
+    return tabelle
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Lokaler OHLCV-Speicher für preprocessing_yf
+Pro Symbol und Intervall liegt eine strukturierte NumPy-Datei (Zeit, OHLCV)
+auf der Platte, die per Memory-Map geladen wird. Online werden nur die Bars
+ab dem letzten gespeicherten Datum nachgeladen (der letzte Bar wird dabei
+ersetzt, da er beim Abruf noch unvollständig gewesen sein kann); ein Bereich,
+der schon einmal abgerufen wurde, kommt ganz ohne Netzwerk von der Platte.
+Im Offline-Modus (offline=True oder MARKTDATEN_OFFLINE=1) wird nie etwas
+heruntergeladen.
+
+Aufruf: python marktdaten_cache.py SYMBOL [SYMBOL ...] [--jahre N] [--intervall 1m]   (Vorbefüllen)
+"""
+import datetime
+import json
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+MARKTDATEN_VERZEICHNIS = os.environ.get(
+    "MARKTDATEN_VERZEICHNIS", os.path.join(os.path.dirname(os.path.abspath(__file__)), "marktdaten"))
+OFFLINE = os.environ.get("MARKTDATEN_OFFLINE", "") not in ("", "0")
+
+SPALTEN = ['open', 'high', 'low', 'close', 'volume']
+BAR_DTYPE = np.dtype([('zeit', 'i8')] + [(spalte, 'f8') for spalte in SPALTEN])
+
+
+# --- 1. HILFSFUNKTIONEN ---
+
+def spalten_vereinheitlichen(data):
+    """Spaltennamen von yf.download vereinheitlichen (MultiIndex -> 'close' usw.)."""
+    df = pd.DataFrame(data)
+    if isinstance(df.columns, pd.MultiIndex):
+        # Neuere yfinance-Versionen liefern (Feld, Symbol); nur das Feld behalten
+        df.columns = df.columns.get_level_values(0)
+    df.columns = [str(col).lower().replace(' ', '_') for col in df.columns]
+    return df[SPALTEN]
+
+
+def _dateiname(symbol, intervall):
+    # Zeichen wie '=', '^' oder '/' in Tickern (EURUSD=X, ^GSPC) sind in Dateinamen ungünstig
+    return re.sub(r'[^A-Za-z0-9._-]', '_', f"{symbol}_{intervall}")
+
+
+def _als_datum(wert):
+    return pd.Timestamp(wert).date() if not isinstance(wert, datetime.date) else wert
+
+
+# --- 2. SPEICHER ---
+
+class MarktdatenSpeicher:
+    """OHLCV-Bars pro (Symbol, Intervall) als Memory-Map-Datei plus kleine JSON-Metadaten."""
+
+    def __init__(self, verzeichnis=None, offline=None, download=None):
+        self.verzeichnis = verzeichnis or MARKTDATEN_VERZEICHNIS
+        self.offline = OFFLINE if offline is None else offline
+        self._download = download # Für eigene Datenquellen; Standard ist yf.download
+        self.downloads = 0
+
+    def _pfade(self, symbol, intervall):
+        basis = os.path.join(self.verzeichnis, _dateiname(symbol, intervall))
+        return basis + ".npy", basis + ".json"
+
+    def _lade_rohdaten(self, symbol, intervall):
+        """Gibt (Bars, Metadaten) zurück oder (None, None), wenn nichts gespeichert ist."""
+        daten_pfad, meta_pfad = self._pfade(symbol, intervall)
+        try:
+            with open(meta_pfad, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            bars = np.load(daten_pfad, mmap_mode='r')
+        except FileNotFoundError:
+            return None, None
+        return bars, meta
+
+    def _speichere(self, symbol, intervall, bars, meta):
+        """Schreibt Daten und Metadaten atomar (tmp-Datei + os.replace)."""
+        os.makedirs(self.verzeichnis, exist_ok=True)
+        daten_pfad, meta_pfad = self._pfade(symbol, intervall)
+        with open(daten_pfad + ".tmp", 'wb') as f:
+            np.save(f, bars)
+        os.replace(daten_pfad + ".tmp", daten_pfad)
+        with open(meta_pfad + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(meta_pfad + ".tmp", meta_pfad)
+
+    def _abrufen(self, symbol, start, end, intervall):
+        """Lädt Bars im Bereich [start, end) herunter und gibt (Bars, Zeitzone) zurück."""
+        if self._download is not None:
+            data = self._download(symbol, start=start, end=end, interval=intervall)
+        else:
+            import yfinance as yf
+            data = yf.download(symbol, start=start, end=end, interval=intervall, progress=False)
+        self.downloads += 1
+
+        df = spalten_vereinheitlichen(data).dropna()
+        index = pd.DatetimeIndex(df.index)
+        zeitzone = str(index.tz) if index.tz is not None else None
+        if zeitzone is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+
+        bars = np.empty(len(df), dtype=BAR_DTYPE)
+        bars['zeit'] = index.as_unit("ns").asi8
+        for spalte in SPALTEN:
+            bars[spalte] = df[spalte].to_numpy(dtype=np.float64)
+        return bars, zeitzone
+
+    def aktualisieren(self, symbol, start, end, intervall="1d"):
+        """
+        Sorgt dafür, dass [start, end) im Speicher liegt, und lädt dafür nur
+        fehlende Bereiche herunter. Gibt die gespeicherten Bars zurück.
+        """
+        start, end = _als_datum(start), _als_datum(end)
+        bars, meta = self._lade_rohdaten(symbol, intervall)
+
+        if bars is not None:
+            abgerufen_ab = datetime.date.fromisoformat(meta['abgerufen_ab'])
+            abgerufen_bis = datetime.date.fromisoformat(meta['abgerufen_bis'])
+            if self.offline or (abgerufen_ab <= start and end <= abgerufen_bis):
+                return bars, meta
+        elif self.offline:
+            raise FileNotFoundError(f"Keine lokalen Marktdaten für '{symbol}' ({intervall}) im Offline-Modus.")
+
+        if bars is None:
+            neu, zeitzone = self._abrufen(symbol, start, end, intervall)
+            meta = {'symbol': symbol, 'intervall': intervall, 'zeitzone': zeitzone,
+                    'abgerufen_ab': start.isoformat(), 'abgerufen_bis': end.isoformat()}
+            self._speichere(symbol, intervall, neu, meta)
+            return self._lade_rohdaten(symbol, intervall)
+
+        teile = [np.asarray(bars)]
+        if start < abgerufen_ab:
+            davor, _ = self._abrufen(symbol, start, abgerufen_ab, intervall)
+            teile.insert(0, davor)
+            meta['abgerufen_ab'] = start.isoformat()
+        if end > abgerufen_bis:
+            # Ab dem Datum des letzten Bars nachladen: er selbst wird durch den neuen Abruf ersetzt
+            letzter = pd.Timestamp(int(bars['zeit'][-1])).date() if len(bars) else abgerufen_bis
+            danach, _ = self._abrufen(symbol, min(letzter, abgerufen_bis), end, intervall)
+            teile.append(danach)
+            meta['abgerufen_bis'] = end.isoformat()
+
+        # Zusammenführen: bei gleichem Zeitstempel gewinnt der neuere Abruf
+        alle = np.concatenate(teile)
+        zeiten = alle['zeit'][::-1]
+        _, letzte = np.unique(zeiten, return_index=True)
+        zusammen = alle[len(alle) - 1 - letzte]
+        del bars, teile # Memory-Map freigeben, bevor die Datei ersetzt wird
+        self._speichere(symbol, intervall, zusammen, meta)
+        return self._lade_rohdaten(symbol, intervall)
+
+    def lade(self, symbol, start, end, intervall="1d"):
+        """OHLCV-DataFrame für [start, end) wie von preprocessing_yf (Index 'Date')."""
+        bars, meta = self.aktualisieren(symbol, start, end, intervall)
+        zeiten = bars['zeit']
+        von, bis = np.searchsorted(zeiten, [pd.Timestamp(_als_datum(start)).value,
+                                            pd.Timestamp(_als_datum(end)).value])
+        ausschnitt = bars[von:bis]
+
+        index = pd.DatetimeIndex(ausschnitt['zeit'].astype("datetime64[ns]"), name="Date")
+        if meta.get('zeitzone'):
+            index = index.tz_localize("UTC").tz_convert(meta['zeitzone'])
+        return pd.DataFrame({spalte: np.array(ausschnitt[spalte]) for spalte in SPALTEN}, index=index)
+
+    def memmap(self, symbol, intervall):
+        """Alle gespeicherten Bars als schreibgeschützte Memory-Map (ohne Download), None wenn nicht vorhanden."""
+        return self._lade_rohdaten(symbol, intervall)[0]
+
+
+# Gemeinsamer Speicher für preprocessing_yf in einem Prozess
+STANDARD_SPEICHER = MarktdatenSpeicher()
+
+
+def lade_ohlcv(symbol, start, end, intervall="1d", offline=None):
+    """Kurzform für preprocessing_yf: STANDARD_SPEICHER, optional mit abweichendem Offline-Modus."""
+    if offline is None or offline == STANDARD_SPEICHER.offline:
+        return STANDARD_SPEICHER.lade(symbol, start, end, intervall)
+    return MarktdatenSpeicher(STANDARD_SPEICHER.verzeichnis, offline).lade(symbol, start, end, intervall)
+
+
+# --- 3. VORBEFÜLLEN ---
+
+if __name__ == "__main__":
+    argumente = sys.argv[1:]
+    optionen = {"--jahre": "5", "--intervall": "1d"}
+    for name in optionen:
+        if name in argumente:
+            position = argumente.index(name)
+            optionen[name] = argumente[position + 1]
+            del argumente[position:position + 2]
+    jahre = float(optionen["--jahre"])
+
+    ende = datetime.date.today() + datetime.timedelta(days=1) # end ist exklusiv, heute mitnehmen
+    for symbol in argumente:
+        df = lade_ohlcv(symbol, ende - datetime.timedelta(days=round(jahre * 365)), ende, optionen["--intervall"],
+                        offline=False)
+        print(f"{symbol}: {len(df)} Bars bis {df.index[-1] if len(df) else '-'} in {MARKTDATEN_VERZEICHNIS}")
@@ -2,12 +2,23 @@ import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk 
 import json
+import csv
 import os
 import sys
 import re 
-from typing import List, Dict, Any, Optional, Set
-from operator import attrgetter
-from datetime import datetime
+import queue
+import sqlite3
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import partial
+from itertools import compress, islice
+from typing import List, Dict, Any, Optional, Set, Iterable, Callable
+from datetime import datetime, timedelta, timezone
 
 # Pydantic muss installiert sein: pip install pydantic
 from pydantic import BaseModel, EmailStr, ValidationError
@@ -15,6 +26,11 @@ from pydantic import BaseModel, EmailStr, ValidationError
 # --- KONSTANTE ---
 DATEI_NAME = 'meine_mini_db.json'
 STADT_DATEI_NAME = 'staedte_db.json' 
+WAL_DATEI_NAME = 'meine_mini_db.wal'
+SQLITE_DATEI_NAME = 'meine_mini_db.sqlite'
+SORTIER_FELDER = ('id', 'name', 'email', 'stadt', 'erstellungsdatum', 'stadt_id')
+TREEVIEW_KOPFZEILE = 25 # Pixel für die Spaltenüberschriften (virtuelles Scrollen)
+ERGEBNIS_INTERVALL_MS = 30 # Wie oft der Tk-Thread nach fertigen DB-Aufträgen schaut
 
 # ====================================================================
 # I. DIE DATENSTRUKTUR-KLASSEN (NORMALISIERT)
@@ -64,23 +80,713 @@ class _OldPerson(BaseModel):
         from_attributes = True
 
 
+def _konvertiere_alte_personen(alt_daten: List[_OldPerson], finde_oder_erstelle_stadt: Callable[..., int]) -> List[Person]:
+    """Migrationspfad: Personen im alten Format (Stadt als Text) in normalisierte Personen umwandeln."""
+    neue_personen: List[Person] = []
+    
+    for old_person in alt_daten:
+        # 1. Stadt-ID für den alten Stadtnamen ermitteln/erstellen
+        stadt_id = finde_oder_erstelle_stadt(old_person.stadt, migrieren=True) 
+        
+        # 2. Neue Person-Objekt erstellen
+        neue_person = Person(
+            id=old_person.id,
+            name=old_person.name,
+            email=old_person.email,
+            stadt_id=stadt_id,
+            erstellungsdatum=old_person.erstellungsdatum
+        )
+        neue_personen.append(neue_person)
+    
+    return neue_personen
+
+
+# --- SPALTENORIENTIERTE ABLAGE (SPEICHERSPARENDE ALTERNATIVE ZU List[Person]) ---
+class SpaltenTabelle:
+    """Hält die Personen spaltenweise statt als einzelne Pydantic-Objekte.
+
+    id, stadt_id und erstellungsdatum (Mikrosekunden seit 1970) liegen in
+    int64-Arrays, Namen werden interniert (gleiche Namen teilen sich ein
+    Objekt), E-Mails stehen in einer einfachen String-Liste. Nach außen
+    verhält sich die Tabelle wie eine Liste von Personen (len, Index,
+    append, pop, Iteration); ein Person-Modell entsteht aber erst beim
+    Zugriff und ist eine Kopie. Änderungen müssen daher per
+    `tabelle[pos] = person` zurückgeschrieben werden.
+    """
+
+    KEIN_DATUM = -2**63 # erstellungsdatum ist None
+    DATUM_MIT_ZONE = -2**63 + 1 # Zeitzonenbehaftetes Datum, steht in _datum_mit_zone
+    _EPOCHE = datetime(1970, 1, 1)
+    _MIKROSEKUNDE = timedelta(microseconds=1)
+
+    def __init__(self, personen: Iterable[Person] = ()):
+        self.ids = array('q')
+        self.stadt_ids = array('q')
+        self.zeitstempel = array('q')
+        self.namen: List[str] = []
+        self.emails: List[str] = []
+        self._datum_mit_zone: Dict[int, datetime] = {} # ID -> Datum (selten, daher nicht als Spalte)
+        self._suchtexte: Dict[str, tuple] = {} # Feld -> (Suchtext, Zeilenanfänge), bis zur nächsten Änderung
+        for person in personen:
+            self.append(person)
+
+    @classmethod
+    def aus_spalten(cls, ids: Iterable[int], stadt_ids: Iterable[int], namen: Iterable[str],
+                    emails: Iterable[str], daten: Iterable[Optional[datetime]]) -> "SpaltenTabelle":
+        """Baut die Tabelle direkt aus parallelen Spalten auf, ohne Person-Modelle zu erzeugen."""
+        tabelle = cls()
+        tabelle.ids = array('q', ids)
+        tabelle.stadt_ids = array('q', stadt_ids)
+        tabelle.namen = [sys.intern(name) for name in namen]
+        tabelle.emails = list(emails)
+        tabelle.zeitstempel = array('q', [tabelle._zeitstempel(p_id, datum) for p_id, datum in zip(tabelle.ids, daten)])
+        return tabelle
+
+    # --- LISTEN-SCHNITTSTELLE ---
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, pos: int) -> Person:
+        return Person.model_construct(
+            id=self.ids[pos], name=self.namen[pos], email=self.emails[pos],
+            stadt_id=self.stadt_ids[pos], erstellungsdatum=self._datum(pos)
+        )
+
+    def __setitem__(self, pos: int, person: Person):
+        self._datum_mit_zone.pop(self.ids[pos], None)
+        self.ids[pos] = person.id
+        self.stadt_ids[pos] = person.stadt_id
+        self.namen[pos] = sys.intern(person.name)
+        self.emails[pos] = person.email
+        self.zeitstempel[pos] = self._zeitstempel(person.id, person.erstellungsdatum)
+        self._suchtexte.clear()
+
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self.ids)))
+
+    def append(self, person: Person):
+        self.ids.append(person.id)
+        self.stadt_ids.append(person.stadt_id)
+        self.namen.append(sys.intern(person.name))
+        self.emails.append(person.email)
+        self.zeitstempel.append(self._zeitstempel(person.id, person.erstellungsdatum))
+        self._suchtexte.clear()
+
+    def pop(self) -> Person:
+        person = self[-1]
+        self._datum_mit_zone.pop(person.id, None)
+        for spalte in (self.ids, self.stadt_ids, self.namen, self.emails, self.zeitstempel):
+            spalte.pop()
+        self._suchtexte.clear()
+        return person
+
+    def copy(self) -> "SpaltenTabelle":
+        kopie = SpaltenTabelle()
+        kopie.ids = array('q', self.ids)
+        kopie.stadt_ids = array('q', self.stadt_ids)
+        kopie.zeitstempel = array('q', self.zeitstempel)
+        kopie.namen = list(self.namen)
+        kopie.emails = list(self.emails)
+        kopie._datum_mit_zone = dict(self._datum_mit_zone)
+        return kopie
+
+    # --- SPALTENZUGRIFF ---
+    def spalte(self, feld: str) -> Iterable[Any]:
+        """Gibt die Werte eines Feldes in Tabellenreihenfolge zurück."""
+        if feld == 'id':
+            return self.ids
+        if feld == 'stadt_id':
+            return self.stadt_ids
+        if feld == 'name':
+            return self.namen
+        if feld == 'email':
+            return self.emails
+        if feld == 'erstellungsdatum':
+            return [self._datum(pos) for pos in range(len(self.ids))]
+        raise ValueError(f"Unbekannte Spalte '{feld}'.")
+
+    def suche(self, feld: str, suchwert: str) -> Set[int]:
+        """Gibt die IDs aller Zeilen zurück, deren name/email `suchwert` enthält (Groß-/Kleinschreibung egal).
+
+        Alle Werte der Spalte liegen (zwischengespeichert) als ein einziger
+        Text vor; die Suche läuft damit über str.find statt über eine
+        Python-Schleife pro Zeile.
+        """
+        suchwert = suchwert.lower()
+        if not suchwert or '\n' in suchwert:
+            return set()
+        text, anfaenge = self._suchtext(feld)
+        ids = self.ids
+        treffer = set()
+        position = text.find(suchwert)
+        while position != -1:
+            zeile = bisect_right(anfaenge, position) - 1
+            treffer.add(ids[zeile])
+            # Weitere Vorkommen in derselben Zeile überspringen
+            position = text.find(suchwert, anfaenge[zeile + 1])
+        return treffer
+
+    def ids_mit_stadt(self, stadt_ids: Set[int]) -> Set[int]:
+        """Gibt die IDs aller Personen zurück, deren stadt_id in `stadt_ids` liegt."""
+        return set(compress(self.ids, map(stadt_ids.__contains__, self.stadt_ids)))
+
+    # --- INTERNES ---
+    def _suchtext(self, feld: str) -> tuple:
+        if feld not in self._suchtexte:
+            werte = [wert.lower() for wert in self.spalte(feld)]
+            anfaenge = array('q', [0])
+            position = 0
+            for wert in werte:
+                position += len(wert) + 1
+                anfaenge.append(position)
+            self._suchtexte[feld] = ('\n'.join(werte), anfaenge)
+        return self._suchtexte[feld]
+
+    def _zeitstempel(self, p_id: int, datum: Optional[datetime]) -> int:
+        if datum is None:
+            return self.KEIN_DATUM
+        if datum.tzinfo is not None:
+            self._datum_mit_zone[p_id] = datum
+            return self.DATUM_MIT_ZONE
+        return (datum - self._EPOCHE) // self._MIKROSEKUNDE
+
+    def _datum(self, pos: int) -> Optional[datetime]:
+        stempel = self.zeitstempel[pos]
+        if stempel == self.KEIN_DATUM:
+            return None
+        if stempel == self.DATUM_MIT_ZONE:
+            return self._datum_mit_zone[self.ids[pos]]
+        return self._EPOCHE + timedelta(microseconds=stempel)
+
+
+def _spaltenwerte(personen, feld: str) -> Iterable[Any]:
+    """Werte eines Feldes für eine Personen-Liste oder SpaltenTabelle (dort ohne Modelle zu erzeugen)."""
+    if isinstance(personen, SpaltenTabelle):
+        return personen.spalte(feld)
+    return [getattr(p, feld) for p in personen]
+
+
+# ====================================================================
+# II. SPEICHER-BACKENDS (PERSISTENZ)
+# ====================================================================
+
+class SpeicherBackend:
+    """Basisklasse: Legt fest, wie eine einzelne Änderung persistiert wird.
+
+    MiniDatenbank ruft nach jeder Mutation `protokolliere` auf. Die Operationen
+    sind 'person' (Upsert mit vollständigem Datensatz), 'person_loeschen'
+    (nur die ID) und 'stadt' (Upsert mit vollständigem Datensatz).
+    """
+
+    def wiederherstellen(self, db: "MiniDatenbank"):
+        """Wird nach dem Laden des Snapshots aufgerufen (z.B. Log-Replay)."""
+        pass
+
+    def protokolliere(self, db: "MiniDatenbank", operation: str, nutzdaten: Dict[str, Any]):
+        raise NotImplementedError
+
+    def protokolliere_stapel(self, db: "MiniDatenbank", eintraege: List[tuple]):
+        """Persistiert alle Mutationen einer Transaktion auf einmal."""
+        for operation, nutzdaten in eintraege:
+            self.protokolliere(db, operation, nutzdaten)
+
+    def schliessen(self, db: "MiniDatenbank"):
+        pass
+
+
+class JsonSpeicher(SpeicherBackend):
+    """Bisheriges Verhalten: Jede Änderung schreibt beide JSON-Dateien komplett neu."""
+
+    def protokolliere(self, db, operation, nutzdaten):
+        db._speichern_alle()
+
+    def protokolliere_stapel(self, db, eintraege):
+        # Eine Transaktion kostet nur ein einziges Neuschreiben
+        if eintraege:
+            db._speichern_alle()
+
+
+class WalSpeicher(SpeicherBackend):
+    """Append-only Write-Ahead-Log: Eine JSON-Zeile pro Mutation.
+
+    Beim Start wird das Log auf den JSON-Snapshot angewendet. Ab
+    `kompaktieren_ab` Einträgen wird das Log rotiert und im Hintergrund ein
+    neuer Snapshot über den atomaren `_speichern`-Pfad geschrieben. Da alle
+    Log-Einträge vollständige Datensätze enthalten (Upsert/Delete), ist das
+    Replay idempotent und ein Absturz während der Kompaktierung unkritisch.
+
+    Die Mutationen einer Transaktion (bzw. eines gepuffert()-Blocks) stehen
+    zusammen in einer einzigen 'stapel'-Zeile. Eine beim Absturz
+    abgeschnittene Zeile wird beim Replay verworfen, eine Transaktion kommt
+    also ganz oder gar nicht zurück.
+    """
+
+    def __init__(self, log_dateiname: str, kompaktieren_ab: int = 10_000, fsync: bool = False):
+        self.log_dateiname = log_dateiname
+        self.rotiert_dateiname = log_dateiname + ".1"
+        self.kompaktieren_ab = kompaktieren_ab
+        self.fsync = fsync
+
+        self._log_datei = None
+        self._eintraege_seit_snapshot = 0
+        self._lock = threading.Lock()
+        self._kompaktierer: Optional[threading.Thread] = None
+
+    # --- REPLAY ---
+    def wiederherstellen(self, db):
+        personen_pos = {p_id: i for i, p_id in enumerate(_spaltenwerte(db.daten, 'id'))}
+        staedte_pos = {s.id: i for i, s in enumerate(db.staedte)}
+
+        for dateiname in (self.rotiert_dateiname, self.log_dateiname):
+            for eintrag in self._lies_log(dateiname):
+                self._wende_an(db, eintrag, personen_pos, staedte_pos)
+
+        self._log_datei = open(self.log_dateiname, 'a', encoding='utf-8')
+
+        # Übrig gebliebenes rotiertes Log (Absturz während der Kompaktierung) sofort einarbeiten
+        if os.path.exists(self.rotiert_dateiname):
+            self._starte_kompaktierung(db)
+
+    def _lies_log(self, dateiname: str):
+        """Liefert die Log-Einträge; eine abgeschnittene letzte Zeile wird aus der Datei entfernt.
+
+        Ohne das Abschneiden würde der nächste Eintrag im Append-Modus an das
+        Bruchstück angehängt und wäre (samt allem danach) beim Replay verloren.
+        """
+        if not os.path.exists(dateiname):
+            return
+        gueltig_bis = 0 # Byte-Offset hinter der letzten vollständigen Zeile
+        with open(dateiname, 'rb') as f:
+            for zeile in f:
+                try:
+                    # Jeder Eintrag wird samt "\n" in einem Schreibvorgang angehängt
+                    if not zeile.endswith(b"\n"):
+                        raise ValueError("Zeilenende fehlt")
+                    eintrag = json.loads(zeile) if zeile.strip() else None
+                except ValueError as e: # auch JSONDecodeError und UnicodeDecodeError
+                    if f.read(1):
+                        raise ValueError(f"Write-Ahead-Log '{dateiname}' ist ab Byte {gueltig_bis} beschädigt: {e}")
+                    break
+                gueltig_bis += len(zeile)
+                if eintrag is not None:
+                    yield eintrag
+            groesse = f.seek(0, os.SEEK_END)
+
+        if gueltig_bis < groesse:
+            # Abgeschnittene letzte Zeile nach einem Absturz: der Eintrag war nie bestätigt
+            print(f"FEHLER: Unvollständigen letzten Eintrag in '{dateiname}' verworfen "
+                  f"({groesse - gueltig_bis} Bytes ab Byte {gueltig_bis}).")
+            os.truncate(dateiname, gueltig_bis)
+
+    def _wende_an(self, db, eintrag, personen_pos, staedte_pos):
+        operation = eintrag.get('op')
+        if operation == 'stapel':
+            for teil in eintrag['eintraege']:
+                self._wende_an(db, teil, personen_pos, staedte_pos)
+        elif operation == 'person':
+            person = Person(**eintrag['daten'])
+            # Auch später gelöschte IDs dürfen nicht wiederverwendet werden
+            db._naechste_id = max(db._naechste_id, person.id + 1)
+            if person.id in personen_pos:
+                db.daten[personen_pos[person.id]] = person
+            else:
+                personen_pos[person.id] = len(db.daten)
+                db.daten.append(person)
+        elif operation == 'person_loeschen':
+            pos = personen_pos.pop(eintrag['id'], None)
+            if pos is not None:
+                # Wie MiniDatenbank.loeschen: letzte Zeile in die Lücke (gleiche Reihenfolge wie im Betrieb)
+                letzte_person = db.daten.pop()
+                if letzte_person.id != eintrag['id']:
+                    db.daten[pos] = letzte_person
+                    personen_pos[letzte_person.id] = pos
+        elif operation == 'stadt':
+            stadt = Stadt(**eintrag['daten'])
+            db._naechste_stadt_id = max(db._naechste_stadt_id, stadt.id + 1)
+            if stadt.id in staedte_pos:
+                db.staedte[staedte_pos[stadt.id]] = stadt
+            else:
+                staedte_pos[stadt.id] = len(db.staedte)
+                db.staedte.append(stadt)
+        else:
+            print(f"FEHLER: Unbekannte Log-Operation '{operation}' übersprungen.")
+
+    # --- SCHREIBEN ---
+    def protokolliere(self, db, operation, nutzdaten):
+        self.protokolliere_stapel(db, [(operation, nutzdaten)])
+
+    def protokolliere_stapel(self, db, eintraege):
+        if not eintraege:
+            return
+        log_eintraege = [{'op': operation, **nutzdaten} for operation, nutzdaten in eintraege]
+        if len(log_eintraege) > 1:
+            # Eine Zeile für den ganzen Stapel: ein Absturz mitten im Schreiben verwirft ihn komplett
+            log_eintraege = [{'op': 'stapel', 'eintraege': log_eintraege}]
+        zeile = json.dumps(log_eintraege[0], ensure_ascii=False) + "\n"
+        with self._lock:
+            self._log_datei.write(zeile)
+            self._log_datei.flush()
+            if self.fsync:
+                os.fsync(self._log_datei.fileno())
+            self._eintraege_seit_snapshot += len(eintraege)
+
+        if self._eintraege_seit_snapshot >= self.kompaktieren_ab:
+            self._starte_kompaktierung(db)
+
+    # --- KOMPAKTIERUNG ---
+    def kompaktieren(self, db, warten: bool = False):
+        """Startet eine Kompaktierung (optional blockierend)."""
+        self._starte_kompaktierung(db)
+        if warten and self._kompaktierer is not None:
+            self._kompaktierer.join()
+
+    def _starte_kompaktierung(self, db):
+        if self._kompaktierer is not None and self._kompaktierer.is_alive():
+            return
+
+        with self._lock:
+            if not os.path.exists(self.rotiert_dateiname):
+                self._log_datei.close()
+                os.replace(self.log_dateiname, self.rotiert_dateiname)
+                self._log_datei = open(self.log_dateiname, 'a', encoding='utf-8')
+            self._eintraege_seit_snapshot = 0
+            # Flache Kopien genügen: spätere Änderungen landen zusätzlich im neuen Log
+            personen = db.daten.copy()
+            staedte = list(db.staedte)
+            meta = db._meta_daten()
+
+        self._kompaktierer = threading.Thread(
+            target=self._schreibe_snapshot, args=(db, personen, staedte, meta), daemon=True
+        )
+        self._kompaktierer.start()
+
+    def _schreibe_snapshot(self, db, personen, staedte, meta):
+        geschrieben = (
+            db._speichern(staedte, db.stadt_dateiname)
+            and db.snapshot_format.schreibe_personen(db, personen)
+            and db._schreibe_atomar(meta, db.meta_dateiname)
+        )
+        if not geschrieben:
+            # Das rotierte Log ist dann die einzige Kopie dieser Änderungen: für das Replay behalten
+            print(f"FEHLER: Snapshot unvollständig, '{self.rotiert_dateiname}' bleibt erhalten.")
+            return
+        try:
+            os.remove(self.rotiert_dateiname)
+        except OSError as e:
+            print(f"FEHLER beim Entfernen von '{self.rotiert_dateiname}': {e}")
+
+    def schliessen(self, db):
+        if self._kompaktierer is not None:
+            self._kompaktierer.join()
+        with self._lock:
+            if self._log_datei is not None:
+                self._log_datei.close()
+                self._log_datei = None
+
+
+class SnapshotFormat:
+    """Legt fest, in welchem Format der Personen-Snapshot gelesen und geschrieben wird."""
+
+    def personen_dateiname(self, db: "MiniDatenbank") -> str:
+        return db.dateiname
+
+    def lade_personen(self, db: "MiniDatenbank") -> List[Person]:
+        return db._laden(db.dateiname, Person)
+
+    def schreibe_personen(self, db: "MiniDatenbank", personen: List[Person]) -> bool:
+        return db._speichern(personen, db.dateiname)
+
+
+class JsonSnapshot(SnapshotFormat):
+    """Bisheriges Format: JSON-Liste, beim Laden wird jeder Eintrag voll validiert."""
+    pass
+
+
+class BinaerSnapshot(SnapshotFormat):
+    """Kompakter spaltenorientierter Snapshot (<dateiname ohne Endung>.mdb).
+
+    Aufbau (little-endian): Kennung, Anzahl, dann die Spalten id und
+    stadt_id als int64-Arrays sowie name, email und erstellungsdatum (ISO)
+    als UTF-8-Block mit Zeichen-Offsets. Die Datei wird nur von uns aus
+    bereits validierten Personen geschrieben; beim Laden werden die Modelle
+    daher ohne erneute Validierung per `model_construct` erzeugt.
+
+    Fehlt die .mdb-Datei, wird (einmalig) der JSON-Snapshot gelesen.
+    """
+
+    KENNUNG = b'MDB1'
+
+    def personen_dateiname(self, db):
+        binaer = os.path.splitext(db.dateiname)[0] + '.mdb'
+        return binaer if os.path.exists(binaer) else db.dateiname
+
+    def lade_personen(self, db):
+        dateiname = self.personen_dateiname(db)
+        if dateiname == db.dateiname:
+            return db._laden(db.dateiname, Person)
+        with open(dateiname, 'rb') as f:
+            return self._dekodieren(f.read(), db.spaltenspeicher)
+
+    def schreibe_personen(self, db, personen):
+        return db._schreibe_atomar(self._kodieren(personen), os.path.splitext(db.dateiname)[0] + '.mdb')
+
+    # --- KODIERUNG ---
+    def _kodieren(self, personen: List[Person]) -> bytes:
+        teile = [self.KENNUNG, struct.pack('<I', len(personen))]
+        teile.append(self._int_spalte(_spaltenwerte(personen, 'id')))
+        teile.append(self._int_spalte(_spaltenwerte(personen, 'stadt_id')))
+        teile.append(self._text_spalte(_spaltenwerte(personen, 'name')))
+        teile.append(self._text_spalte(_spaltenwerte(personen, 'email')))
+        teile.append(self._text_spalte(datum.isoformat() if datum else '' for datum in _spaltenwerte(personen, 'erstellungsdatum')))
+        return b''.join(teile)
+
+    @staticmethod
+    def _int_spalte(werte) -> bytes:
+        spalte = array('q', werte)
+        if sys.byteorder != 'little':
+            spalte.byteswap()
+        return spalte.tobytes()
+
+    @staticmethod
+    def _text_spalte(werte) -> bytes:
+        werte = list(werte)
+        offsets = array('Q', [0])
+        position = 0
+        for wert in werte:
+            position += len(wert)
+            offsets.append(position)
+        block = ''.join(werte).encode('utf-8')
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        return struct.pack('<Q', len(block)) + offsets.tobytes() + block
+
+    def _dekodieren(self, inhalt: bytes, spalten: bool = False) -> List[Person]:
+        if inhalt[:4] != self.KENNUNG:
+            raise ValueError("Unbekanntes Snapshot-Format (Kennung fehlt).")
+        (anzahl,) = struct.unpack_from('<I', inhalt, 4)
+        position = 8
+        
+        ids, position = self._lies_int_spalte(inhalt, position, anzahl)
+        stadt_ids, position = self._lies_int_spalte(inhalt, position, anzahl)
+        namen, position = self._lies_text_spalte(inhalt, position, anzahl)
+        emails, position = self._lies_text_spalte(inhalt, position, anzahl)
+        daten, position = self._lies_text_spalte(inhalt, position, anzahl)
+        
+        von_iso = datetime.fromisoformat
+        if spalten:
+            # Spaltenorientierte Ablage: die Spalten direkt übernehmen, gar keine Modelle erzeugen
+            return SpaltenTabelle.aus_spalten(ids, stadt_ids, namen, emails,
+                                              [von_iso(datum) if datum else None for datum in daten])
+        
+        konstruieren = Person.model_construct
+        return [
+            konstruieren(id=p_id, name=name, email=email, stadt_id=stadt_id,
+                         erstellungsdatum=von_iso(datum) if datum else None)
+            for p_id, stadt_id, name, email, datum in zip(ids, stadt_ids, namen, emails, daten)
+        ]
+
+    @staticmethod
+    def _lies_int_spalte(inhalt: bytes, position: int, anzahl: int):
+        spalte = array('q')
+        spalte.frombytes(inhalt[position:position + 8 * anzahl])
+        if sys.byteorder != 'little':
+            spalte.byteswap()
+        return spalte.tolist(), position + 8 * anzahl
+
+    @staticmethod
+    def _lies_text_spalte(inhalt: bytes, position: int, anzahl: int):
+        (block_laenge,) = struct.unpack_from('<Q', inhalt, position)
+        position += 8
+        offsets = array('Q')
+        offsets.frombytes(inhalt[position:position + 8 * (anzahl + 1)])
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        position += 8 * (anzahl + 1)
+        text = inhalt[position:position + block_laenge].decode('utf-8')
+        grenzen = offsets.tolist()
+        return [text[a:b] for a, b in zip(grenzen, grenzen[1:])], position + block_laenge
+
+
+# ====================================================================
+# III. SUCH-INDIZES
+# ====================================================================
+
+class TrigrammIndex:
+    """Invertierter Trigramm-Index für Teilstring-Suchen.
+
+    Bildet jedes Trigramm auf die Menge der Schlüssel ab, deren Text es
+    enthält. Eine Suche schneidet die Mengen aller Trigramme des Suchworts
+    und prüft nur die verbleibenden Kandidaten exakt mit `in`.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = {}
+        self._texte: Dict[int, str] = {} # Schlüssel -> Text in Kleinbuchstaben
+
+    @staticmethod
+    def _trigramme(text: str) -> Set[str]:
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def setzen(self, schluessel: int, text: str):
+        """Fügt einen Text hinzu oder ersetzt den bisherigen Text des Schlüssels."""
+        text = str(text).lower()
+        if self._texte.get(schluessel) == text:
+            return
+        self.entfernen(schluessel)
+        self._texte[schluessel] = text
+        for trigramm in self._trigramme(text):
+            self._postings.setdefault(trigramm, set()).add(schluessel)
+
+    def entfernen(self, schluessel: int):
+        text = self._texte.pop(schluessel, None)
+        if text is None:
+            return
+        for trigramm in self._trigramme(text):
+            posting = self._postings.get(trigramm)
+            if posting is not None:
+                posting.discard(schluessel)
+                if not posting:
+                    del self._postings[trigramm]
+
+    def suche(self, suchwert: str, kandidaten: Optional[Set[int]] = None) -> Set[int]:
+        """Gibt alle Schlüssel zurück, deren Text `suchwert` enthält (optional nur aus `kandidaten`)."""
+        suchwert = suchwert.lower()
+
+        if len(suchwert) < 3:
+            # Zu kurz für Trigramme: nur die bereits eingegrenzten Texte prüfen
+            basis = kandidaten if kandidaten is not None else self._texte.keys()
+        else:
+            postings = []
+            for trigramm in self._trigramme(suchwert):
+                posting = self._postings.get(trigramm)
+                if not posting:
+                    return set()
+                postings.append(posting)
+            if kandidaten is not None:
+                postings.append(kandidaten)
+            postings.sort(key=len)
+            basis = postings[0].intersection(*postings[1:])
+
+        texte = self._texte
+        return {schluessel for schluessel in basis if suchwert in texte.get(schluessel, '')}
+
+
+_KEIN_DATUM_SCHLUESSEL = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _datum_sortierschluessel(datum: Optional[datetime]) -> datetime:
+    """Vergleichbarer Schlüssel für erstellungsdatum: naive Daten gelten als UTC, None kommt zuerst."""
+    if datum is None:
+        return _KEIN_DATUM_SCHLUESSEL
+    if datum.tzinfo is None:
+        return datum.replace(tzinfo=timezone.utc)
+    return datum
+
+
+class SortierIndex:
+    """Sortierte Liste von (Sortierschlüssel, ID)-Paaren, per bisect aktuell gehalten.
+
+    Eine sortierte Ausgabe ist damit ein linearer Durchlauf (bzw. eine Seite
+    davon) statt eines vollständigen sorted() mit Lambda-Schlüssel.
+    """
+
+    def __init__(self, feld: str, wert_funktion: Optional[Callable[[Any], Any]] = None):
+        self.feld = feld # Person-Attribut, aus dem der Schlüssel gebildet wird
+        self._wert_funktion = wert_funktion # Optional: Feldwert -> Sortierschlüssel
+        self._eintraege: List[tuple] = []
+        self._schluessel: Dict[int, Any] = {} # ID -> aktueller Sortierschlüssel
+
+    def __len__(self):
+        return len(self._eintraege)
+
+    def aufbauen(self, ids: Iterable[int], werte: Iterable[Any]):
+        """Baut den Index aus zwei parallelen Spalten auf (IDs und Werte von `feld`)."""
+        if self._wert_funktion is not None:
+            werte = map(self._wert_funktion, werte)
+        self._schluessel = dict(zip(ids, werte))
+        self._eintraege = sorted((schluessel, p_id) for p_id, schluessel in self._schluessel.items())
+
+    def setzen(self, person: Person):
+        """Fügt eine Person ein oder verschiebt sie, falls sich ihr Schlüssel geändert hat."""
+        schluessel = getattr(person, self.feld)
+        if self._wert_funktion is not None:
+            schluessel = self._wert_funktion(schluessel)
+        if person.id in self._schluessel:
+            if self._schluessel[person.id] == schluessel:
+                return
+            self.entfernen(person.id)
+        self._schluessel[person.id] = schluessel
+        insort(self._eintraege, (schluessel, person.id))
+
+    def entfernen(self, person_id: int):
+        if person_id not in self._schluessel:
+            return
+        schluessel = self._schluessel.pop(person_id)
+        del self._eintraege[bisect_left(self._eintraege, (schluessel, person_id))]
+
+    def ids(self, absteigend: bool = False) -> Iterable[int]:
+        eintraege = reversed(self._eintraege) if absteigend else self._eintraege
+        return (p_id for _, p_id in eintraege)
+
+    def seite(self, start: int, anzahl: Optional[int] = None, absteigend: bool = False) -> List[int]:
+        """Gibt die IDs an den Positionen [start, start + anzahl) zurück, ohne den Rest zu durchlaufen."""
+        gesamt = len(self._eintraege)
+        start = min(max(start, 0), gesamt)
+        ende = gesamt if anzahl is None else min(gesamt, start + anzahl)
+        if absteigend:
+            ausschnitt = self._eintraege[gesamt - ende:gesamt - start][::-1]
+        else:
+            ausschnitt = self._eintraege[start:ende]
+        return [p_id for _, p_id in ausschnitt]
+
+    def sortiere_ids(self, ids: Iterable[int], absteigend: bool = False) -> List[int]:
+        """Sortiert eine (kleine) Teilmenge über die gespeicherten Schlüssel."""
+        schluessel = self._schluessel
+        return sorted(ids, key=lambda p_id: (schluessel[p_id], p_id), reverse=absteigend)
+
+
 # ====================================================================
-# II. DIE DATENBANK KLASSE (LOGIK) - MIT MIGRATION
+# IV. DIE DATENBANK KLASSE (LOGIK) - MIT MIGRATION
 # ====================================================================
 
 class MiniDatenbank:
     
-    def __init__(self, dateiname: str, stadt_dateiname: str):
+    def __init__(self, dateiname: str, stadt_dateiname: str, speicher: Optional[SpeicherBackend] = None,
+                 snapshot_format: Optional[SnapshotFormat] = None, spaltenspeicher: bool = False):
         self.dateiname = dateiname
         self.stadt_dateiname = stadt_dateiname
+        self.meta_dateiname = dateiname + '.meta'
+        self.speicher = speicher if speicher is not None else JsonSpeicher()
+        self.snapshot_format = snapshot_format if snapshot_format is not None else JsonSnapshot()
+        # True: Personen spaltenweise in einer SpaltenTabelle halten (deutlich weniger Speicher)
+        self.spaltenspeicher = spaltenspeicher
         
         self.staedte: List[Stadt] = []
-        self.daten: List[Person] = []
+        self.daten: List[Person] = [] # bzw. SpaltenTabelle bei spaltenspeicher=True
         
         # Indizes (werden beim Laden/Speichern aktualisiert)
         self._email_index: Set[str] = set() 
         self._stadt_namen_map: Dict[str, int] = {}
         self._stadt_id_map: Dict[int, str] = {}
+        self._id_position: Dict[int, int] = {} # ID -> Position in self.daten (O(1)-Zugriff und -Löschen)
+        
+        # Such-Indizes für filter_by_criteria (werden erst bei der ersten Suche aufgebaut;
+        # bei spaltenspeicher=True nur für Städte, Personen werden direkt in den Spalten gesucht)
+        self._ngramm_indizes: Optional[Dict[str, TrigrammIndex]] = None
+        self._personen_nach_stadt: Dict[int, Set[int]] = {}
+        
+        # Sortier-Indizes pro Feld (werden bei der ersten Sortierung nach dem Feld aufgebaut)
+        self._sortier_indizes: Dict[str, SortierIndex] = {}
+        
+        # Monotone ID-Zähler (werden in der Meta-Datei mitgespeichert)
+        self._naechste_id = 1
+        self._naechste_stadt_id = 1
+        
+        # Transaktions- und Pufferzustand (siehe transaktion() und gepuffert())
+        self._transaktion_tiefe = 0
+        self._puffer_tiefe = 0
+        self._protokoll_puffer: List[tuple] = []
+        self._transaktion_sicherung: Optional[Dict[str, Any]] = None
         
         self._initialisiere_daten()
 
@@ -90,10 +796,12 @@ class MiniDatenbank:
         
         # 1. Versuche, die Daten im NEUEN Format zu laden
         self.staedte = self._laden(self.stadt_dateiname, Stadt)
-        self.daten = self._laden(self.dateiname, Person)
+        self.daten = self.snapshot_format.lade_personen(self)
+        self._lade_meta()
         
         # 2. Prüfe, ob eine Migration nötig ist (Datenbank ist leer, aber Datei existiert)
-        if not self.daten and os.path.exists(self.dateiname) and os.path.getsize(self.dateiname) > 0:
+        json_quelle = self.snapshot_format.personen_dateiname(self) == self.dateiname
+        if json_quelle and not self.daten and os.path.exists(self.dateiname) and os.path.getsize(self.dateiname) > 0:
             print("INFO: Alte Datenbankstruktur erkannt. Starte Migration...")
             try:
                 self._migrieren_daten()
@@ -101,7 +809,14 @@ class MiniDatenbank:
                 print(f"SCHWERWIEGENDER FEHLER bei der Migration: {e}")
                 messagebox.showerror("Migrationsfehler", "Konnte alte Datenbank nicht konvertieren. Die Daten wurden übersprungen.")
                 
-        # 3. Indizes basierend auf den geladenen/migrierten Daten neu aufbauen
+        # 3. Optional in die spaltenorientierte Ablage überführen
+        if self.spaltenspeicher and not isinstance(self.daten, SpaltenTabelle):
+            self.daten = SpaltenTabelle(self.daten)
+        
+        # 4. Änderungen seit dem letzten Snapshot einspielen (z.B. Write-Ahead-Log)
+        self.speicher.wiederherstellen(self)
+        
+        # 5. Indizes basierend auf den geladenen/migrierten Daten neu aufbauen
         self._baue_indizes_neu()
         print(f"INFO: {len(self.daten)} Personen und {len(self.staedte)} Städte geladen.")
 
@@ -112,24 +827,11 @@ class MiniDatenbank:
         alt_daten = self._laden(self.dateiname, _OldPerson)
         if not alt_daten:
             return
-            
-        neue_personen: List[Person] = []
         
-        for old_person in alt_daten:
-            # 1. Stadt-ID für den alten Stadtnamen ermitteln/erstellen
-            stadt_id = self.finde_oder_erstelle_stadt(old_person.stadt, migrieren=True) 
+        # Bereits vorhandene Städte kennen, damit Stadt-IDs nicht doppelt vergeben werden
+        self._baue_indizes_neu()
             
-            # 2. Neue Person-Objekt erstellen
-            neue_person = Person(
-                id=old_person.id,
-                name=old_person.name,
-                email=old_person.email,
-                stadt_id=stadt_id,
-                erstellungsdatum=old_person.erstellungsdatum
-            )
-            neue_personen.append(neue_person)
-
-        self.daten = neue_personen
+        self.daten = _konvertiere_alte_personen(alt_daten, self.finde_oder_erstelle_stadt)
         
         # Speichere die migrierten Daten sofort, um das alte Format zu ersetzen
         self._speichern_alle()
@@ -138,13 +840,94 @@ class MiniDatenbank:
 
     def _baue_indizes_neu(self):
         """Baut alle Indizes basierend auf self.daten und self.staedte neu auf."""
-        self._email_index = {p.email.lower() for p in self.daten}
+        self._email_index = {email.lower() for email in _spaltenwerte(self.daten, 'email')}
+        self._id_position = {p_id: i for i, p_id in enumerate(_spaltenwerte(self.daten, 'id'))}
         self._stadt_namen_map = {s.name.lower(): s.id for s in self.staedte if s.id is not None}
         self._stadt_id_map = {s.id: s.name for s in self.staedte if s.id is not None}
+        self._ngramm_indizes = None
+        self._sortier_indizes = {}
+        
+        # Zähler dürfen nie hinter die vorhandenen IDs zurückfallen (z.B. nach Migration)
+        if self._id_position:
+            self._naechste_id = max(self._naechste_id, max(self._id_position) + 1)
+        if self._stadt_id_map:
+            self._naechste_stadt_id = max(self._naechste_stadt_id, max(self._stadt_id_map) + 1)
+
+    def _such_indizes(self) -> Dict[str, TrigrammIndex]:
+        """Gibt die Trigramm-Indizes zurück und baut sie beim ersten Aufruf auf."""
+        if self._ngramm_indizes is None:
+            self._ngramm_indizes = {'stadt': TrigrammIndex()}
+            for stadt_id, stadt_name in self._stadt_id_map.items():
+                self._ngramm_indizes['stadt'].setzen(stadt_id, stadt_name)
+            self._personen_nach_stadt = {}
+            if not self.spaltenspeicher:
+                self._ngramm_indizes['name'] = TrigrammIndex()
+                self._ngramm_indizes['email'] = TrigrammIndex()
+                for person in self.daten:
+                    self._such_index_setzen(person)
+        return self._ngramm_indizes
+
+    def _sortier_index(self, feld: str) -> SortierIndex:
+        """Gibt den Sortier-Index für ein Feld zurück und baut ihn beim ersten Aufruf auf."""
+        if feld not in SORTIER_FELDER:
+            raise ValueError(f"Sortierfeld '{feld}' ist ungültig.")
+        index = self._sortier_indizes.get(feld)
+        if index is None:
+            if feld == 'stadt':
+                index = SortierIndex('stadt_id', lambda stadt_id: self.get_stadtname(stadt_id).lower())
+            elif feld == 'erstellungsdatum':
+                index = SortierIndex(feld, _datum_sortierschluessel)
+            else:
+                index = SortierIndex(feld)
+            index.aufbauen(_spaltenwerte(self.daten, 'id'), _spaltenwerte(self.daten, index.feld))
+            self._sortier_indizes[feld] = index
+        return index
+
+    def _sekundaerindizes_setzen(self, person: Person, alte_stadt_id: Optional[int] = None):
+        """Trägt eine neue oder geänderte Person in die Such- und Sortier-Indizes ein."""
+        for index in self._sortier_indizes.values():
+            index.setzen(person)
+        self._such_index_setzen(person, alte_stadt_id)
+
+    def _sekundaerindizes_entfernen(self, person: Person):
+        """Entfernt eine gelöschte Person aus den Such- und Sortier-Indizes."""
+        for index in self._sortier_indizes.values():
+            index.entfernen(person.id)
+        self._such_index_entfernen(person)
+
+    def _such_index_setzen(self, person: Person, alte_stadt_id: Optional[int] = None):
+        if self._ngramm_indizes is None or self.spaltenspeicher:
+            return
+        self._ngramm_indizes['name'].setzen(person.id, person.name)
+        self._ngramm_indizes['email'].setzen(person.id, person.email)
+        if alte_stadt_id is not None and alte_stadt_id != person.stadt_id:
+            self._personen_nach_stadt.get(alte_stadt_id, set()).discard(person.id)
+        self._personen_nach_stadt.setdefault(person.stadt_id, set()).add(person.id)
+
+    def _such_index_entfernen(self, person: Person):
+        if self._ngramm_indizes is None or self.spaltenspeicher:
+            return
+        self._ngramm_indizes['name'].entfernen(person.id)
+        self._ngramm_indizes['email'].entfernen(person.id)
+        self._personen_nach_stadt.get(person.stadt_id, set()).discard(person.id)
+
+    def _lade_meta(self):
+        """Lädt die persistierten ID-Zähler (fehlt die Datei, gelten die Startwerte)."""
+        try:
+            with open(self.meta_dateiname, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            self._naechste_id = int(meta.get('naechste_id', 1))
+            self._naechste_stadt_id = int(meta.get('naechste_stadt_id', 1))
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def _meta_daten(self) -> Dict[str, int]:
+        return {'naechste_id': self._naechste_id, 'naechste_stadt_id': self._naechste_stadt_id}
 
 
     # --- PRIVATE METHODEN (Laden/Speichern) ---
-    def _laden(self, dateiname: str, model: type[BaseModel]) -> List[BaseModel]:
+    @staticmethod
+    def _laden(dateiname: str, model: type[BaseModel]) -> List[BaseModel]:
         """Generische Lademethode."""
         try:
             if not os.path.exists(dateiname) or os.path.getsize(dateiname) == 0:
@@ -160,25 +943,116 @@ class MiniDatenbank:
             raise # Wenn das OldPerson-Modell fehlschlägt, ist die Datei kaputt
 
 
-    def _speichern(self, daten_objekte: List[BaseModel], dateiname: str):
+    def _speichern(self, daten_objekte: List[BaseModel], dateiname: str) -> bool:
         """Generische atomare Speichermethode."""
+        return self._schreibe_atomar([obj.model_dump(mode='json') for obj in daten_objekte], dateiname)
+
+    def _schreibe_atomar(self, daten_zum_speichern: Any, dateiname: str) -> bool:
+        """Schreibt JSON (oder fertige Bytes) über eine .tmp-Datei und os.replace (nie halb geschrieben).
+
+        Gibt zurück, ob die Datei ersetzt wurde; Fehler werden nur ausgegeben.
+        """
         temp_dateiname = dateiname + ".tmp"
         try:
-            daten_zum_speichern = [obj.model_dump(mode='json') for obj in daten_objekte]
-            
-            with open(temp_dateiname, 'w', encoding='utf-8') as f:
-                json.dump(daten_zum_speichern, f, indent=4)
+            if isinstance(daten_zum_speichern, bytes):
+                with open(temp_dateiname, 'wb') as f:
+                    f.write(daten_zum_speichern)
+            else:
+                with open(temp_dateiname, 'w', encoding='utf-8') as f:
+                    json.dump(daten_zum_speichern, f, indent=4)
             
             os.replace(temp_dateiname, dateiname)
+            return True
         except Exception as e:
             print(f"FEHLER beim atomaren Speichern von '{dateiname}': {e}")
             if os.path.exists(temp_dateiname):
                  os.remove(temp_dateiname)
+            return False
 
     def _speichern_alle(self):
-        """Speichert beide Listen (Personen und Städte)."""
-        self._speichern(self.daten, self.dateiname)
+        """Speichert beide Listen (Personen und Städte) als vollständigen Snapshot."""
+        self.snapshot_format.schreibe_personen(self, self.daten)
         self._speichern(self.staedte, self.stadt_dateiname)
+        self._schreibe_atomar(self._meta_daten(), self.meta_dateiname)
+
+    def _protokolliere(self, operation: str, **nutzdaten):
+        """Reicht eine einzelne Mutation an das Speicher-Backend weiter."""
+        if self._puffer_tiefe:
+            self._protokoll_puffer.append((operation, nutzdaten))
+        else:
+            self.speicher.protokolliere(self, operation, nutzdaten)
+
+    # --- TRANSAKTIONEN ---
+    @contextmanager
+    def gepuffert(self):
+        """Sammelt die Persistenz mehrerer Mutationen und schreibt sie am Ende in einem Schritt.
+
+        Anders als bei transaktion() gibt es kein Rollback: Jede Operation
+        gilt für sich, nur das Schreiben auf die Platte wird zusammengefasst.
+        """
+        self._puffer_tiefe += 1
+        try:
+            yield self
+        finally:
+            self._puffer_tiefe -= 1
+            if self._puffer_tiefe == 0:
+                puffer = self._protokoll_puffer
+                self._protokoll_puffer = []
+                self.speicher.protokolliere_stapel(self, puffer)
+
+    @contextmanager
+    def transaktion(self):
+        """Bündelt Mutationen: ein einziger Commit am Ende, Rollback bei Fehlern.
+
+        Verschachtelte Aufrufe laufen in der äußersten Transaktion mit.
+        """
+        if self._transaktion_tiefe == 0:
+            self._transaktion_sicherung = {
+                'daten': self.daten.copy(),
+                'staedte': list(self.staedte),
+                'naechste_id': self._naechste_id,
+                'naechste_stadt_id': self._naechste_stadt_id,
+                'puffer_laenge': len(self._protokoll_puffer),
+                'geaenderte_personen': {}, # id(Person) -> (Person, Felder vor der Änderung)
+            }
+        with self.gepuffert():
+            self._transaktion_tiefe += 1
+            try:
+                yield self
+            except BaseException:
+                self._transaktion_tiefe -= 1
+                if self._transaktion_tiefe == 0:
+                    self._transaktion_zuruecksetzen()
+                raise
+            else:
+                self._transaktion_tiefe -= 1
+                if self._transaktion_tiefe == 0:
+                    self._transaktion_sicherung = None
+
+    def _merke_vor_aenderung(self, person: Person):
+        """Sichert die Felder einer Person, bevor sie in einer Transaktion verändert wird."""
+        if self._transaktion_tiefe:
+            self._transaktion_sicherung['geaenderte_personen'].setdefault(
+                id(person), (person, person.model_dump())
+            )
+
+    def _transaktion_zuruecksetzen(self):
+        sicherung = self._transaktion_sicherung
+        for person, felder in sicherung['geaenderte_personen'].values():
+            for feld, wert in felder.items():
+                setattr(person, feld, wert)
+        self.daten = sicherung['daten']
+        self.staedte = sicherung['staedte']
+        self._naechste_id = sicherung['naechste_id']
+        self._naechste_stadt_id = sicherung['naechste_stadt_id']
+        # Nur die Einträge dieser Transaktion verwerfen (ein äußeres gepuffert() bleibt erhalten)
+        del self._protokoll_puffer[sicherung['puffer_laenge']:]
+        self._transaktion_sicherung = None
+        self._baue_indizes_neu()
+
+    def schliessen(self):
+        """Wartet auf laufende Hintergrund-Schreibvorgänge und schließt das Backend."""
+        self.speicher.schliessen(self)
 
     # --- STADT-HELPER ---
     def finde_oder_erstelle_stadt(self, stadt_name: str, migrieren: bool = False) -> int:
@@ -191,16 +1065,19 @@ class MiniDatenbank:
             return self._stadt_namen_map[stadt_name_lower]
 
         # Neu erstellen
-        neue_id = max(s.id for s in self.staedte if s.id is not None) + 1 if self.staedte else 1
+        neue_id = self._naechste_stadt_id
+        self._naechste_stadt_id += 1
         neue_stadt = Stadt(id=neue_id, name=stadt_name.strip())
         
         self.staedte.append(neue_stadt)
         self._stadt_namen_map[stadt_name_lower] = neue_id
         self._stadt_id_map[neue_id] = neue_stadt.name
+        if self._ngramm_indizes is not None:
+            self._ngramm_indizes['stadt'].setzen(neue_id, neue_stadt.name)
         
         # Speichern nur, wenn wir nicht gerade migrieren (Migration speichert alles am Ende)
         if not migrieren:
-            self._speichern_alle() 
+            self._protokolliere('stadt', daten=neue_stadt.model_dump(mode='json'))
             
         return neue_id
         
@@ -210,11 +1087,17 @@ class MiniDatenbank:
 
     # --- CRUD METHODEN ---
     
+    def anzahl(self) -> int:
+        """Anzahl aller Personen."""
+        return len(self.daten)
+
     def finde_nach_id(self, id_gesucht: int) -> Optional[Person]:
-        for person in self.daten:
-            if person.id == id_gesucht:
-                return person
-        return None
+        position = self._id_position.get(id_gesucht)
+        return None if position is None else self.daten[position]
+
+    def _personen_zu_ids(self, ids: Iterable[int]) -> List[Person]:
+        daten, position = self.daten, self._id_position
+        return [daten[position[p_id]] for p_id in ids]
 
     def hinzufuegen(self, neuer_eintrag: Dict[str, Any]):
         """Fügt einen Eintrag hinzu. Erwartet Name, Email und den Stadt-Namen."""
@@ -235,17 +1118,89 @@ class MiniDatenbank:
         except ValidationError as e:
             raise ValueError(f"Validierungsfehler beim Hinzufügen: {e}")
 
+        self._fuege_person_ein(person_objekt_mit_id)
+
+    def _fuege_person_ein(self, person_objekt_mit_id: Person) -> int:
+        """Vergibt die ID, pflegt alle Indizes und protokolliert den neuen Eintrag."""
         email_neu = person_objekt_mit_id.email.lower()
         if email_neu in self._email_index:
             raise ValueError(f"E-Mail-Adresse '{person_objekt_mit_id.email}' existiert bereits. Eintrag nicht hinzugefügt.")
             
-        neue_id = max(p.id for p in self.daten if p.id is not None) + 1 if self.daten else 1
+        neue_id = self._naechste_id
+        self._naechste_id += 1
         person_objekt_mit_id.id = neue_id
         
+        self._id_position[neue_id] = len(self.daten)
         self.daten.append(person_objekt_mit_id)
         self._email_index.add(email_neu)
+        self._sekundaerindizes_setzen(person_objekt_mit_id)
         
-        self._speichern_alle()
+        self._protokolliere('person', daten=person_objekt_mit_id.model_dump(mode='json'))
+        return neue_id
+
+    # --- MASSENIMPORT ---
+    def bulk_hinzufuegen(self, eintraege: Iterable[Dict[str, Any]], stapel_groesse: int = 1000) -> List[int]:
+        """Fügt viele Einträge in einer Transaktion hinzu und gibt die neuen IDs zurück.
+
+        Jede Zeile braucht Name, Email und Stadt-Namen (wie bei `hinzufuegen`).
+        Schlägt eine Zeile fehl, wird der gesamte Import zurückgerollt.
+        """
+        neue_ids: List[int] = []
+        stadt_cache: Dict[str, int] = {}
+        stapel: List[Dict[str, Any]] = []
+        zeilen_nr = 0
+
+        with self.transaktion():
+            for eintrag in eintraege:
+                stapel.append(eintrag)
+                if len(stapel) >= stapel_groesse:
+                    neue_ids.extend(self._fuege_stapel_hinzu(stapel, zeilen_nr, stadt_cache))
+                    zeilen_nr += len(stapel)
+                    stapel = []
+            if stapel:
+                neue_ids.extend(self._fuege_stapel_hinzu(stapel, zeilen_nr, stadt_cache))
+
+        return neue_ids
+
+    def _fuege_stapel_hinzu(self, stapel: List[Dict[str, Any]], erste_zeile: int, stadt_cache: Dict[str, int]) -> List[int]:
+        # 1. Städte auflösen (einmal pro eindeutigem Namen) und den ganzen Stapel validieren
+        jetzt = datetime.now().replace(microsecond=0)
+        personen: List[Person] = []
+        for offset, eintrag in enumerate(stapel):
+            zeile = erste_zeile + offset + 1
+            daten = dict(eintrag)
+            stadt_name = str(daten.pop('stadt', '') or '')
+            schluessel = stadt_name.lower().strip()
+            if not schluessel:
+                raise ValueError(f"Zeile {zeile}: Stadtname fehlt.")
+            if schluessel not in stadt_cache:
+                stadt_cache[schluessel] = self.finde_oder_erstelle_stadt(stadt_name)
+            daten['stadt_id'] = stadt_cache[schluessel]
+            if not daten.get('erstellungsdatum'):
+                daten['erstellungsdatum'] = jetzt
+
+            try:
+                personen.append(Person(**PersonCreate(**daten).model_dump()))
+            except ValidationError as e:
+                raise ValueError(f"Zeile {zeile}: Validierungsfehler beim Hinzufügen: {e}")
+
+        # 2. Einfügen (Dubletten werden auch innerhalb des Stapels über den E-Mail-Index erkannt)
+        neue_ids = []
+        for offset, person in enumerate(personen):
+            try:
+                neue_ids.append(self._fuege_person_ein(person))
+            except ValueError as e:
+                raise ValueError(f"Zeile {erste_zeile + offset + 1}: {e}")
+        return neue_ids
+
+    def importiere_datei(self, dateiname: str) -> List[int]:
+        """Importiert eine CSV- (mit Kopfzeile name,email,stadt) oder JSONL-Datei."""
+        with open(dateiname, 'r', encoding='utf-8', newline='') as f:
+            if dateiname.lower().endswith(('.jsonl', '.ndjson')):
+                zeilen = (json.loads(zeile) for zeile in f if zeile.strip())
+            else:
+                zeilen = csv.DictReader(f)
+            return self.bulk_hinzufuegen(zeilen)
 
     def aendern(self, id_zum_aendern: int, neue_daten: Dict[str, str]):
         """Ändert existierende Daten eines Eintrags (Update). Erwartet Stadt-Namen."""
@@ -264,6 +1219,8 @@ class MiniDatenbank:
         except ValidationError as e:
             raise ValueError(f"Validierungsfehler: {e.errors()}")
         
+        self._merke_vor_aenderung(person_zu_aendern)
+        alte_stadt_id = person_zu_aendern.stadt_id
         aktualisiert = False
         
         if update_data.email is not None and update_data.email != person_zu_aendern.email:
@@ -285,62 +1242,73 @@ class MiniDatenbank:
             aktualisiert = True
 
         if aktualisiert:
-            self._speichern_alle()
+            # Bei der SpaltenTabelle ist die Person nur eine Kopie: Änderungen zurückschreiben
+            self.daten[self._id_position[id_zum_aendern]] = person_zu_aendern
+            self._sekundaerindizes_setzen(person_zu_aendern, alte_stadt_id)
+            self._protokolliere('person', daten=person_zu_aendern.model_dump(mode='json'))
 
     def loeschen(self, id_zum_loeschen: int):
-        vorherige_laenge = len(self.daten)
-        
         person_zum_loeschen = self.finde_nach_id(id_zum_loeschen)
-        
-        self.daten = [
-            person for person in self.daten
-            if person.id != id_zum_loeschen
-        ]
-
-        geaendert = (vorherige_laenge > len(self.daten))
 
-        if geaendert:
-            if person_zum_loeschen:
-                self._email_index.discard(person_zum_loeschen.email.lower())
+        if person_zum_loeschen is not None:
+            # O(1): Letztes Element in die Lücke verschieben statt die Liste neu aufzubauen
+            position = self._id_position.pop(id_zum_loeschen)
+            letzte_person = self.daten.pop()
+            if letzte_person.id != id_zum_loeschen:
+                self.daten[position] = letzte_person
+                self._id_position[letzte_person.id] = position
             
-            self._speichern_alle()
+            self._email_index.discard(person_zum_loeschen.email.lower())
+            self._sekundaerindizes_entfernen(person_zum_loeschen)
+            
+            self._protokolliere('person_loeschen', id=id_zum_loeschen)
         else:
             raise LookupError(f"Eintrag mit ID {id_zum_loeschen} wurde nicht gefunden.")
             
-    # --- SUCH- UND SORTIER-METHODEN (unverändert) ---
+    # --- SUCH- UND SORTIER-METHODEN ---
     
     def filter_by_criteria(self, kriterien: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Filtert Daten. Gibt Dicts zurück, um den Stadt-Namen hinzuzufügen."""
+        """Filtert Daten. Gibt Dicts zurück, um den Stadt-Namen hinzuzufügen.
         
-        ergebnisse = self.daten
+        Teilstring-Kriterien werden über die Trigramm-Indizes auf Kandidaten-IDs
+        eingegrenzt; nur diese Kandidaten werden exakt geprüft. Mit
+        spaltenspeicher=True wird stattdessen direkt in den Spalten gesucht.
+        """
+        
+        indizes = self._such_indizes()
+        kandidaten: Optional[Set[int]] = None # None = noch nicht eingeschränkt (alle Personen)
         
         for key, value in kriterien.items():
             if not value: continue
             
             if key in ['name', 'email']:
-                suchwert = str(value).lower()
-                ergebnisse = [
-                    person for person in ergebnisse 
-                    if suchwert in str(getattr(person, key, '')).lower()
-                ]
+                if self.spaltenspeicher:
+                    treffer = self.daten.suche(key, str(value))
+                    kandidaten = treffer if kandidaten is None else kandidaten & treffer
+                else:
+                    kandidaten = indizes[key].suche(str(value), kandidaten)
             
             elif key == 'id':
                  try:
                      suchwert = int(value)
-                     ergebnisse = [person for person in ergebnisse if person.id == suchwert]
                  except ValueError:
-                     pass 
+                     continue
+                 treffer = {suchwert} if suchwert in self._id_position else set()
+                 kandidaten = treffer if kandidaten is None else kandidaten & treffer
             
-        if 'stadt' in kriterien and kriterien['stadt']:
-            suchwert_stadt = kriterien['stadt'].lower()
-            gefilterte_stadt_ids = {
-                id for name, id in self._stadt_namen_map.items() 
-                if suchwert_stadt in name
-            }
-            ergebnisse = [
-                person for person in ergebnisse 
-                if person.stadt_id in gefilterte_stadt_ids
-            ]
+            elif key == 'stadt':
+                gefilterte_stadt_ids = indizes['stadt'].suche(str(value))
+                if self.spaltenspeicher:
+                    treffer = self.daten.ids_mit_stadt(gefilterte_stadt_ids)
+                else:
+                    treffer = set().union(*(self._personen_nach_stadt.get(s_id, ()) for s_id in gefilterte_stadt_ids))
+                kandidaten = treffer if kandidaten is None else kandidaten & treffer
+            
+        if kandidaten is None:
+            ergebnisse = self.daten
+        else:
+            # Reihenfolge wie in self.daten beibehalten
+            ergebnisse = self._personen_zu_ids(sorted(kandidaten, key=self._id_position.__getitem__))
 
         output = []
         for person in ergebnisse:
@@ -350,8 +1318,29 @@ class MiniDatenbank:
         
         return output
 
+    def sortiert(self, feld: str, absteigend: bool = False, ids: Optional[Set[int]] = None,
+                 start: int = 0, anzahl: Optional[int] = None) -> List[Person]:
+        """Gibt Personen sortiert über den Sortier-Index zurück.
+
+        `ids` schränkt auf eine Teilmenge ein (z.B. Suchergebnisse), `start`
+        und `anzahl` liefern nur eine Seite der sortierten Folge.
+        """
+        index = self._sortier_index(feld)
+        
+        if ids is None:
+            # Direkter Zugriff auf die Seite: O(anzahl) statt O(start + anzahl)
+            return self._personen_zu_ids(index.seite(start, anzahl, absteigend))
+        elif len(ids) * 16 < len(index):
+            # Kleine Teilmenge: direkt sortieren ist billiger als den ganzen Index zu durchlaufen
+            reihenfolge = index.sortiere_ids(ids, absteigend)
+        else:
+            reihenfolge = (p_id for p_id in index.ids(absteigend) if p_id in ids)
+        
+        ende = None if anzahl is None else start + anzahl
+        return self._personen_zu_ids(islice(reihenfolge, start, ende))
+
     def sortieren(self, daten_liste: List[Any], feld: str, absteigend: bool = False) -> List[Any]:
-        if feld not in ['id', 'name', 'email', 'stadt', 'erstellungsdatum', 'stadt_id']:
+        if feld not in SORTIER_FELDER:
             raise ValueError(f"Sortierfeld '{feld}' ist ungültig.")
         
         if feld == 'stadt':
@@ -369,7 +1358,522 @@ class MiniDatenbank:
 
 
 # ====================================================================
-# III. HAUPTPROGRAMM (BENUTZER-INTERFACE) - TKINTER GUI MIT TREEVIEW
+# V. SQLITE-DATENBANK (GLEICHE SCHNITTSTELLE WIE MiniDatenbank)
+# ====================================================================
+
+class SQLiteDatenbank:
+    """MiniDatenbank auf einer eingebetteten SQLite-Datei.
+
+    Bietet dieselbe öffentliche Schnittstelle wie MiniDatenbank, hält die
+    Daten aber nicht im Speicher, sondern in den normalisierten Tabellen
+    `personen` und `staedte`. Die Datei läuft im WAL-Modus, damit mehrere
+    Prozesse gleichzeitig lesen können, während einer schreibt. Die
+    E-Mail-Eindeutigkeit sichert ein UNIQUE-Index auf der Spalte email_klein
+    (Python-lower(), wie MiniDatenbank; SQLites lower() kennt nur ASCII), die GUI
+    blättert per LIMIT/OFFSET. Alle SQL-Texte sind Konstanten und werden vom
+    Statement-Cache von sqlite3 als vorbereitete Anweisungen wiederverwendet.
+
+    Die Verbindung darf von mehreren Threads benutzt werden (DBAusfuehrer);
+    gleichzeitige Zugriffe müssen wie bei MiniDatenbank über dessen Lock laufen.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS staedte (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            name_klein TEXT NOT NULL -- Python-lower(), für Suche, Sortierung und Eindeutigkeit
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS staedte_name_klein ON staedte(name_klein);
+
+        CREATE TABLE IF NOT EXISTS personen (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL,
+            email_klein TEXT NOT NULL, -- Python-lower(), für die Eindeutigkeit
+            stadt_id INTEGER NOT NULL REFERENCES staedte(id),
+            erstellungsdatum TEXT -- ISO-Format, sortiert damit chronologisch
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS personen_email_klein ON personen(email_klein);
+        CREATE INDEX IF NOT EXISTS personen_name ON personen(name);
+        CREATE INDEX IF NOT EXISTS personen_email ON personen(email);
+        CREATE INDEX IF NOT EXISTS personen_stadt_id ON personen(stadt_id);
+        CREATE INDEX IF NOT EXISTS personen_erstellungsdatum ON personen(erstellungsdatum);
+
+        CREATE TABLE IF NOT EXISTS meta (
+            schluessel TEXT PRIMARY KEY,
+            wert TEXT NOT NULL
+        );
+    """
+
+    PERSON_SPALTEN = "p.id, p.name, p.email, p.stadt_id, p.erstellungsdatum"
+    SQL_PERSON_NACH_ID = f"SELECT {PERSON_SPALTEN} FROM personen p WHERE p.id = ?"
+    SQL_PERSON_EINFUEGEN = ("INSERT INTO personen (id, name, email, email_klein, stadt_id, erstellungsdatum) "
+                            "VALUES (?, ?, ?, ?, ?, ?)")
+    SQL_PERSON_AENDERN = "UPDATE personen SET name = ?, email = ?, email_klein = ?, stadt_id = ? WHERE id = ?"
+    SQL_PERSON_LOESCHEN = "DELETE FROM personen WHERE id = ?"
+    SQL_ANZAHL = "SELECT COUNT(*) FROM personen"
+    SQL_STADT_NACH_NAME = "SELECT id FROM staedte WHERE name_klein = ?"
+    SQL_STADT_NACH_ID = "SELECT name FROM staedte WHERE id = ?"
+    SQL_STADT_EINFUEGEN = "INSERT INTO staedte (id, name, name_klein) VALUES (?, ?, ?)"
+    SQL_META_LESEN = "SELECT wert FROM meta WHERE schluessel = ?"
+    SQL_META_SCHREIBEN = "INSERT OR REPLACE INTO meta (schluessel, wert) VALUES (?, ?)"
+
+    # Sortierfeld -> ORDER BY-Ausdruck (bei gleichem Schlüssel entscheidet wie im SortierIndex die ID)
+    SORTIER_AUSDRUECKE = {
+        'id': "p.id",
+        'name': "p.name",
+        'email': "p.email",
+        'stadt': "s.name_klein",
+        'erstellungsdatum': "p.erstellungsdatum",
+        'stadt_id': "p.stadt_id",
+    }
+
+    def __init__(self, dateiname: str, timeout: float = 5.0):
+        self.dateiname = dateiname
+        # isolation_level=None: Transaktionen steuern wir selbst (transaktion()/gepuffert())
+        self._verbindung = sqlite3.connect(dateiname, timeout=timeout, isolation_level=None,
+                                           check_same_thread=False, cached_statements=256)
+        self._verbindung.execute("PRAGMA journal_mode=WAL")
+        self._verbindung.execute("PRAGMA synchronous=NORMAL")
+        self._verbindung.execute("PRAGMA foreign_keys=ON")
+        # Groß-/Kleinschreibung wie in Python (SQLites lower() kennt nur ASCII)
+        self._verbindung.create_function("py_lower", 1, str.lower, deterministic=True)
+
+        self._savepoint_zaehler = 0
+        self._stadt_id_map: Dict[int, str] = {} # Cache für get_stadtname (wird bei jedem Rollback geleert)
+        self._email_klein_nachruesten()
+        self._verbindung.executescript(self.SCHEMA)
+        print(f"INFO: {self.anzahl()} Personen in '{dateiname}' (SQLite).")
+
+    def _email_klein_nachruesten(self):
+        """Ältere Dateien hatten einen Index auf SQLites lower(email): Spalte email_klein ergänzen und füllen."""
+        spalten = [zeile[1] for zeile in self._verbindung.execute("PRAGMA table_info(personen)")]
+        if not spalten or 'email_klein' in spalten:
+            return
+        with self.transaktion():
+            self._verbindung.execute("DROP INDEX IF EXISTS personen_email_lower")
+            self._verbindung.execute("ALTER TABLE personen ADD COLUMN email_klein TEXT NOT NULL DEFAULT ''")
+            self._verbindung.execute("UPDATE personen SET email_klein = py_lower(email)")
+            try:
+                self._verbindung.execute("CREATE UNIQUE INDEX personen_email_klein ON personen(email_klein)")
+            except sqlite3.IntegrityError:
+                raise ValueError(f"'{self.dateiname}' enthält E-Mail-Adressen, die sich nur in der "
+                                 f"Groß-/Kleinschreibung unterscheiden; bitte vorher bereinigen.")
+
+    # --- TRANSAKTIONEN ---
+    @contextmanager
+    def transaktion(self):
+        """Bündelt Mutationen: ein einziger Commit am Ende, Rollback bei Fehlern.
+
+        Innerhalb einer laufenden Transaktion (oder gepuffert()) wird ein
+        SAVEPOINT gesetzt, ein Fehler verwirft dann nur diesen Teil.
+        """
+        if not self._verbindung.in_transaction:
+            self._verbindung.execute("BEGIN IMMEDIATE")
+            try:
+                yield self
+            except BaseException:
+                self._verbindung.execute("ROLLBACK")
+                self._stadt_id_map.clear()
+                raise
+            else:
+                self._verbindung.execute("COMMIT")
+            return
+
+        self._savepoint_zaehler += 1
+        name = f"sp{self._savepoint_zaehler}"
+        self._verbindung.execute(f"SAVEPOINT {name}")
+        try:
+            yield self
+        except BaseException:
+            self._verbindung.execute(f"ROLLBACK TO {name}")
+            self._verbindung.execute(f"RELEASE {name}")
+            self._stadt_id_map.clear()
+            raise
+        else:
+            self._verbindung.execute(f"RELEASE {name}")
+
+    @contextmanager
+    def gepuffert(self):
+        """Führt mehrere Mutationen in einer SQLite-Transaktion aus (ein Commit statt vieler).
+
+        Wie bei MiniDatenbank gibt es kein Rollback: Jede Operation läuft in
+        ihrem eigenen SAVEPOINT und bleibt erhalten, auch wenn eine andere fehlschlägt.
+        """
+        if self._verbindung.in_transaction:
+            yield self
+            return
+        self._verbindung.execute("BEGIN IMMEDIATE")
+        try:
+            yield self
+        finally:
+            self._verbindung.execute("COMMIT")
+
+    def schliessen(self):
+        self._verbindung.execute("PRAGMA optimize")
+        self._verbindung.close()
+
+    # --- STADT-HELPER ---
+    def finde_oder_erstelle_stadt(self, stadt_name: str, migrieren: bool = False) -> int:
+        """Sucht Stadt-ID oder erstellt neuen Stadt-Eintrag, gibt ID zurück."""
+        stadt_name_lower = stadt_name.lower().strip()
+        if not stadt_name_lower:
+            raise ValueError("Stadtname darf nicht leer sein.")
+
+        zeile = self._verbindung.execute(self.SQL_STADT_NACH_NAME, (stadt_name_lower,)).fetchone()
+        if zeile is not None:
+            return zeile[0]
+
+        neue_stadt = Stadt(name=stadt_name.strip())
+        cursor = self._verbindung.execute(self.SQL_STADT_EINFUEGEN, (None, neue_stadt.name, stadt_name_lower))
+        self._stadt_id_map[cursor.lastrowid] = neue_stadt.name
+        return cursor.lastrowid
+
+    def get_stadtname(self, stadt_id: int) -> str:
+        """Gibt den Namen der Stadt basierend auf der ID zurück."""
+        if stadt_id not in self._stadt_id_map:
+            zeile = self._verbindung.execute(self.SQL_STADT_NACH_ID, (stadt_id,)).fetchone()
+            if zeile is None:
+                return "Unbekannt"
+            self._stadt_id_map[stadt_id] = zeile[0]
+        return self._stadt_id_map[stadt_id]
+
+    # --- CRUD METHODEN ---
+    @staticmethod
+    def _person(zeile: tuple) -> Person:
+        # Zeilen stammen aus validierten Personen: keine erneute Validierung nötig
+        p_id, name, email, stadt_id, datum = zeile
+        return Person.model_construct(id=p_id, name=name, email=email, stadt_id=stadt_id,
+                                      erstellungsdatum=datetime.fromisoformat(datum) if datum else None)
+
+    def anzahl(self) -> int:
+        """Anzahl aller Personen."""
+        return self._verbindung.execute(self.SQL_ANZAHL).fetchone()[0]
+
+    def finde_nach_id(self, id_gesucht: int) -> Optional[Person]:
+        zeile = self._verbindung.execute(self.SQL_PERSON_NACH_ID, (id_gesucht,)).fetchone()
+        return None if zeile is None else self._person(zeile)
+
+    def hinzufuegen(self, neuer_eintrag: Dict[str, Any]):
+        """Fügt einen Eintrag hinzu. Erwartet Name, Email und den Stadt-Namen."""
+
+        if 'stadt' not in neuer_eintrag:
+             raise ValueError("Stadtname fehlt.")
+
+        with self.transaktion():
+            stadt_name = neuer_eintrag.pop('stadt')
+            neuer_eintrag['stadt_id'] = self.finde_oder_erstelle_stadt(stadt_name)
+
+            try:
+                if 'erstellungsdatum' not in neuer_eintrag or neuer_eintrag['erstellungsdatum'] is None:
+                     neuer_eintrag['erstellungsdatum'] = datetime.now().replace(microsecond=0)
+
+                person_objekt = PersonCreate(**neuer_eintrag)
+                person_objekt_mit_id = Person(**person_objekt.model_dump())
+            except ValidationError as e:
+                raise ValueError(f"Validierungsfehler beim Hinzufügen: {e}")
+
+            self._fuege_person_ein(person_objekt_mit_id)
+
+    def _fuege_person_ein(self, person: Person) -> int:
+        try:
+            cursor = self._verbindung.execute(self.SQL_PERSON_EINFUEGEN, (
+                person.id, person.name, person.email, person.email.lower(), person.stadt_id,
+                person.erstellungsdatum.isoformat() if person.erstellungsdatum else None,
+            ))
+        except sqlite3.IntegrityError as e:
+            raise self._integritaetsfehler(e, f"E-Mail-Adresse '{person.email}' existiert bereits. Eintrag nicht hinzugefügt.")
+        person.id = cursor.lastrowid
+        return person.id
+
+    @staticmethod
+    def _integritaetsfehler(e: sqlite3.IntegrityError, email_meldung: str) -> ValueError:
+        if 'personen.email_klein' in str(e):
+            return ValueError(email_meldung)
+        return ValueError(f"Datenbankfehler: {e}")
+
+    def aendern(self, id_zum_aendern: int, neue_daten: Dict[str, str]):
+        """Ändert existierende Daten eines Eintrags (Update). Erwartet Stadt-Namen."""
+
+        with self.transaktion():
+            person_zu_aendern = self.finde_nach_id(id_zum_aendern)
+            if not person_zu_aendern:
+                raise LookupError(f"Eintrag mit ID {id_zum_aendern} wurde nicht gefunden.")
+
+            if 'stadt' in neue_daten and neue_daten['stadt']:
+                stadt_name = neue_daten.pop('stadt')
+                neue_daten['stadt_id'] = self.finde_oder_erstelle_stadt(stadt_name)
+
+            try:
+                update_data = PersonUpdate(**neue_daten)
+            except ValidationError as e:
+                raise ValueError(f"Validierungsfehler: {e.errors()}")
+
+            aktualisiert = False
+            if update_data.email is not None and update_data.email != person_zu_aendern.email:
+                person_zu_aendern.email = update_data.email
+                aktualisiert = True
+            if update_data.name is not None and update_data.name.strip() != "" and update_data.name != person_zu_aendern.name:
+                person_zu_aendern.name = update_data.name
+                aktualisiert = True
+            if update_data.stadt_id is not None and update_data.stadt_id != person_zu_aendern.stadt_id:
+                person_zu_aendern.stadt_id = update_data.stadt_id
+                aktualisiert = True
+
+            if aktualisiert:
+                try:
+                    self._verbindung.execute(self.SQL_PERSON_AENDERN, (
+                        person_zu_aendern.name, person_zu_aendern.email, person_zu_aendern.email.lower(),
+                        person_zu_aendern.stadt_id, id_zum_aendern,
+                    ))
+                except sqlite3.IntegrityError as e:
+                    raise self._integritaetsfehler(e, f"E-Mail-Adresse '{update_data.email}' existiert bereits bei einem anderen Eintrag.")
+
+    def loeschen(self, id_zum_loeschen: int):
+        with self.transaktion():
+            if self._verbindung.execute(self.SQL_PERSON_LOESCHEN, (id_zum_loeschen,)).rowcount == 0:
+                raise LookupError(f"Eintrag mit ID {id_zum_loeschen} wurde nicht gefunden.")
+
+    # --- SUCH- UND SORTIER-METHODEN ---
+    @staticmethod
+    def _teilstring_bedingung(spalte: str, suchwert: str, parameter: List[Any]) -> str:
+        suchwert = suchwert.lower()
+        parameter.append(suchwert)
+        # Reine ASCII-Suchwörter: eingebautes lower() (schnell), sonst Python-lower() wie in MiniDatenbank
+        funktion = "lower" if suchwert.isascii() else "py_lower"
+        return f"instr({funktion}({spalte}), ?) > 0"
+
+    def filter_by_criteria(self, kriterien: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Filtert Daten. Gibt Dicts zurück, um den Stadt-Namen hinzuzufügen."""
+        bedingungen: List[str] = []
+        parameter: List[Any] = []
+
+        for key, value in kriterien.items():
+            if not value: continue
+
+            if key in ['name', 'email']:
+                bedingungen.append(self._teilstring_bedingung(f"p.{key}", str(value), parameter))
+            elif key == 'id':
+                try:
+                    parameter.append(int(value))
+                except ValueError:
+                    continue
+                bedingungen.append("p.id = ?")
+            elif key == 'stadt':
+                parameter.append(str(value).lower())
+                bedingungen.append("instr(s.name_klein, ?) > 0")
+
+        sql = f"SELECT {self.PERSON_SPALTEN}, s.name FROM personen p LEFT JOIN staedte s ON s.id = p.stadt_id"
+        if bedingungen:
+            sql += " WHERE " + " AND ".join(bedingungen)
+        sql += " ORDER BY p.id"
+
+        output = []
+        for zeile in self._verbindung.execute(sql, parameter):
+            d = self._person(zeile[:5]).model_dump(mode='json')
+            d['stadt'] = zeile[5] if zeile[5] is not None else "Unbekannt"
+            output.append(d)
+        return output
+
+    def sortiert(self, feld: str, absteigend: bool = False, ids: Optional[Set[int]] = None,
+                 start: int = 0, anzahl: Optional[int] = None) -> List[Person]:
+        """Gibt eine Seite der sortierten Personen per ORDER BY ... LIMIT/OFFSET zurück."""
+        if feld not in self.SORTIER_AUSDRUECKE:
+            raise ValueError(f"Sortierfeld '{feld}' ist ungültig.")
+        richtung = "DESC" if absteigend else "ASC"
+
+        sql = f"SELECT {self.PERSON_SPALTEN} FROM personen p"
+        if feld == 'stadt':
+            sql += " LEFT JOIN staedte s ON s.id = p.stadt_id"
+        parameter: List[Any] = []
+        if ids is not None:
+            # Teilmenge (z.B. Suchergebnisse) als JSON-Array: ein Parameter statt beliebig vieler Platzhalter
+            sql += " WHERE p.id IN (SELECT value FROM json_each(?))"
+            parameter.append(json.dumps(list(ids)))
+        sql += f" ORDER BY {self.SORTIER_AUSDRUECKE[feld]} {richtung}, p.id {richtung} LIMIT ? OFFSET ?"
+        parameter += [-1 if anzahl is None else anzahl, max(start, 0)]
+
+        return [self._person(zeile) for zeile in self._verbindung.execute(sql, parameter)]
+
+    # Sortiert beliebige Listen (Personen oder Dicts) in Python, identisch zu MiniDatenbank
+    sortieren = MiniDatenbank.sortieren
+
+    # --- MIGRATION ---
+    def json_migriert(self) -> bool:
+        """True, sobald migriere_aus_json vollständig durchgelaufen ist (steht in der Datei selbst)."""
+        return self._verbindung.execute(self.SQL_META_LESEN, ('json_migriert',)).fetchone() is not None
+
+    def migriere_aus_json(self, dateiname: str = DATEI_NAME, stadt_dateiname: str = STADT_DATEI_NAME) -> int:
+        """Übernimmt einmalig die JSON-Dateien von MiniDatenbank (auch im alten Format).
+
+        IDs und Erstellungsdaten bleiben erhalten. Dateien im alten,
+        unnormalisierten Format laufen über denselben _OldPerson-Pfad wie
+        MiniDatenbank._migrieren_daten. Ein noch nicht eingearbeitetes
+        Write-Ahead-Log muss vorher kompaktiert werden (WalSpeicher.kompaktieren).
+        Der Abschluss wird in derselben Transaktion vermerkt (json_migriert()).
+        Gibt die Anzahl übernommener Personen zurück.
+        """
+        if self.anzahl():
+            raise ValueError(f"'{self.dateiname}' enthält bereits Personen, Migration abgebrochen.")
+
+        with self.transaktion():
+            for stadt in MiniDatenbank._laden(stadt_dateiname, Stadt):
+                if self._verbindung.execute(self.SQL_STADT_NACH_NAME, (stadt.name.lower().strip(),)).fetchone() is None:
+                    self._verbindung.execute(self.SQL_STADT_EINFUEGEN, (stadt.id, stadt.name, stadt.name.lower().strip()))
+
+            personen = MiniDatenbank._laden(dateiname, Person)
+            if not personen and os.path.exists(dateiname) and os.path.getsize(dateiname) > 0:
+                print("INFO: Alte Datenbankstruktur erkannt. Starte Migration...")
+                personen = _konvertiere_alte_personen(MiniDatenbank._laden(dateiname, _OldPerson),
+                                                      self.finde_oder_erstelle_stadt)
+
+            for person in personen:
+                self._fuege_person_ein(person)
+            self._verbindung.execute(self.SQL_META_SCHREIBEN, ('json_migriert', datetime.now().isoformat()))
+
+        print(f"INFO: {len(personen)} Personen nach '{self.dateiname}' migriert.")
+        return len(personen)
+
+
+# ====================================================================
+# VI. HINTERGRUND-AUSFÜHRUNG (DB-WORKER)
+# ====================================================================
+
+_DBAuftrag = namedtuple('_DBAuftrag', ['funktion', 'bei_erfolg', 'bei_fehler', 'schreibend'])
+_ENDE = object() # Signal an den Worker-Thread, sich zu beenden
+
+
+class DBAusfuehrer:
+    """Führt MiniDatenbank-Operationen auf einem Worker-Thread aus.
+
+    Ergebnisse und Fehler werden über eine Queue zurückgegeben, die der
+    Tk-Thread per root.after abfragt; Callbacks laufen also immer im
+    Tk-Thread. Schreibaufträge, die kurz hintereinander eintreffen, werden
+    in einem `gepuffert()`-Block ausgeführt und mit einem einzigen Flush
+    persistiert. Scheitert dieser Flush, behalten die Aufträge ihr eigenes
+    Ergebnis (die Änderungen sind im Speicher ja erfolgt); der Fehler geht
+    gesondert an `persistenz_fehler_callback`. Lesezugriffe aus dem
+    Tk-Thread sichern sich über `lock` ab.
+    """
+
+    def __init__(self, root, db: MiniDatenbank, status_callback: Optional[Callable[[int], None]] = None,
+                 buendel_fenster: float = 0.05,
+                 persistenz_fehler_callback: Optional[Callable[[Exception], None]] = None):
+        self.root = root
+        self.db = db
+        self.lock = threading.RLock()
+        self.buendel_fenster = buendel_fenster # Sekunden, die auf weitere Schreibaufträge gewartet wird
+        self._status_callback = status_callback
+        self._persistenz_fehler_callback = persistenz_fehler_callback
+        
+        self._auftraege: queue.Queue = queue.Queue()
+        self._ergebnisse: queue.Queue = queue.Queue()
+        self._offen = 0 # Nur im Tk-Thread verändert
+        self._abfrage_geplant = False
+        
+        self._worker = threading.Thread(target=self._arbeite, name="DBAusfuehrer", daemon=True)
+        self._worker.start()
+
+    # --- TK-THREAD ---
+    def ausfuehren(self, funktion: Callable[[], Any], bei_erfolg: Optional[Callable[[Any], None]] = None,
+                   bei_fehler: Optional[Callable[[Exception], None]] = None, schreibend: bool = False):
+        """Reiht einen Auftrag ein; die Callbacks werden später im Tk-Thread aufgerufen."""
+        self._offen += 1
+        self._melde_status()
+        self._auftraege.put(_DBAuftrag(funktion, bei_erfolg, bei_fehler, schreibend))
+        self._plane_abfrage()
+
+    def _plane_abfrage(self):
+        if not self._abfrage_geplant:
+            self._abfrage_geplant = True
+            self.root.after(ERGEBNIS_INTERVALL_MS, self._pruefe_ergebnisse)
+
+    def _pruefe_ergebnisse(self):
+        self._abfrage_geplant = False
+        while True:
+            try:
+                auftrag, erfolgreich, wert = self._ergebnisse.get_nowait()
+            except queue.Empty:
+                break
+            if auftrag is None: # Fehler beim Flush eines Stapels, kein eigener Auftrag
+                if self._persistenz_fehler_callback is not None:
+                    self._persistenz_fehler_callback(wert)
+                else:
+                    print(f"FEHLER beim Persistieren: {wert}")
+                continue
+            self._offen -= 1
+            callback = auftrag.bei_erfolg if erfolgreich else auftrag.bei_fehler
+            if callback is not None:
+                callback(wert)
+            elif not erfolgreich:
+                print(f"FEHLER im DB-Auftrag: {wert}")
+        
+        self._melde_status()
+        if self._offen > 0:
+            self._plane_abfrage()
+
+    def _melde_status(self):
+        if self._status_callback is not None:
+            self._status_callback(self._offen)
+
+    def beenden(self):
+        """Arbeitet die Warteschlange ab und beendet den Worker (ausstehende Writes werden geflusht)."""
+        self._auftraege.put(_ENDE)
+        self._worker.join()
+
+    # --- WORKER-THREAD ---
+    def _arbeite(self):
+        zurueckgestellt = None
+        while True:
+            auftrag = zurueckgestellt if zurueckgestellt is not None else self._auftraege.get()
+            zurueckgestellt = None
+            if auftrag is _ENDE:
+                break
+            
+            if not auftrag.schreibend:
+                self._ergebnisse.put((auftrag,) + self._fuehre_aus(auftrag))
+                continue
+            
+            stapel, zurueckgestellt = self._sammle_schreibauftraege(auftrag)
+            ergebnisse = []
+            persistenz_fehler = None
+            try:
+                with self.db.gepuffert(): # Ein einziger Flush für den ganzen Stapel
+                    for a in stapel:
+                        ergebnisse.append(self._fuehre_aus(a))
+            except Exception as e:
+                persistenz_fehler = e
+            if persistenz_fehler is not None:
+                # Vor den Ergebnissen einreihen: solange Aufträge offen sind, fragt der Tk-Thread noch ab
+                self._ergebnisse.put((None, False, persistenz_fehler))
+            for a, ergebnis in zip(stapel, ergebnisse):
+                self._ergebnisse.put((a,) + ergebnis)
+
+    def _sammle_schreibauftraege(self, erster: _DBAuftrag):
+        """Sammelt weitere direkt folgende Schreibaufträge (innerhalb von `buendel_fenster`)."""
+        stapel = [erster]
+        frist = time.monotonic() + self.buendel_fenster
+        while True:
+            rest = frist - time.monotonic()
+            try:
+                weiterer = self._auftraege.get(timeout=rest) if rest > 0 else self._auftraege.get_nowait()
+            except queue.Empty:
+                return stapel, None
+            if weiterer is _ENDE or not weiterer.schreibend:
+                # Reihenfolge wahren: Leseauftrag erst nach dem Stapel ausführen
+                return stapel, weiterer
+            stapel.append(weiterer)
+
+    def _fuehre_aus(self, auftrag: _DBAuftrag):
+        try:
+            with self.lock:
+                return True, auftrag.funktion()
+        except Exception as e:
+            return False, e
+
+
+# ====================================================================
+# VII. HAUPTPROGRAMM (BENUTZER-INTERFACE) - TKINTER GUI MIT TREEVIEW
 # ====================================================================
 
 class DBApp:
@@ -385,6 +1889,13 @@ class DBApp:
         self.id_edit_var = tk.StringVar()
         self.aktive_bearbeitungs_id: Optional[int] = None
         
+        # Zustand der virtuellen Ansicht (nur die sichtbaren Zeilen liegen in der Treeview)
+        self._sortier_feld = 'name'
+        self._absteigend = False
+        self._gefilterte_ids: Optional[List[int]] = None # Sortierte Suchergebnisse, None = alle Einträge
+        self._fenster_start = 0
+        self._fenster_werte: Dict[str, tuple] = {} # Treeview-Item -> angezeigte Werte
+        
         # Suchvariablen
         self.such_name_var = tk.StringVar()
         self.such_stadt_var = tk.StringVar()
@@ -393,25 +1904,42 @@ class DBApp:
         self.erzeuge_eingabemaske()
         self.erzeuge_steuerungsbuttons()
         self.erzeuge_suchmaske()
+        self.erzeuge_statusleiste()
         self.erzeuge_anzeigebereich() 
         
+        # Alle schreibenden Operationen und Suchen laufen im Hintergrund
+        self.ausfuehrer = DBAusfuehrer(self.master, self.db, status_callback=self._zeige_status,
+                                       persistenz_fehler_callback=self._zeige_persistenz_fehler)
+        
         self.update_display(sortier_feld='name') 
 
     # --- ZENTRALER FEHLER-WRAPPER ---
     def _db_aktion_wrapper(self, aktion: callable, erfolgs_msg: str, **kwargs):
-        try:
-            aktion(**kwargs)
+        """Führt die Aktion im DB-Worker aus; Erfolg/Fehler werden danach im Tk-Thread gemeldet."""
+        
+        def bei_erfolg(_ergebnis):
             messagebox.showinfo("Erfolg", erfolgs_msg)
             self.setze_formular_zurueck()
-            self.update_display(sortier_feld='name') 
-        except ValidationError as e:
+            # Bleibt die Ansicht gleich, wird nur das sichtbare Fenster abgeglichen (kein Neuaufbau)
+            gleiche_ansicht = self._gefilterte_ids is None and self._sortier_feld == 'name' and not self._absteigend
+            self.update_display(sortier_feld='name', start=self._fenster_start if gleiche_ansicht else 0)
+        
+        self.ausfuehrer.ausfuehren(partial(aktion, **kwargs), bei_erfolg=bei_erfolg,
+                                   bei_fehler=self._zeige_db_fehler, schreibend=True)
+
+    def _zeige_db_fehler(self, e: Exception):
+        if isinstance(e, ValidationError):
             fehler_detail = "\n".join([f"Feld '{err['loc'][0]}': {err['msg']}" for err in e.errors()])
             messagebox.showerror("Eingabefehler (Pydantic)", fehler_detail)
-        except (ValueError, LookupError) as e:
+        elif isinstance(e, (ValueError, LookupError)):
             messagebox.showerror("DB-Fehler", str(e))
-        except Exception as e:
+        else:
             messagebox.showerror("Unbekannter Fehler", f"Ein unbekannter Fehler ist aufgetreten: {e}")
 
+    def _zeige_persistenz_fehler(self, e: Exception):
+        messagebox.showerror("Speicherfehler",
+                             f"Die Änderungen wurden übernommen, konnten aber nicht gespeichert werden: {e}")
+
     # --- ERZEUGUNGS-METHODEN (Gekürzt) ---
     def erzeuge_eingabemaske(self):
         self.eingabe_frame = tk.LabelFrame(self.master, text="➕ Neuen Eintrag erstellen", padx=10, pady=10)
@@ -464,6 +1992,24 @@ class DBApp:
         
         tk.Button(frame, text="Alle Einträge anzeigen", command=lambda: self.update_display(sortier_feld='name')).grid(row=1, column=2, padx=5, pady=5)
 
+    def erzeuge_statusleiste(self):
+        frame = tk.Frame(self.master)
+        frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 5))
+        
+        self.status_label = tk.Label(frame, text="Bereit", anchor="w")
+        self.status_label.pack(side=tk.LEFT)
+        self.status_balken = ttk.Progressbar(frame, mode='indeterminate', length=120)
+        self.status_balken.pack(side=tk.RIGHT)
+
+    def _zeige_status(self, offene_auftraege: int):
+        """Busy-Anzeige: läuft, solange der DB-Worker Aufträge abarbeitet."""
+        if offene_auftraege:
+            self.status_label.config(text=f"⏳ Datenbank arbeitet ... ({offene_auftraege} ausstehend)")
+            self.status_balken.start(15)
+        else:
+            self.status_label.config(text="Bereit")
+            self.status_balken.stop()
+
     def erzeuge_anzeigebereich(self):
         tk.Label(self.master, text="\nAktuelle Datenbank-Einträge (Klicken Sie auf Spaltenüberschrift zum Sortieren):").pack()
         
@@ -482,13 +2028,18 @@ class DBApp:
         self.tree.column('stadt', width=120)
         self.tree.column('erstellungsdatum', width=120, anchor='center')
 
-        scrollbar = ttk.Scrollbar(self.master, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Virtuelles Scrollen: Die Scrollbar bildet die gesamte Ergebnismenge ab,
+        # die Treeview enthält nur die gerade sichtbaren Zeilen (siehe _zeige_fenster)
+        self.scrollbar = ttk.Scrollbar(self.master, orient=tk.VERTICAL, command=self._scrollen)
 
         self.tree.pack(fill='both', expand=True, padx=10, pady=5)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
         self.tree.bind('<Double-1>', self.on_treeview_select)
+        self.tree.bind('<MouseWheel>', self._mausrad) # Windows / macOS
+        self.tree.bind('<Button-4>', self._mausrad)   # Linux (hoch)
+        self.tree.bind('<Button-5>', self._mausrad)   # Linux (runter)
+        self.tree.bind('<Configure>', lambda event: self._zeige_fenster(self._fenster_start))
 
 
     # --- AKTIONEN (CRUD) ---
@@ -542,12 +2093,14 @@ class DBApp:
             messagebox.showerror("Fehler", "Die ID muss eine ganze Zahl sein.")
             return
 
-        person = self.db.finde_nach_id(id_zu_laden)
+        with self.ausfuehrer.lock: # Nicht lesen, während der Worker gerade schreibt
+            person = self.db.finde_nach_id(id_zu_laden)
+            stadt_name = self.db.get_stadtname(person.stadt_id) if person else None
         
         if person:
             self.name_var.set(person.name)
             self.email_var.set(person.email)
-            self.stadt_var.set(self.db.get_stadtname(person.stadt_id))
+            self.stadt_var.set(stadt_name)
             
             self.aktive_bearbeitungs_id = person.id
             
@@ -608,18 +2161,6 @@ class DBApp:
     def sortiere_treeview(self, col):
         """Sortiert die Treeview-Daten interaktiv beim Klick auf die Spaltenüberschrift."""
         
-        data = []
-        for item in self.tree.get_children(''):
-            values = self.tree.item(item, 'values')
-            data.append({
-                'id': int(values[0]),
-                'name': values[1],
-                'email': values[2],
-                'stadt': values[3],
-                'erstellungsdatum': values[4],
-                'stadt_id': self.db._stadt_namen_map.get(values[3].lower(), -1)
-            })
-
         current_sort = self.tree.heading(col, option="text")
         if current_sort.endswith(" ▼"):
             direction = False # Aufsteigend
@@ -628,17 +2169,14 @@ class DBApp:
             direction = True # Absteigend
             new_text = col.capitalize() + " ▼"
 
-        sortierte_daten = self.db.sortieren(data, feld=col, absteigend=direction)
-
-        self.tree.delete(*self.tree.get_children())
-        for row in sortierte_daten:
-            self.tree.insert('', tk.END, values=(
-                row['id'],
-                row['name'],
-                row['email'],
-                row['stadt'],
-                row['erstellungsdatum'][:10]
-            ))
+        # Sortier-Index statt Rekonstruktion aus den Treeview-Strings + sorted()
+        self._sortier_feld = col
+        self._absteigend = direction
+        if self._gefilterte_ids is not None:
+            with self.ausfuehrer.lock: # Der Worker könnte gerade den Sortier-Index ändern
+                sortiert = self.db.sortiert(col, absteigend=direction, ids=set(self._gefilterte_ids))
+            self._gefilterte_ids = [person.id for person in sortiert]
+        self._zeige_fenster(0)
             
         for c in self.tree['columns']:
             text = self.tree.heading(c, option="text")
@@ -661,55 +2199,137 @@ class DBApp:
             messagebox.showwarning("Suche", "Bitte geben Sie mindestens ein Suchkriterium ein.")
             return
 
-        try:
+        def suche():
+            # Läuft im DB-Worker: Filtern und Sortieren blockieren die Oberfläche nicht
             ergebnisse = self.db.filter_by_criteria(kriterien)
-            sortierte_ergebnisse = self.db.sortieren(ergebnisse, feld='name')
+            return [person.id for person in self.db.sortiert('name', ids={row['id'] for row in ergebnisse})]
 
-            self._update_treeview_data(sortierte_ergebnisse)
+        def zeige_ergebnisse(sortierte_ids: List[int]):
+            self._sortier_feld = 'name'
+            self._absteigend = False
+            self._gefilterte_ids = sortierte_ids
+            self._zeige_fenster(0)
             
-            messagebox.showinfo("Suche erfolgreich", f"{len(ergebnisse)} Einträge gefunden.")
-            
-        except Exception as e:
-            messagebox.showerror("Suchfehler", f"Ein Fehler bei der Suche ist aufgetreten: {e}")
+            messagebox.showinfo("Suche erfolgreich", f"{len(sortierte_ids)} Einträge gefunden.")
+
+        self.ausfuehrer.ausfuehren(
+            suche,
+            bei_erfolg=zeige_ergebnisse,
+            bei_fehler=lambda e: messagebox.showerror("Suchfehler", f"Ein Fehler bei der Suche ist aufgetreten: {e}")
+        )
 
     
-    def _update_treeview_data(self, daten: List[Dict]):
-        """Interne Methode zum leeren und Befüllen der Treeview."""
-        self.tree.delete(*self.tree.get_children())
-        
-        if not daten:
-            return
+    # --- VIRTUELLE ANZEIGE ---
+
+    def _gesamtanzahl(self) -> int:
+        if self._gefilterte_ids is not None:
+            return len(self._gefilterte_ids)
+        return self.db.anzahl()
+
+    def _sichtbare_zeilen(self) -> int:
+        """Anzahl der Zeilen, die in die Treeview passen."""
+        hoehe = self.tree.winfo_height()
+        if hoehe <= 1: # Noch nicht gezeichnet
+            return int(self.tree.cget('height'))
+        zeilenhoehe = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        return max(1, (hoehe - TREEVIEW_KOPFZEILE) // zeilenhoehe)
+
+    def _fenster_personen(self, start: int, anzahl: int) -> List[Person]:
+        if self._gefilterte_ids is None:
+            return self.db.sortiert(self._sortier_feld, absteigend=self._absteigend, start=start, anzahl=anzahl)
+        personen = (self.db.finde_nach_id(p_id) for p_id in self._gefilterte_ids[start:start + anzahl])
+        return [person for person in personen if person is not None]
+
+    def _zeilenwerte(self, person: Person) -> tuple:
+        return (
+            str(person.id),
+            person.name,
+            person.email,
+            self.db.get_stadtname(person.stadt_id),
+            str(person.erstellungsdatum)[:10]
+        )
 
-        for row in daten:
-            self.tree.insert('', tk.END, values=(
-                row.get('id'),
-                row.get('name'),
-                row.get('email'),
-                row.get('stadt'),
-                str(row.get('erstellungsdatum', 'N/A'))[:10]
-            ))
+    def _zeige_fenster(self, start: int):
+        """Materialisiert nur die sichtbaren Zeilen ab Position `start`.
+
+        Vorhandene Items werden wiederverwendet: Nur neue, geänderte oder
+        weggefallene Zeilen lösen ein insert/item/delete in der Treeview aus.
+        """
+        anzahl = self._sichtbare_zeilen()
+        with self.ausfuehrer.lock: # Nicht lesen, während der Worker gerade schreibt
+            gesamt = self._gesamtanzahl()
+            start = max(0, min(start, gesamt - anzahl))
+            neue_zeilen = [(str(person.id), self._zeilenwerte(person)) for person in self._fenster_personen(start, anzahl)]
+        self._fenster_start = start
+
+        neue_items = {item for item, _ in neue_zeilen}
+
+        for item in list(self._fenster_werte):
+            if item not in neue_items:
+                self.tree.delete(item)
+                del self._fenster_werte[item]
+
+        for position, (item, werte) in enumerate(neue_zeilen):
+            if item not in self._fenster_werte:
+                self.tree.insert('', position, iid=item, values=werte)
+            else:
+                if self.tree.index(item) != position:
+                    self.tree.move(item, '', position)
+                if self._fenster_werte[item] != werte:
+                    self.tree.item(item, values=werte)
+            self._fenster_werte[item] = werte
+
+        if gesamt:
+            self.scrollbar.set(start / gesamt, min(1.0, (start + anzahl) / gesamt))
+        else:
+            self.scrollbar.set(0.0, 1.0)
 
-    def update_display(self, sortier_feld: str = 'name', absteigend: bool = False):
-        """Aktualisiert die Treeview mit allen aktuellen DB-Daten."""
-        
-        alle_daten_mit_stadtname = []
-        for person in self.db.daten:
-            d = person.model_dump(mode='json')
-            d['stadt'] = self.db.get_stadtname(person.stadt_id)
-            alle_daten_mit_stadtname.append(d)
-        
-        sortierte_daten = self.db.sortieren(alle_daten_mit_stadtname, feld=sortier_feld, absteigend=absteigend)
+    def _scrollen(self, aktion: str, wert: str, einheit: Optional[str] = None):
+        """Scrollbar-Callback ('moveto' beim Ziehen, 'scroll' bei Pfeilen/Seitenklicks)."""
+        if aktion == 'moveto':
+            start = int(float(wert) * self._gesamtanzahl())
+        else:
+            schritt = self._sichtbare_zeilen() if einheit == 'pages' else 1
+            start = self._fenster_start + int(wert) * schritt
+        self._zeige_fenster(start)
+
+    def _mausrad(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            richtung = -1
+        else:
+            richtung = 1
+        self._zeige_fenster(self._fenster_start + richtung * 3)
+        return "break"
+
+    def update_display(self, sortier_feld: str = 'name', absteigend: bool = False, start: int = 0):
+        """Zeigt alle aktuellen DB-Daten (sortiert) ab Position `start` an."""
         
-        self._update_treeview_data(sortierte_daten)
+        self._sortier_feld = sortier_feld
+        self._absteigend = absteigend
+        self._gefilterte_ids = None
+        self._zeige_fenster(start)
         
 
 # ====================================================================
-# IV. PROGRAMMSTART
+# VIII. PROGRAMMSTART
 # ====================================================================
 
 if __name__ == "__main__":
-    db_objekt = MiniDatenbank(DATEI_NAME, STADT_DATEI_NAME)
+    if '--sqlite' in sys.argv:
+        # SQLite-Variante: die bisherigen JSON-Dateien übernehmen, bis das einmal vollständig geklappt hat
+        db_objekt = SQLiteDatenbank(SQLITE_DATEI_NAME)
+        if (not db_objekt.json_migriert() and db_objekt.anzahl() == 0
+                and (os.path.exists(DATEI_NAME) or os.path.exists(WAL_DATEI_NAME))):
+            # Änderungen, die erst im Write-Ahead-Log stehen, vorher in den JSON-Snapshot einarbeiten
+            json_db = MiniDatenbank(DATEI_NAME, STADT_DATEI_NAME, speicher=WalSpeicher(WAL_DATEI_NAME))
+            json_db.speicher.kompaktieren(json_db, warten=True)
+            json_db.schliessen()
+            db_objekt.migriere_aus_json(DATEI_NAME, STADT_DATEI_NAME)
+    else:
+        db_objekt = MiniDatenbank(DATEI_NAME, STADT_DATEI_NAME, speicher=WalSpeicher(WAL_DATEI_NAME))
     
     root = tk.Tk()
     app = DBApp(root, db_objekt)
     root.mainloop()
+    app.ausfuehrer.beenden()
+    db_objekt.schliessen()
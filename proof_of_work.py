@@ -0,0 +1,430 @@
+# -*- coding: utf-8 -*-
+"""
+Python-Version von 'proof of work.py' (block / Blockchain) mit paralleler Nonce-Suche
+Die Klassen und Methoden heißen wie im JavaScript-Original, der Hash wird
+aus genau derselben Zeichenkette gebildet:
+    index + previousHash + timestamp + JSON.stringify(data) + nonce
+Blöcke aus beiden Versionen haben also dieselben Hashes.
+
+mineBlock verteilt die Suche auf einen ProcessPoolExecutor: Worker k von W
+prüft die Nonces start+k, start+k+W, start+k+2W, ... (disjunkte Schrittweiten).
+Findet einer einen Treffer, hören alle auf, sobald ihre nächste Nonce größer
+ist; das Ergebnis ist damit dieselbe (kleinste) Nonce wie bei der
+sequentiellen Suche, und der Block besteht ischainValid wie gehabt.
+
+Da sich beim Mining nur die Nonce am Ende ändert, hasht jeder Worker den
+Präfix nur einmal und kopiert pro Versuch diesen Zwischenstand (Midstate,
+hashlib-Objekt .copy()); pro Nonce werden nur noch deren Ziffern nachgeschoben.
+Der Durchsatz hängt damit nicht mehr von der Größe von `data` ab.
+
+Mit kern="numpy" prüft ein Worker pro Schritt einen ganzen Block von
+BATCH_LANES Nonces auf einmal mit dem uint32-Kernel aus sha256_batch.py
+(eigene SHA-256-Implementierung, gegen hashlib geprüft).
+
+ischainValid prüft inkrementell: Blockchain merkt sich, bis zu welcher Höhe
+die Kette schon gültig war, und jeder Block seinen zuletzt berechneten Hash.
+Nach addblock wird also nur das neue Glied geprüft. Wird ein Hash-Feld eines
+Blocks neu zugewiesen (z.B. mycoin.chain[1].data = {'amount': 100}), fällt der
+Stand auf die Höhe davor zurück und ab diesem Block wird neu gerechnet.
+ischainValid(vollstaendig=True) verwirft alle Zwischenstände und berechnet
+die Hashes parallel auf allen Kernen neu, Abschnitt für Abschnitt (so liegt
+auch bei einem BlockSpeicher nie die ganze Kette im Speicher); das ist nötig,
+wenn `data` in-place verändert oder die Liste `chain` direkt bearbeitet wurde.
+
+Aufruf: python proof_of_work.py [--difficulty N] [--workers N] [--kern numpy] [--speicher VERZEICHNIS]
+"""
+import collections
+import hashlib
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+KEIN_TREFFER = 2 ** 63 - 1
+PRUEF_INTERVALL = 2048 # Nach so vielen Nonces schaut ein Worker nach, ob schon jemand fündig wurde
+BATCH_LANES = 16384 # Nonces pro Aufruf des NumPy-Kernels (kern="numpy")
+PRUEF_ABSCHNITT = 4096 # Blöcke pro Auftrag bei ischainValid(vollstaendig=True)
+KERNE = ("hashlib", "numpy")
+HASH_FELDER = ('index', 'timestamp', 'data', 'previousHash', 'nonce') # Eingaben von calculateHash
+
+
+# --- 1. HASH WIE IM ORIGINAL ---
+
+def _js_zahl(wert):
+    """Number.prototype.toString für einen float; NaN und ±Infinity werden wie in JSON.stringify zu null."""
+    if math.isnan(wert) or math.isinf(wert):
+        return "null"
+    if wert == 0:
+        return "0" # auch -0
+    # repr liefert wie JavaScript die kürzeste eindeutige Ziffernfolge, nur die Schreibweise unterscheidet sich
+    mantisse, _, exponent = repr(abs(wert)).partition("e")
+    ganzzahl, _, nachkomma = mantisse.partition(".")
+    ziffern = (ganzzahl + nachkomma).lstrip("0")
+    n = len(ganzzahl) + int(exponent or 0) - (len(ganzzahl + nachkomma) - len(ziffern)) # Kommaposition
+    ziffern = ziffern.rstrip("0")
+    k = len(ziffern)
+    if k <= n <= 21:
+        text = ziffern + "0" * (n - k)
+    elif 0 < n <= 21:
+        text = ziffern[:n] + "." + ziffern[n:]
+    elif -6 < n <= 0:
+        text = "0." + "0" * -n + ziffern
+    else:
+        text = ziffern[0] + ("." + ziffern[1:] if k > 1 else "") + f"e{n - 1:+d}"
+    return "-" + text if wert < 0 else text
+
+
+def _js_schluessel(schluessel):
+    # Objektschlüssel sind in JavaScript immer Strings
+    if isinstance(schluessel, str):
+        return schluessel
+    if isinstance(schluessel, float):
+        return _js_zahl(schluessel)
+    return json.dumps(schluessel)
+
+
+def _ist_array_index(schluessel):
+    # Kanonische Dezimalzahl unter 2**32 - 1: solche Schlüssel stehen in JavaScript-Objekten vorne
+    return schluessel.isdecimal() and schluessel.isascii() and str(int(schluessel)) == schluessel \
+        and int(schluessel) < 2 ** 32 - 1
+
+
+def _js_eintraege(data):
+    """Objekteinträge in JavaScript-Reihenfolge: erst Array-Indizes aufsteigend, dann der Rest wie eingefügt."""
+    eintraege = [(_js_schluessel(schluessel), eintrag) for schluessel, eintrag in data.items()]
+    indizes = sorted((e for e in eintraege if _ist_array_index(e[0])), key=lambda e: int(e[0]))
+    return indizes + [e for e in eintraege if not _ist_array_index(e[0])]
+
+
+def json_stringify(data):
+    """JSON.stringify für die hier vorkommenden Daten (kompakt, Unicode unverändert, Zahlen und Schlüssel wie in JS)."""
+    if isinstance(data, float):
+        return _js_zahl(data)
+    if isinstance(data, dict):
+        return "{" + ",".join(json.dumps(schluessel, ensure_ascii=False) + ":" + json_stringify(eintrag)
+                              for schluessel, eintrag in _js_eintraege(data)) + "}"
+    if isinstance(data, (list, tuple)):
+        return "[" + ",".join(json_stringify(eintrag) for eintrag in data) + "]"
+    return json.dumps(data, ensure_ascii=False)
+
+
+def ziel_erfuellt(digest, difficulty):
+    """True, wenn der Hex-Hash mit `difficulty` Nullen beginnt (geprüft auf den Rohbytes)."""
+    volle_bytes, halbes_byte = divmod(difficulty, 2)
+    if digest[:volle_bytes].count(0) != volle_bytes:
+        return False
+    return not halbes_byte or digest[volle_bytes] < 16
+
+
+def _hash_praefix(index, previousHash, timestamp, data):
+    return f"{index}{previousHash}{timestamp}{json_stringify(data)}".encode('utf-8')
+
+
+class block:
+    def __init__(self, index, timestamp, data, previousHash=''):
+        self._kette = None # Blockchain und Höhe, sobald der Block angehängt ist
+        self._hoehe = None
+        self._berechneter_hash = None # calculateHash zum aktuellen Inhalt, None = unbekannt
+        self.index = index
+        self.timestamp = timestamp
+        self.data = data
+        self.previousHash = previousHash
+        self.nonce = 0
+        self.hash = self.calculateHash()
+        self._berechneter_hash = self.hash
+
+    def __setattr__(self, name, wert):
+        object.__setattr__(self, name, wert)
+        if name in HASH_FELDER:
+            object.__setattr__(self, '_berechneter_hash', None)
+        if name in HASH_FELDER or name == 'hash':
+            kette = self.__dict__.get('_kette')
+            if kette is not None:
+                kette._geaendert(self._hoehe)
+
+    def hash_praefix(self):
+        """Alles vor der Nonce; bleibt während des Minings gleich."""
+        return _hash_praefix(self.index, self.previousHash, self.timestamp, self.data)
+
+    def calculateHash(self):
+        return hashlib.sha256(self.hash_praefix() + str(self.nonce).encode('ascii')).hexdigest()
+
+    def gecachter_hash(self):
+        """calculateHash, aber nur neu gerechnet, wenn sich seit dem letzten Mal ein Hash-Feld geändert hat."""
+        if self._berechneter_hash is None:
+            self._berechneter_hash = self.calculateHash()
+        return self._berechneter_hash
+
+    def hash_midstate(self):
+        """SHA-256-Zustand nach dem Präfix: .copy() + update(Nonce) ergibt denselben Hash wie calculateHash."""
+        return hashlib.sha256(self.hash_praefix())
+
+    def mineBlock(self, difficulty, max_workers=None, kern="hashlib"):
+        """
+        Sucht die erste Nonce, deren Hash mit `difficulty` Nullen beginnt.
+        max_workers=1 sucht sequentiell wie das Original, sonst parallel;
+        kern="numpy" hasht die Nonces blockweise (siehe sha256_batch).
+        Gibt die Statistik der Suche zurück (siehe parallele_nonce_suche).
+        """
+        # Nicht self.hash: der ist veraltet, wenn z.B. previousHash nach __init__ gesetzt wurde
+        aktueller_hash = self.gecachter_hash()
+        if aktueller_hash.startswith("0" * difficulty):
+            self.hash = aktueller_hash
+            return {'nonce': self.nonce, 'hashes': 0, 'dauer': 0.0, 'worker': []}
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers == 1:
+            statistik = _sequentielle_nonce_suche(self.hash_praefix(), difficulty, self.nonce + 1, kern)
+        else:
+            statistik = parallele_nonce_suche(self.hash_praefix(), difficulty, self.nonce + 1, max_workers, kern)
+        self.nonce = statistik['nonce']
+        self.hash = self.calculateHash()
+        self._berechneter_hash = self.hash
+        print("Block mined: " + self.hash)
+        return statistik
+
+    @classmethod
+    def aus_dict(cls, felder):
+        """Block aus to_dict-Feldern, ohne neu zu hashen (z.B. aus dem BlockSpeicher)."""
+        neu = cls.__new__(cls)
+        for name, wert in (('_kette', None), ('_hoehe', None), ('_berechneter_hash', None)):
+            object.__setattr__(neu, name, wert)
+        for name in HASH_FELDER + ('hash',):
+            object.__setattr__(neu, name, felder[name])
+        return neu
+
+    def to_dict(self):
+        return {'index': self.index, 'timestamp': self.timestamp, 'data': self.data,
+                'previousHash': self.previousHash, 'nonce': self.nonce, 'hash': self.hash}
+
+
+class Blockchain:
+    def __init__(self, max_workers=None, kern="hashlib", speicher=None):
+        # Mit einem BlockSpeicher (blockspeicher.py) liegt die Kette auf der Platte; chain ist dann der Speicher
+        self.chain = speicher if speicher is not None else []
+        self._gueltig_bis = 0 # chain[1..n] wurde geprüft und seitdem nicht verändert
+        self.difficulty = 4
+        self.max_workers = max_workers
+        self.kern = kern
+        if not len(self.chain):
+            self._anhaengen(self.createGenesisBlock())
+
+    def createGenesisBlock(self):
+        return block(0, "01/01/2024", "Genesis Block", "0")
+
+    def getlatestBlock(self):
+        return self.chain[-1]
+
+    def addblock(self, newblock):
+        newblock.previousHash = self.getlatestBlock().hash
+        statistik = newblock.mineBlock(self.difficulty, self.max_workers, self.kern)
+        self._anhaengen(newblock)
+        return statistik
+
+    def _anhaengen(self, neuer_block):
+        neuer_block._hoehe = len(self.chain)
+        neuer_block._kette = self
+        self.chain.append(neuer_block)
+
+    def _geaendert(self, hoehe):
+        # Ab diesem Block neu prüfen; ein geänderter Hash betrifft auch das Glied zum nächsten Block
+        self._gueltig_bis = min(self._gueltig_bis, max(hoehe - 1, 0))
+
+    def _glied_gueltig(self, i):
+        currentBlock = self.chain[i]
+        return (currentBlock.hash == currentBlock.gecachter_hash()
+                and currentBlock.previousHash == self.chain[i - 1].hash)
+
+    def ischainValid(self, vollstaendig=False, max_workers=None):
+        """
+        Prüft nur die Glieder hinter dem zuletzt gültigen Stand und schiebt
+        diesen weiter. vollstaendig=True rechnet alle Hashes neu (parallel mit
+        max_workers Prozessen, Standard self.max_workers bzw. alle Kerne).
+        """
+        if vollstaendig:
+            return self._vollstaendig_pruefen(max_workers or self.max_workers)
+        for i in range(self._gueltig_bis + 1, len(self.chain)):
+            if not self._glied_gueltig(i):
+                return False
+            self._gueltig_bis = i
+        return True
+
+    def _vollstaendig_pruefen(self, max_workers=None):
+        """
+        Liest die Kette in Abschnitten von PRUEF_ABSCHNITT Blöcken, lässt die
+        Worker deren Hashes berechnen und vergleicht sie in Reihenfolge mit den
+        gespeicherten hash/previousHash. Höchstens 2 * max_workers Abschnitte
+        sind gleichzeitig unterwegs; der Stand endet vor dem ersten ungültigen Block.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        # Nur echte Blockobjekte merken sich den Hash; ein BlockSpeicher liefert bei jedem Zugriff neue
+        merken = isinstance(self.chain, list)
+        self._gueltig_bis = 0
+        vorheriger_hash = None
+
+        def abschnitt_gueltig(von, bloecke, hashes):
+            nonlocal vorheriger_hash
+            for hoehe, (b, berechnet) in enumerate(zip(bloecke, hashes), von):
+                if merken:
+                    b._berechneter_hash = berechnet
+                if hoehe and (b.hash != berechnet or b.previousHash != vorheriger_hash):
+                    return False
+                vorheriger_hash = b.hash
+                self._gueltig_bis = hoehe
+            return True
+
+        offen = collections.deque()
+        pool = ProcessPoolExecutor(max_workers) if max_workers > 1 else None
+        try:
+            for von in range(0, len(self.chain), PRUEF_ABSCHNITT):
+                bloecke = self.chain[von:von + PRUEF_ABSCHNITT]
+                felder = [(b.index, b.previousHash, b.timestamp, b.data, b.nonce) for b in bloecke]
+                if pool is None:
+                    if not abschnitt_gueltig(von, bloecke, _hashes_berechnen(felder)):
+                        return False
+                    continue
+                offen.append((von, bloecke, pool.submit(_hashes_berechnen, felder)))
+                if len(offen) > 2 * max_workers:
+                    frueher_von, frueher_bloecke, future = offen.popleft()
+                    if not abschnitt_gueltig(frueher_von, frueher_bloecke, future.result()):
+                        return False
+            while offen:
+                frueher_von, frueher_bloecke, future = offen.popleft()
+                if not abschnitt_gueltig(frueher_von, frueher_bloecke, future.result()):
+                    return False
+            return True
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    def to_dict(self):
+        return {'chain': [b.to_dict() for b in self.chain], 'difficulty': self.difficulty}
+
+
+def _hashes_berechnen(felder):
+    """calculateHash für (index, previousHash, timestamp, data, nonce)-Tupel; läuft auch in Worker-Prozessen."""
+    return [hashlib.sha256(_hash_praefix(index, previousHash, timestamp, data) + str(nonce).encode('ascii')).hexdigest()
+            for index, previousHash, timestamp, data, nonce in felder]
+
+
+# --- 2. NONCE-SUCHE ---
+
+_bester_nonce = None # Pro Worker-Prozess: gemeinsamer Wert (kleinste bisher gefundene Nonce)
+
+def _worker_start(bester_nonce):
+    global _bester_nonce
+    _bester_nonce = bester_nonce
+
+
+def _durchsuche(praefix, difficulty, start, schritt, kern="hashlib"):
+    """Ein Worker: prüft start, start+schritt, ... bis ein Treffer feststeht, der nicht größer ist."""
+    if kern not in KERNE:
+        raise ValueError(f"Unbekannter Kern '{kern}', erlaubt sind {KERNE}.")
+    if kern == "numpy":
+        return _durchsuche_batch(praefix, difficulty, start, schritt)
+    begonnen = time.perf_counter()
+    midstate = hashlib.sha256(praefix) # Präfix nur einmal pro Worker hashen
+    kopie = midstate.copy
+    nonce = start
+    hashes = 0
+    gefunden = None
+    while gefunden is None:
+        if nonce > _bester_nonce.value:
+            break # Ein anderer Worker hat schon eine kleinere Nonce
+        for _ in range(PRUEF_INTERVALL):
+            hashes += 1
+            h = kopie()
+            h.update(str(nonce).encode('ascii'))
+            if ziel_erfuellt(h.digest(), difficulty):
+                gefunden = nonce
+                with _bester_nonce.get_lock():
+                    if nonce < _bester_nonce.value:
+                        _bester_nonce.value = nonce
+                break
+            nonce += schritt
+    return {'start': start, 'nonce': gefunden, 'hashes': hashes, 'dauer': time.perf_counter() - begonnen}
+
+
+def _durchsuche_batch(praefix, difficulty, start, schritt):
+    """Wie _durchsuche, aber BATCH_LANES Nonces pro Kernel-Aufruf; Treffer ist die kleinste im Block."""
+    import numpy as np
+    from sha256_batch import NonceBatch
+
+    begonnen = time.perf_counter()
+    kernel = NonceBatch(praefix) # Midstate einmal pro Worker
+    versatz = np.arange(BATCH_LANES, dtype=np.uint64) * np.uint64(schritt)
+    nonce = start
+    hashes = 0
+    gefunden = None
+    while gefunden is None and nonce <= _bester_nonce.value:
+        gefunden = kernel.erster_treffer(np.uint64(nonce) + versatz, difficulty)
+        hashes += BATCH_LANES
+        nonce += BATCH_LANES * schritt
+    if gefunden is not None:
+        with _bester_nonce.get_lock():
+            if gefunden < _bester_nonce.value:
+                _bester_nonce.value = gefunden
+    return {'start': start, 'nonce': gefunden, 'hashes': hashes, 'dauer': time.perf_counter() - begonnen}
+
+
+def _sequentielle_nonce_suche(praefix, difficulty, start, kern="hashlib"):
+    global _bester_nonce
+    _bester_nonce = multiprocessing.Value('q', KEIN_TREFFER)
+    ergebnis = _durchsuche(praefix, difficulty, start, 1, kern)
+    return _statistik([ergebnis], ergebnis['dauer'])
+
+
+def _statistik(worker, dauer):
+    for eintrag in worker:
+        eintrag['hashes_pro_sekunde'] = eintrag['hashes'] / eintrag['dauer'] if eintrag['dauer'] else 0.0
+    return {'nonce': min(w['nonce'] for w in worker if w['nonce'] is not None),
+            'hashes': sum(w['hashes'] for w in worker), 'dauer': dauer, 'worker': worker}
+
+
+def parallele_nonce_suche(praefix, difficulty, start=1, max_workers=None, kern="hashlib"):
+    """
+    Verteilt die Nonces ab `start` mit Schrittweite max_workers auf die Worker
+    und gibt {'nonce', 'hashes', 'dauer', 'worker': [...]} zurück; pro Worker
+    stehen dort Startwert, eigener Treffer, Anzahl Hashes und Hashes pro Sekunde.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    bester_nonce = multiprocessing.Value('q', KEIN_TREFFER)
+    begonnen = time.perf_counter()
+    with ProcessPoolExecutor(max_workers, initializer=_worker_start, initargs=(bester_nonce,)) as pool:
+        futures = [pool.submit(_durchsuche, praefix, difficulty, start + k, max_workers, kern) for k in range(max_workers)]
+        worker = [future.result() for future in futures]
+    return _statistik(worker, time.perf_counter() - begonnen)
+
+
+# --- 3. AUSFÜHRUNG ---
+
+if __name__ == "__main__":
+    argumente = sys.argv[1:]
+    workers = int(argumente[argumente.index("--workers") + 1]) if "--workers" in argumente else None
+
+    kern = argumente[argumente.index("--kern") + 1] if "--kern" in argumente else "hashlib"
+    speicher = None
+    if "--speicher" in argumente:
+        from blockspeicher import BlockSpeicher
+        speicher = BlockSpeicher(argumente[argumente.index("--speicher") + 1])
+
+    mycoin = Blockchain(workers, kern, speicher)
+    if "--difficulty" in argumente:
+        mycoin.difficulty = int(argumente[argumente.index("--difficulty") + 1])
+
+    for timestamp, data in (("02/01/2024", {'amount': 4}), ("03/01/2024", {'amount': 10})):
+        index = len(mycoin.chain) # Mit Speicher geht es hinter den schon gespeicherten Blöcken weiter
+        print(f"Mining block {index}...")
+        statistik = mycoin.addblock(block(index, timestamp, data))
+        print(f"  Nonce {statistik['nonce']}, {statistik['hashes']} Hashes in {statistik['dauer']:.2f}s")
+        for eintrag in statistik['worker']:
+            print(f"    Worker ab {eintrag['start']}: {eintrag['hashes_pro_sekunde']:,.0f} Hashes/s")
+
+    print('Is blockchain valid? ' + str(mycoin.ischainValid()).lower())
+    if speicher is None:
+        print(json.dumps(mycoin.to_dict(), indent=4, ensure_ascii=False))
+    else:
+        print(f"{len(speicher)} Blöcke in {speicher.verzeichnis}, letzter: {mycoin.getlatestBlock().hash}")
+        speicher.schliessen()
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+SHA-256 zum Nachvollziehen: skalar in reinem Python und gebündelt mit NumPy
+'sha256.py' benutzt crypto.createHash als Blackbox; hier ist der Algorithmus
+selbst ausgeschrieben (FIPS 180-4): Auffüllen, Nachrichtenplan, 64 Runden der
+Kompressionsfunktion.
+
+- sha256(daten):            skalare Referenz mit Python-Ints, Block für Block
+- komprimiere(zustand, w):  dieselbe Kompression auf uint32-Arrays, eine Spalte
+                            je "Lane"; tausende Nachrichten laufen gleichzeitig
+- NonceBatch:               Midstate des konstanten Block-Präfixes (skalar, einmal)
+                            plus gebündelte Hashes für ganze Nonce-Bereiche
+
+Alle Varianten werden in benchmark_sha256_batch.py gegen hashlib.sha256 geprüft.
+"""
+import numpy as np
+
+K = (
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+)
+H0 = (0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19)
+MASKE = 0xffffffff
+
+K_ARRAY = np.array(K, dtype=np.uint32)
+
+
+# --- 1. SKALARE REFERENZ ---
+
+def auffuellen(laenge):
+    """Padding für eine Nachricht mit `laenge` Bytes: 0x80, Nullen, Bitlänge (64 Bit, big-endian)."""
+    nullen = (55 - laenge) % 64
+    return b'\x80' + b'\x00' * nullen + (laenge * 8).to_bytes(8, 'big')
+
+
+def _rotr(x, n):
+    return ((x >> n) | (x << (32 - n))) & MASKE
+
+
+def komprimiere_skalar(zustand, block):
+    """Ein 64-Byte-Block: gibt den neuen Zustand (Tupel aus 8 Wörtern) zurück."""
+    w = list(int.from_bytes(block[i:i + 4], 'big') for i in range(0, 64, 4))
+    for t in range(16, 64):
+        s0 = _rotr(w[t - 15], 7) ^ _rotr(w[t - 15], 18) ^ (w[t - 15] >> 3)
+        s1 = _rotr(w[t - 2], 17) ^ _rotr(w[t - 2], 19) ^ (w[t - 2] >> 10)
+        w.append((w[t - 16] + s0 + w[t - 7] + s1) & MASKE)
+
+    a, b, c, d, e, f, g, h = zustand
+    for t in range(64):
+        s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+        ch = (e & f) ^ (~e & g)
+        t1 = (h + s1 + ch + K[t] + w[t]) & MASKE
+        s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        h, g, f, e, d, c, b, a = g, f, e, (d + t1) & MASKE, c, b, a, (t1 + s0 + maj) & MASKE
+    return tuple((x + y) & MASKE for x, y in zip(zustand, (a, b, c, d, e, f, g, h)))
+
+
+def sha256(daten):
+    """SHA-256 als Hex-String, wie hashlib.sha256(daten).hexdigest()."""
+    nachricht = bytes(daten) + auffuellen(len(daten))
+    zustand = H0
+    for i in range(0, len(nachricht), 64):
+        zustand = komprimiere_skalar(zustand, nachricht[i:i + 64])
+    return ''.join(f'{x:08x}' for x in zustand)
+
+
+# --- 2. GEBÜNDELTE KOMPRESSION ---
+
+def _rotr_array(x, n):
+    return (x >> n) | (x << (32 - n))
+
+
+def komprimiere(zustand, bloecke):
+    """
+    Kompression für viele Lanes zugleich: `bloecke` ist (16, N) uint32
+    (big-endian gelesene Wörter), `zustand` (8, N) oder (8,) für einen
+    gemeinsamen Startzustand. Gibt den neuen Zustand (8, N) zurück.
+    uint32-Arithmetik läuft modulo 2**32 über, wie von SHA-256 verlangt.
+    """
+    anzahl = bloecke.shape[1]
+    w = np.empty((64, anzahl), dtype=np.uint32)
+    w[:16] = bloecke
+    for t in range(16, 64):
+        x, y = w[t - 15], w[t - 2]
+        s0 = _rotr_array(x, 7) ^ _rotr_array(x, 18) ^ (x >> 3)
+        s1 = _rotr_array(y, 17) ^ _rotr_array(y, 19) ^ (y >> 10)
+        w[t] = w[t - 16] + s0 + w[t - 7] + s1
+
+    zustand = np.asarray(zustand, dtype=np.uint32)
+    if zustand.ndim == 1:
+        zustand = np.repeat(zustand[:, None], anzahl, axis=1)
+    a, b, c, d, e, f, g, h = (zeile.copy() for zeile in zustand)
+    for t in range(64):
+        s1 = _rotr_array(e, 6) ^ _rotr_array(e, 11) ^ _rotr_array(e, 25)
+        ch = (e & f) ^ (~e & g)
+        t1 = h + s1 + ch + K_ARRAY[t] + w[t]
+        s0 = _rotr_array(a, 2) ^ _rotr_array(a, 13) ^ _rotr_array(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        h, g, f, e, d, c, b, a = g, f, e, d + t1, c, b, a, t1 + s0 + maj
+    return zustand + np.stack([a, b, c, d, e, f, g, h])
+
+
+def als_hex(zustand):
+    """Endzustände (8, N) als Liste von Hex-Digests."""
+    return [''.join(f'{int(x):08x}' for x in spalte) for spalte in zustand.T]
+
+
+def _woerter(nachrichten):
+    """Bytes-Matrix (N, 64*k) als Liste von k Blöcken der Form (16, N) uint32."""
+    worte = nachrichten.view('>u4').astype(np.uint32)
+    return [np.ascontiguousarray(worte[:, i:i + 16].T) for i in range(0, worte.shape[1], 16)]
+
+
+def sha256_viele(nachrichten):
+    """Hex-Digests für eine Liste von Nachrichten; gleich lange werden gemeinsam berechnet."""
+    ergebnis = [None] * len(nachrichten)
+    nach_laenge = {}
+    for i, nachricht in enumerate(nachrichten):
+        nach_laenge.setdefault(len(nachricht), []).append(i)
+    for laenge, positionen in nach_laenge.items():
+        padding = auffuellen(laenge)
+        matrix = np.frombuffer(b''.join(bytes(nachrichten[i]) + padding for i in positionen), dtype=np.uint8)
+        zustand = np.array(H0, dtype=np.uint32)
+        for bloecke in _woerter(matrix.reshape(len(positionen), -1)):
+            zustand = komprimiere(zustand, bloecke)
+        for i, digest in zip(positionen, als_hex(zustand)):
+            ergebnis[i] = digest
+    return ergebnis
+
+
+# --- 3. NONCE-BEREICHE ---
+
+def treffer_maske(zustand, difficulty):
+    """True je Lane, wenn der Hex-Hash mit `difficulty` Nullen beginnt (oberste 4*difficulty Bits)."""
+    treffer = np.ones(zustand.shape[1], dtype=bool)
+    bits = 4 * difficulty
+    for wort in zustand:
+        if bits <= 0:
+            break
+        if bits >= 32:
+            treffer &= wort == 0
+        else:
+            treffer &= (wort >> (32 - bits)) == 0
+        bits -= 32
+    return treffer
+
+
+class NonceBatch:
+    """
+    Hashes von praefix + str(nonce) für viele Nonces auf einmal. Die vollen
+    64-Byte-Blöcke des Präfixes werden einmal skalar komprimiert (Midstate),
+    pro Nonce bleiben nur der Rest des Präfixes, die Ziffern und das Padding.
+    """
+
+    def __init__(self, praefix):
+        volle = len(praefix) // 64 * 64
+        zustand = H0
+        for i in range(0, volle, 64):
+            zustand = komprimiere_skalar(zustand, praefix[i:i + 64])
+        self.midstate = np.array(zustand, dtype=np.uint32)
+        self.rest = np.frombuffer(praefix[volle:], dtype=np.uint8)
+        self.laenge = len(praefix)
+
+    def hashes(self, nonces):
+        """Endzustände (8, N) für Nonces mit gleicher Stellenzahl (siehe nach_stellen)."""
+        nonces = np.asarray(nonces, dtype=np.uint64)
+        stellen = len(str(int(nonces[0])))
+        rest = len(self.rest)
+        gesamt = self.laenge + stellen
+
+        # Nachrichtenende ab dem Midstate: Präfix-Rest, Ziffern, 0x80, Nullen, Bitlänge
+        bytes_ende = -(-(rest + stellen + 9) // 64) * 64
+        matrix = np.zeros((len(nonces), bytes_ende), dtype=np.uint8)
+        matrix[:, :rest] = self.rest
+        potenzen = np.uint64(10) ** np.arange(stellen - 1, -1, -1, dtype=np.uint64)
+        matrix[:, rest:rest + stellen] = (nonces[:, None] // potenzen) % np.uint64(10) + np.uint64(48)
+        matrix[:, rest + stellen] = 0x80
+        matrix[:, -8:] = np.frombuffer((gesamt * 8).to_bytes(8, 'big'), dtype=np.uint8)
+
+        zustand = self.midstate
+        for bloecke in _woerter(matrix):
+            zustand = komprimiere(zustand, bloecke)
+        return zustand
+
+    def erster_treffer(self, nonces, difficulty):
+        """Kleinste Nonce aus `nonces` (aufsteigend), deren Hash das Ziel erfüllt, sonst None."""
+        for teil in nach_stellen(nonces):
+            treffer = np.flatnonzero(treffer_maske(self.hashes(teil), difficulty))
+            if len(treffer):
+                return int(teil[treffer[0]])
+        return None
+
+
+def nach_stellen(nonces):
+    """Teilt aufsteigende Nonces in Abschnitte gleicher Stellenzahl (gleiche Nachrichtenlänge)."""
+    nonces = np.asarray(nonces, dtype=np.uint64)
+    if not len(nonces):
+        return []
+    grenzen = np.uint64(10) ** np.arange(1, 20, dtype=np.uint64)
+    schnitte = np.searchsorted(nonces, grenzen[(grenzen > nonces[0]) & (grenzen <= nonces[-1])])
+    return [teil for teil in np.split(nonces, schnitte) if len(teil)]
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming-Engine für die SMA-Crossover-Strategie mit SL/TP
+Für den Live-Betrieb auf Minuten-Bars: statt bei jedem neuen Bar die ganze
+Historie neu zu rechnen, hält die Engine nur ihren Zustand (laufende Summen
+der beiden SMAs, letzter SMA-Wert, Position, Einstiegspreis, letzter Close)
+und verarbeitet jeden Bar in O(1) über on_bar(open, high, low, close).
+
+Die gleitenden Mittel werden genau so fortgeschrieben wie in pandas'
+rolling().mean() (Kahan-kompensierte Summe, getrennte Kompensation für
+Hinzufügen und Entfernen, Sonderfall gleicher Werte). Dadurch sind die
+Renditen bitgenau gleich denen von SMA_strategy_full_risk_control.
+"""
+import math
+from collections import deque
+
+import pandas as pd
+
+
+# --- 1. GLEITENDES MITTEL ---
+
+class RollendesMittel:
+    """Gleitendes Mittel über die letzten `fenster` Werte, pro Wert O(1)."""
+
+    def __init__(self, fenster):
+        self.fenster = fenster
+        self._werte = deque()
+        self._anzahl = 0
+        self._summe = 0.0
+        self._negative = 0
+        self._kompensation_dazu = 0.0
+        self._kompensation_weg = 0.0
+        self._gleiche_in_folge = 0
+        self._letzter_wert = math.nan
+        self.wert = math.nan
+
+    def hinzufuegen(self, wert):
+        """Nimmt einen Wert auf und gibt das aktuelle Mittel zurück (NaN, solange das Fenster nicht voll ist)."""
+        self._werte.append(wert)
+        if len(self._werte) > self.fenster:
+            self._entfernen(self._werte.popleft())
+
+        if wert == wert: # NaN zählt nicht mit
+            self._anzahl += 1
+            y = wert - self._kompensation_dazu
+            t = self._summe + y
+            self._kompensation_dazu = t - self._summe - y
+            self._summe = t
+            if math.copysign(1.0, wert) < 0:
+                self._negative += 1
+            # Gleiche Werte in Folge: Ergebnis ist exakt der Wert (keine Rundungsreste)
+            if wert == self._letzter_wert:
+                self._gleiche_in_folge += 1
+            else:
+                self._gleiche_in_folge = 1
+            self._letzter_wert = wert
+
+        self.wert = self._mittel()
+        return self.wert
+
+    def _entfernen(self, wert):
+        if wert == wert:
+            self._anzahl -= 1
+            y = -wert - self._kompensation_weg
+            t = self._summe + y
+            self._kompensation_weg = t - self._summe - y
+            self._summe = t
+            if math.copysign(1.0, wert) < 0:
+                self._negative -= 1
+
+    def _mittel(self):
+        if self._anzahl < self.fenster or self._anzahl == 0:
+            return math.nan
+        ergebnis = self._summe / self._anzahl
+        if self._gleiche_in_folge >= self._anzahl:
+            return self._letzter_wert
+        if self._negative == 0 and ergebnis < 0:
+            return 0.0
+        if self._negative == self._anzahl and ergebnis > 0:
+            return 0.0
+        return ergebnis
+
+
+# --- 2. STRATEGIE ---
+
+class SMAStreamingStrategie:
+    """
+    SMA-Crossover mit Stop-Loss/Take-Profit, Bar für Bar. on_bar() gibt die
+    Rendite (in %) des Bars zurück, gleiche Logik wie SMA_strategy_full_risk_control.
+    """
+
+    def __init__(self, fast_sma, slow_sma, cost_ind, stop_loss_pct, take_profit_pct):
+        self.fast = RollendesMittel(fast_sma)
+        self.slow = RollendesMittel(slow_sma)
+        self.cost_ind = cost_ind
+        self.sl_level = stop_loss_pct / 100
+        self.tp_level = take_profit_pct / 100
+
+        self.current_position = 0.0
+        self.entry_price = math.nan
+        self.signal = math.nan # Signal des letzten Bars: 1 = Kauf, -1 = Verkauf, NaN = keins
+        self.anzahl_bars = 0
+        self._fast_vorher = math.nan
+        self._slow_vorher = math.nan
+        self._close_vorher = math.nan
+
+    def on_bar(self, open, high, low, close):
+        """Verarbeitet einen neuen Bar und gibt seine Rendite in Prozent zurück."""
+        fast = self.fast.hinzufuegen(close)
+        slow = self.slow.hinzufuegen(close)
+
+        # Crossover wie im Original (Vergleiche mit NaN sind False)
+        if fast > slow and self._fast_vorher < self._slow_vorher:
+            self.signal = 1.0
+        elif fast < slow and self._fast_vorher > self._slow_vorher:
+            self.signal = -1.0
+        else:
+            self.signal = math.nan
+        self._fast_vorher, self._slow_vorher = fast, slow
+
+        erster_bar = self.anzahl_bars == 0
+        self.anzahl_bars += 1
+        close_vorher, self._close_vorher = self._close_vorher, close
+        if erster_bar:
+            return 0.0 # Das Original beginnt die Simulation erst mit dem zweiten Bar
+        return self._simuliere(high, low, close, close_vorher)
+
+    def _simuliere(self, high, low, close, close_vorher):
+        cost_ind = self.cost_ind
+        tp_level, sl_level = self.tp_level, self.sl_level
+        rendite = 0.0
+
+        # A. Check für Stop-Loss ODER Take-Profit (Exit-Logik)
+        if self.current_position == 1:
+            profit = (high / self.entry_price) - 1
+            drawdown = (low / self.entry_price) - 1
+            if profit >= tp_level or drawdown < -sl_level:
+                exit_return = tp_level if profit >= tp_level else -sl_level
+                self.current_position = 0.0
+                self.entry_price = math.nan
+                return (exit_return * 100) - (cost_ind * 100)
+
+        elif self.current_position == -1:
+            profit = 1 - (low / self.entry_price)
+            run_up = (high / self.entry_price) - 1
+            if profit >= tp_level or run_up > sl_level:
+                exit_return = tp_level if profit >= tp_level else -sl_level
+                self.current_position = 0.0
+                self.entry_price = math.nan
+                return (exit_return * 100) - (cost_ind * 100)
+
+        # B. Berechne Tagesrendite (Intakter Trade)
+        if self.current_position != 0:
+            pct_change = close / close_vorher - 1
+            rendite = (pct_change * self.current_position) * 100
+
+        # C. Check für Kreuzungssignal (Entry/Exit durch Crossover)
+        signal_heute = self.signal
+        if signal_heute == signal_heute:
+
+            # 1. Exit durch Umkehrsignal
+            if (signal_heute == 1 and self.current_position == -1) or (signal_heute == -1 and self.current_position == 1):
+                rendite -= cost_ind * 100
+                self.current_position = 0.0
+                self.entry_price = math.nan
+
+            # 2. Entry für neuen Trade
+            if self.current_position == 0:
+                self.current_position = signal_heute
+                self.entry_price = close
+                rendite -= cost_ind * 100
+
+        return rendite
+
+    def aus_historie(self, df):
+        """Spielt einen OHLC-DataFrame Bar für Bar ein und gibt die Rendite-Reihe zurück (z.B. zum Aufwärmen)."""
+        renditen = [self.on_bar(*bar) for bar in zip(df["open"].tolist(), df["high"].tolist(),
+                                                      df["low"].tolist(), df["close"].tolist())]
+        return pd.Series(renditen, index=df.index, name="return")
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Walk-Forward-Validierung für die SMA-Crossover-Strategie mit SL/TP
+Die Kursreihe aus preprocessing_yf wird in rollende (oder verankerte)
+In-Sample/Out-of-Sample-Fenster geteilt. Pro Fold werden die Parameter auf
+dem In-Sample-Teil optimiert und auf dem direkt folgenden Out-of-Sample-Teil
+bewertet; die Folds laufen parallel auf allen Kernen.
+
+Die SMAs aller Fenster werden nur einmal auf der ganzen Reihe berechnet und
+über Shared Memory geteilt: ein gleitendes Mittel hängt nur von der
+Vergangenheit ab, jeder Fold liest also einfach seinen Ausschnitt (und
+verliert dabei auch keine Bars an die Anlaufphase des Indikators).
+
+Aufruf: python walk_forward.py [TICKER] [--is BARS] [--oos BARS] [--verankert] [--bericht]
+"""
+import sys
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+
+from backtest_engine import lade_first_backtest
+from bericht import Berichte
+from backtest_optimizer import bewerte_paar, gitter_kombinationen, nach_paar, rangliste, renditen, worker_pool
+from kennzahlen_kern import KENNZAHLEN, kennzahlen
+
+IN_SAMPLE_BARS = 365
+OUT_OF_SAMPLE_BARS = 90
+
+
+# --- 1. FOLDS ---
+
+def walk_forward_folds(anzahl_bars, in_sample=IN_SAMPLE_BARS, out_of_sample=OUT_OF_SAMPLE_BARS, schritt=None,
+                       verankert=False):
+    """
+    Gibt [(is_von, is_bis, oos_von, oos_bis), ...] als Bar-Positionen zurück
+    (jeweils halboffen). Standardmäßig rückt jeder Fold um `out_of_sample` vor,
+    sodass sich die OOS-Teile lückenlos aneinanderreihen. Verankert beginnt
+    das In-Sample-Fenster immer bei Bar 0 und wächst mit.
+    """
+    schritt = schritt or out_of_sample
+    folds = []
+    is_von = 0
+    while is_von + in_sample + out_of_sample <= anzahl_bars:
+        is_bis = is_von + in_sample
+        folds.append((0 if verankert else is_von, is_bis, is_bis, is_bis + out_of_sample))
+        is_von += schritt
+    return folds
+
+
+# --- 2. WORKER ---
+
+def _fold_auswerten(nummer, fold, aufgaben, cost_ind, nach):
+    """Ein Fold im Worker: Gitter auf In-Sample optimieren, Sieger auf Out-of-Sample bewerten."""
+    is_von, is_bis, oos_von, oos_bis = fold
+    in_sample = []
+    for (fast, slow), sl_tp_liste in aufgaben.items():
+        in_sample.extend(bewerte_paar(fast, slow, sl_tp_liste, cost_ind, is_von, is_bis))
+    bester = rangliste(in_sample, nach).iloc[0]
+
+    parameter = (int(bester['fast_sma']), int(bester['slow_sma']), bester['stop_loss_pct'], bester['take_profit_pct'])
+    oos_renditen = renditen(*parameter, cost_ind, oos_von, oos_bis)
+    oos = kennzahlen(oos_renditen)
+
+    zeile = {'fold': nummer, 'is_von': is_von, 'is_bis': is_bis, 'oos_von': oos_von, 'oos_bis': oos_bis,
+             'fast_sma': parameter[0], 'slow_sma': parameter[1],
+             'stop_loss_pct': parameter[2], 'take_profit_pct': parameter[3],
+             **{f"is_{name}": bester[name] for name in KENNZAHLEN},
+             **{f"oos_{name}": wert for name, wert in oos.items()}}
+    return zeile, oos_renditen
+
+
+# --- 3. WALK-FORWARD ---
+
+def walk_forward(df, kombinationen, in_sample=IN_SAMPLE_BARS, out_of_sample=OUT_OF_SAMPLE_BARS, schritt=None,
+                 verankert=False, cost_ind=0.001, max_workers=None, nach="sharpe", cache=None, symbol=""):
+    """
+    Führt die Walk-Forward-Analyse aus und gibt (oos_renditen, folds) zurück:
+    die aneinandergesetzte Out-of-Sample-Rendite-Reihe (in %, Index von df)
+    und eine Tabelle mit Parametern und Kennzahlen pro Fold. Überlappen sich
+    OOS-Teile (schritt < out_of_sample), zählt jeweils der spätere Fold.
+    """
+    folds = walk_forward_folds(len(df), in_sample, out_of_sample, schritt, verankert)
+    if not folds:
+        raise ValueError(f"Zu wenige Bars ({len(df)}) für In-Sample {in_sample} + Out-of-Sample {out_of_sample}.")
+
+    aufgaben = nach_paar(kombinationen)
+    fenster = {w for paar in aufgaben for w in paar}
+
+    zeilen = []
+    oos_teile = {}
+    with worker_pool(df, fenster, max_workers, cache, symbol) as pool:
+        futures = [pool.submit(_fold_auswerten, nummer, fold, aufgaben, cost_ind, nach)
+                   for nummer, fold in enumerate(folds, start=1)]
+        for future in as_completed(futures):
+            zeile, oos_renditen = future.result()
+            zeilen.append(zeile)
+            oos_teile[zeile['fold']] = oos_renditen
+
+    # OOS-Teile in Fold-Reihenfolge zusammensetzen
+    gestueckelt = np.full(len(df), np.nan)
+    for nummer, (_, _, oos_von, oos_bis) in enumerate(folds, start=1):
+        gestueckelt[oos_von:oos_bis] = oos_teile[nummer]
+    erster, letzter = folds[0][2], folds[-1][3]
+    oos_renditen = pd.Series(gestueckelt[erster:letzter], index=df.index[erster:letzter], name="return")
+
+    tabelle = pd.DataFrame(zeilen).sort_values('fold').set_index('fold')
+    # Bar-Positionen zusätzlich als Datum (Ende inklusive)
+    tabelle.insert(0, 'is_start', df.index[tabelle['is_von']])
+    tabelle.insert(1, 'oos_start', df.index[tabelle['oos_von']])
+    tabelle.insert(2, 'oos_ende', df.index[tabelle['oos_bis'] - 1])
+    return oos_renditen, tabelle
+
+
+# --- 4. AUSFÜHRUNG ---
+
+if __name__ == "__main__":
+    modul = lade_first_backtest()
+    argumente = sys.argv[1:]
+    ticker = argumente[0] if argumente and not argumente[0].startswith("--") else modul.TICKER
+    in_sample = int(argumente[argumente.index("--is") + 1]) if "--is" in argumente else IN_SAMPLE_BARS
+    out_of_sample = int(argumente[argumente.index("--oos") + 1]) if "--oos" in argumente else OUT_OF_SAMPLE_BARS
+
+    df = modul.preprocessing_yf(ticker)
+    kombinationen = gitter_kombinationen()
+    print(f"Walk-Forward {ticker}: {len(df)} Bars, IS {in_sample} / OOS {out_of_sample}, "
+          f"{len(kombinationen)} Kombinationen pro Fold")
+    oos_renditen, folds = walk_forward(df, kombinationen, in_sample, out_of_sample,
+                                       verankert="--verankert" in argumente, cost_ind=modul.COST, symbol=ticker)
+
+    print("\n--- Folds ---")
+    print(folds[['is_start', 'oos_start', 'oos_ende', 'fast_sma', 'slow_sma', 'stop_loss_pct',
+                 'take_profit_pct', 'is_sharpe', 'oos_sharpe', 'oos_gesamtrendite']].to_string())
+
+    print("\n--- Out-of-Sample gesamt ---")
+    for name, wert in kennzahlen(oos_renditen).items():
+        print(f"{name}: {wert:.4f}")
+
+    titel = f"Walk-Forward Out-of-Sample: {ticker}"
+    if "--bericht" in argumente:
+        with Berichte() as berichte:
+            print(f"Bericht: {berichte.equity(f'{ticker}_walk_forward', oos_renditen, titel).result()}")
+    else:
+        modul.plt.figure(figsize=(15, 8))
+        oos_renditen.cumsum().plot(title=titel, ylabel="P&L in %")
+        modul.plt.show()